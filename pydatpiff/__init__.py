@@ -1,2 +1,8 @@
 """ Pydatpiff Version Control """
+import logging
+
 __version__ = "2.1.0"
+
+# pydatpiff only outputs its messages once the application configures logging.
+# See: pydatpiff.utils.logging.configure
+logging.getLogger(__name__).addHandler(logging.NullHandler())
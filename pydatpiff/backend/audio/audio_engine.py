@@ -2,14 +2,128 @@ import atexit
 import logging
 import os
 import platform
+import selectors
 import subprocess
+import threading
 
 from pydatpiff.errors import PlayerError
-from pydatpiff.utils.utils import threader_wrapper
 
 logger = logging.getLogger(__name__)
 
 
+class ProcessSupervisor:  # pragma: no cover
+    """
+    Wait on every player process and call its callbacks once it exits.
+
+    On Linux, a single thread waits on a pidfd of every process with selectors, so any
+    number of players costs one idle thread. Elsewhere, each process gets a thread blocked
+    in Popen.wait. Neither polls. Processes still running when python exits are killed.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._processes = {}  # Popen -> [(callback, args)]
+        self._lock = threading.Lock()
+        self._selector = None
+        self._wakeup = None
+        atexit.register(self.kill_all)
+
+    @classmethod
+    def shared(cls):
+        """Return the supervisor shared by every player."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def processes(self):
+        """Supervised processes that have not exited."""
+        with self._lock:
+            return list(self._processes)
+
+    def watch(self, popen, callback=None, *args):
+        """
+        Call callback(*args) once popen exits.
+
+        Args:
+            popen (subprocess.Popen): process to supervise
+            callback (function, optional): function to execute once the process exits.
+        """
+        with self._lock:
+            supervised = popen in self._processes
+            callbacks = self._processes.setdefault(popen, [])
+            if callback is not None:
+                callbacks.append((callback, args))
+        if supervised:
+            return
+
+        if hasattr(os, "pidfd_open"):
+            try:
+                pidfd = os.pidfd_open(popen.pid)
+            except ProcessLookupError:
+                # the process already exited and was reaped
+                self._exited(popen)
+                return
+            except OSError:
+                pass  # pidfd not supported by the kernel
+            else:
+                self._watch_pidfd(popen, pidfd)
+                return
+
+        thread = threading.Thread(target=self._wait, args=(popen,), name="pydatpiff-supervisor")
+        thread.daemon = True
+        thread.start()
+
+    def _watch_pidfd(self, popen, pidfd):
+        with self._lock:
+            if self._selector is None:
+                self._selector = selectors.DefaultSelector()
+                self._wakeup = os.pipe()
+                self._selector.register(self._wakeup[0], selectors.EVENT_READ)
+                thread = threading.Thread(target=self._run, name="pydatpiff-supervisor")
+                thread.daemon = True
+                thread.start()
+            self._selector.register(pidfd, selectors.EVENT_READ, popen)
+        os.write(self._wakeup[1], b"\0")  # select the new pidfd
+
+    def _run(self):
+        """Supervisor thread: wait until any process exits."""
+        while True:
+            for key, _ in self._selector.select():
+                if key.data is None:
+                    os.read(self._wakeup[0], 512)
+                    continue
+                with self._lock:
+                    self._selector.unregister(key.fd)
+                os.close(key.fd)
+                self._wait(key.data)
+
+    def _wait(self, popen):
+        try:
+            popen.wait()  # reap the process
+        except Exception:
+            logger.exception("Failed to wait on process %s", popen.pid)
+        self._exited(popen)
+
+    def _exited(self, popen):
+        with self._lock:
+            callbacks = self._processes.pop(popen, [])
+        for callback, args in callbacks:
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception("Process exit callback failed")
+
+    def kill_all(self):
+        """Kill every supervised process that is still running."""
+        for popen in self.processes:
+            if popen.poll() is None:
+                popen.kill()
+
+
 class Popen(subprocess.Popen):  # pragma: no cover
     registered_popen = []
     _player_PID = None
@@ -19,7 +133,6 @@ class Popen(subprocess.Popen):  # pragma: no cover
         kwargs["stdin"] = subprocess.PIPE
         kwargs["stdout"] = subprocess.PIPE
         kwargs["stderr"] = subprocess.PIPE
-        atexit.register(self.kill_on_quit)
         try:
             super().__init__(shell=False, *args, **kwargs)
             self._player_PID = self.pid
@@ -48,28 +161,28 @@ class Popen(subprocess.Popen):  # pragma: no cover
         except:
             logger.exception("Failed to kill player")
 
-    @threader_wrapper
-    def register(self, callback=None, *args, **kwargs):
+    def register(self, callback=None, *args):
         """
-        Kills subprocess Popen when error occur or when process job finish
+        Kills subprocess Popen when error occur or when process job finish.
+        The process is supervised by ProcessSupervisor, which is killed on exit.
 
         Args:
             callback (function, optional): Function to execute once player process dies.
         """
         self.registered_popen.append(self)
+        ProcessSupervisor.shared().watch(self, self._on_exit, callback, *args)
 
-        # constantly probe Popen to check if player is running
-        while True:
-            if self.poll() is not None:
-                if callback:
-                    callback(*args, **kwargs)
-                self.kill()
-                break
+    def _on_exit(self, callback=None, *args):
+        if self in self.registered_popen:
+            self.registered_popen.remove(self)
+        if callback:
+            callback(*args)
 
     @classmethod
     def unregister(cls):
         """Unregister and terminate Popen process"""
-        for popen in cls.registered_popen:
+        # exited processes remove themselves from the list. See: Popen._on_exit
+        for popen in list(cls.registered_popen):
             popen.kill()
 
     @property
@@ -1,11 +1,12 @@
+import logging
 import re
-
-from mutagen.mp3 import MP3
+import threading
 
 from pydatpiff.constants import music_symbols, player_state_keys
 from pydatpiff.errors import PlayerError
 from pydatpiff.frontend.screen import Verbose
-from pydatpiff.utils.utils import threader_wrapper
+
+logger = logging.getLogger(__name__)
 
 
 class BaseMeta(type):
@@ -74,12 +75,30 @@ class BasePlayer(metaclass=BaseMeta):
     # NOTE: do not change `_state` private variables to public variables
     _state = dict((k, False) for k in player_state_keys)
 
+    # player events published to subscribers. See: BasePlayer.subscribe
+    TRACK_STARTED = "track_started"
+    TRACK_ENDED = "track_ended"  # the track played to its end
+    PAUSED = "paused"
+    RESUMED = "resumed"
+    STOPPED = "stopped"  # the track was stopped by the user
+    TRACK_LOADED = "track_loaded"
+
+    # player state after each event. See: BasePlayer._transition
+    _TRANSITIONS = {
+        TRACK_LOADED: dict(loaded=True, playing=False, paused=False, stopped=False, system_stopped=False),
+        TRACK_STARTED: dict(loaded=True, playing=True, paused=False, stopped=False, system_stopped=False),
+        PAUSED: dict(playing=False, paused=True),
+        RESUMED: dict(playing=True, paused=False),
+        STOPPED: dict(playing=False, paused=False, stopped=True),
+        TRACK_ENDED: dict(playing=False, paused=False, stopped=False, system_stopped=True),
+    }
+
     def __init__(self, *args, **kwargs):
-        self._track_loaded = False
-        self._track_playing = False
-        self._track_paused = False
-        self._track_stopped = False
-        self._system_stopped = False
+        self._subscribers = []
+        self._subscribers_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        # each player has its own state
+        self._state = dict((k, False) for k in player_state_keys)
 
     def __len__(self):
         # duration will be forced to be implemented by Meta class
@@ -92,6 +111,34 @@ class BasePlayer(metaclass=BaseMeta):
         update = update if update else {}
         self._state.update(**update)
 
+    def subscribe(self, callback):
+        """
+        Call callback with each player event. e.g: BasePlayer.TRACK_ENDED
+        Callbacks run on the thread publishing the event, so they should return quickly.
+        e.g: queue.Queue.put
+
+        Args:
+            callback (function): function called with the event's name
+        """
+        with self._subscribers_lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stop calling callback with player events. See: BasePlayer.subscribe"""
+        with self._subscribers_lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _publish(self, event):
+        """Call every subscriber with event."""
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Player event subscriber failed: %s", event)
+
     @property
     def name(self):
         """Get the current track title"""
@@ -147,7 +194,7 @@ class BasePlayer(metaclass=BaseMeta):
 
     @property
     def _track_stopped(self):
-        return self.state["paused"]
+        return self.state["stopped"]
 
     @_track_stopped.setter
     def _track_stopped(self, state=False):
@@ -155,51 +202,24 @@ class BasePlayer(metaclass=BaseMeta):
 
     @property
     def _system_stopped(self):
-        return self.state["paused"]
+        return self.state["system_stopped"]
 
     @_system_stopped.setter
     def _system_stopped(self, state=False):
         self.state["system_stopped"] = bool(state)
 
-    @threader_wrapper
-    def auto_manage_state(self, *args, **kwargs):
-        DEBOUNCE_TIME = 1000 * 2  # two seconds
-        state = dict(
-            loaded=False,
-            playing=False,
-            paused=False,
-            stopped=False,
-            system_stopped=False,
-        )
-        while True:
-
-            # Handle system stop
-            # Automatically stop track - mainly used for media.autoplay feature.
-            if self.current_time > 0 and self.current_time >= (self.duration - DEBOUNCE_TIME):
-                self.stop
-                state.update(dict(stopped=False, system_stopped=True))
-
-            if self._track_loaded and not self._track_playing:
-                if self.current_time > 0:
-                    state.update(dict(loaded=True, paused=True))
-                else:
-                    state.update(dict(loaded=True))
-
-            elif self._track_playing:
-                state.update(dict(loaded=True, playing=True))
-
-            elif self._track_paused:
-                state.update(dict(loaded=True, paused=True))
-
-            elif self._track_stopped:
-                self.stop
-                self._paused_time = 0
-                self._track_start_time = 0
-                state.update(dict(system_stopped=True))
-
-            self.state = state
-            if self.state.get("stopped", True):
-                break
+    def _transition(self, event):
+        """
+        Move the player to the state following event, then publish event to subscribers.
+        Players call it from their commands (e.g: pause) and from their backend's callbacks
+        (e.g: the end of a track), so the state is never polled.
+
+        Args:
+            event (str): player event. e.g: BasePlayer.PAUSED
+        """
+        with self._state_lock:
+            self.state.update(self._TRANSITIONS[event])
+        self._publish(event)
 
     def set_track(self, *args, **kwargs):
         # Media class method needed on all player
@@ -336,11 +356,20 @@ class BasePlayer(metaclass=BaseMeta):
         """Stops the song"""
         raise NotImplementedError
 
+    def close(self):
+        """Stop the song, and release what the player holds. e.g: its process. See: pydatpiff.Media.close"""
+        if self._track_playing or self._track_paused:
+            self.stop
+
+
+class MetaData:
+    """An mp3's metadata, read with mutagen. mutagen is imported on first use."""
 
-class MetaData(MP3):
     def __init__(self, track):
-        super().__init__(track)
+        from mutagen.mp3 import MP3
+
+        self.mp3 = MP3(track)
 
     @property
     def track_duration(self):
-        return self.info.length
+        return self.mp3.info.length
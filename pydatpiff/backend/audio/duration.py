@@ -0,0 +1,190 @@
+import os
+import re
+import struct
+
+# bitrates in kbps, by (mpeg version 1, layer)
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# sample rates by version bits. 0: mpeg 2.5, 2: mpeg 2, 3: mpeg 1
+_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+
+
+def parse_duration(text):
+    """
+    Convert a clock formatted duration to seconds. e.g: "02:14" -> 134
+
+    Returns:
+        int: seconds, or None when text is not a duration
+    """
+    if not text or not re.match(r"^\s*\d+(:\d+){0,2}\s*$", str(text)):
+        return None
+    seconds = 0
+    for part in str(text).strip().split(":"):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+class Mp3Header:
+    """
+    Estimate an mp3's length from its first frames, without reading the whole file.
+
+    The length is read from the Xing/Info or VBRI header that encoders write in the first frame.
+    Without one, the mp3 is assumed to be constant bitrate and its length is estimated
+    from the first frame's bitrate and the size of the audio.
+
+    Usage:
+        Mp3Header.probe_file("song.mp3")
+        # the start of a download, before the rest of the body arrives
+        Mp3Header.probe(first_chunk, content_length=int(response.headers["Content-Length"]))
+    """
+
+    # bytes read after the ID3 tag to find the first frame
+    READ_SIZE = 64 * 1024
+
+    @staticmethod
+    def id3_size(data):
+        """Return the size of the ID3v2 tag at the start of data, 0 when data has no tag."""
+        if len(data) < 10 or data[:3] != b"ID3":
+            return 0
+        size = 0
+        for byte in data[6:10]:  # syncsafe integer
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+
+    @staticmethod
+    def _frame(data, pos):
+        """Parse the frame header at pos. Returns None when pos is not a valid frame header."""
+        if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+            return None
+        b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+        version, layer = (b1 >> 3) & 3, 4 - ((b1 >> 1) & 3)
+        bitrate_index, rate_index = b2 >> 4, (b2 >> 2) & 3
+        if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+            return None
+
+        mpeg1 = version == 3
+        bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+        sample_rate = _SAMPLE_RATES[version][rate_index]
+        padding = (b2 >> 1) & 1
+        if layer == 1:
+            samples, length = 384, (12 * bitrate // sample_rate + padding) * 4
+        else:
+            samples = 1152 if mpeg1 or layer == 2 else 576
+            length = samples // 8 * bitrate // sample_rate + padding
+        return {
+            "mpeg1": mpeg1,
+            "mono": b3 >> 6 == 3,
+            "bitrate": bitrate,
+            "sample_rate": sample_rate,
+            "samples": samples,
+            "length": length,
+        }
+
+    @classmethod
+    def _first_frame(cls, data):
+        """Return the position and header of the first frame followed by another frame."""
+        pos = data.find(b"\xff")
+        while pos != -1:
+            frame = cls._frame(data, pos)
+            if frame:
+                following = pos + frame["length"]
+                # a lone sync word inside other data is not a frame
+                if following + 4 > len(data) or cls._frame(data, following):
+                    return pos, frame
+            pos = data.find(b"\xff", pos + 1)
+        return None, None
+
+    @staticmethod
+    def _vbr_frames(data, pos, frame):
+        """Return the frame count of the Xing/Info or VBRI header in the frame at pos."""
+        if frame["mpeg1"]:
+            side_info = 17 if frame["mono"] else 32
+        else:
+            side_info = 9 if frame["mono"] else 17
+        xing = pos + 4 + side_info
+        if data[xing : xing + 4] in (b"Xing", b"Info") and len(data) >= xing + 8:
+            (flags,) = struct.unpack(">I", data[xing + 4 : xing + 8])
+            if flags & 1 and len(data) >= xing + 12:
+                return struct.unpack(">I", data[xing + 8 : xing + 12])[0]
+        vbri = pos + 36
+        if data[vbri : vbri + 4] == b"VBRI" and len(data) >= vbri + 18:
+            return struct.unpack(">I", data[vbri + 14 : vbri + 18])[0]
+        return None
+
+    @classmethod
+    def probe(cls, data, content_length=None):
+        """
+        Estimate an mp3's length from its first bytes.
+
+        Args:
+            data (bytes): the start of the mp3 (ID3 tag included)
+            content_length (int, optional): size of the whole mp3. Needed for mp3s without a VBR header.
+
+        Returns:
+            float: length in seconds, or None when data has no mp3 frame
+        """
+        start = cls.id3_size(data)
+        pos, frame = cls._first_frame(data[start : start + cls.READ_SIZE])
+        if frame is None:
+            return None
+        audio = data[start : start + cls.READ_SIZE]
+
+        frames = cls._vbr_frames(audio, pos, frame)
+        if frames:
+            return frames * frame["samples"] / frame["sample_rate"]
+        if content_length:
+            # constant bitrate
+            return (content_length - start - pos) * 8 / frame["bitrate"]
+        return None
+
+    @classmethod
+    def probe_file(cls, path):
+        """Estimate the length of an mp3 file from its ID3 tag and first frames. See: Mp3Header.probe"""
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(10)
+            # skip the tag (e.g: cover art) instead of reading it
+            f.seek(cls.id3_size(head))
+            audio = f.read(cls.READ_SIZE)
+        return cls.probe(audio, content_length=size - cls.id3_size(head))
+
+
+class DurationProvider:
+    """
+    Lengths of an album's songs, from the cheapest source available:
+    the durations listed on the album's page, then the song's mp3 header.
+    """
+
+    def __init__(self, durations=None):
+        """
+        Args:
+            durations (list, optional): durations listed on the album's page, in song order. e.g: ["02:14"]
+        """
+        self.durations = [parse_duration(d) for d in durations or []]
+
+    def duration(self, index=None, path=None):
+        """
+        Return a song's length in seconds.
+
+        Args:
+            index (int, optional): index of the song in the album
+            path (str, optional): path of the song's mp3
+
+        Returns:
+            float: length in seconds, or None when it is unknown
+        """
+        if index is not None and 0 <= index < len(self.durations) and self.durations[index]:
+            return self.durations[index]
+        if path and os.path.isfile(path):
+            try:
+                return Mp3Header.probe_file(path)
+            except (OSError, struct.error):
+                return None
+        return None
@@ -0,0 +1,219 @@
+import itertools
+import json
+import logging
+import os
+import selectors
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+_socket_ids = itertools.count(1)
+
+
+class IPCConnection:
+    """
+    JSON IPC connection to a single mpv process. See: mpv's --input-ipc-server
+
+    Commands are sent without waiting for mpv. Replies and events are read by
+    the IPCController's thread.
+    """
+
+    def __init__(self, controller, sock, on_event):
+        """
+        Args:
+            controller (IPCController): controller reading the connection
+            sock (socket.socket): connected unix socket
+            on_event (function): called with each event message sent by mpv.
+                    e.g: {"event": "property-change", "name": "pause", "data": True}
+        """
+        self._controller = controller
+        self._sock = sock
+        self._on_event = on_event
+        self._buffer = b""
+        self._requests = {}  # request id -> Future
+        self._request_ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self.closed = False
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def _send(self, line):
+        with self._send_lock:
+            if self.closed:
+                return False
+            try:
+                self._sock.sendall(line.encode("utf8") + b"\n")
+            except OSError:
+                return False
+        return True
+
+    def command(self, *args):
+        """
+        Send a command to mpv. e.g: command("set_property", "pause", True)
+        A single dict is sent as a command with named arguments. e.g: command({"name": "loadfile", "url": path})
+
+        Returns:
+            concurrent.futures.Future: mpv's reply data. Fails with RuntimeError when mpv replies with an error.
+        """
+        future = Future()
+        request_id = next(self._request_ids)
+        self._requests[request_id] = future
+        command = args[0] if len(args) == 1 and isinstance(args[0], dict) else list(args)
+        if not self._send(json.dumps({"command": command, "request_id": request_id})):
+            self._requests.pop(request_id, None)
+            future.set_exception(ConnectionError("mpv IPC connection is closed"))
+        return future
+
+    def send_text(self, cmd):
+        """Send an input.conf style text command. e.g: "seek 5" """
+        self._send(cmd.strip())
+
+    def observe(self, *names):
+        """Have mpv send a "property-change" event whenever a property changes."""
+        for name in names:
+            self.command("observe_property", next(self._request_ids), name)
+
+    def _read(self):
+        """Read the messages available on the socket. Returns False once mpv closed the socket."""
+        try:
+            data = self._sock.recv(65536)
+        except OSError:
+            data = b""
+        if not data:
+            return False
+
+        self._buffer += data
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue  # mpv only sends json messages, but skip anything else
+            self._dispatch(message)
+        return True
+
+    def _dispatch(self, message):
+        if "event" in message:
+            try:
+                self._on_event(message)
+            except Exception:
+                logger.exception("mpv IPC event handler failed: %s", message)
+            return
+
+        future = self._requests.pop(message.get("request_id"), None)
+        if future is not None:
+            if message.get("error", "success") == "success":
+                future.set_result(message.get("data"))
+            else:
+                future.set_exception(RuntimeError(message["error"]))
+
+    def close(self):
+        """Close the connection. Pending commands fail."""
+        with self._send_lock:
+            if self.closed:
+                return
+            self.closed = True
+        self._controller._unregister(self)
+        self._sock.close()
+        for future in self._requests.values():
+            if not future.done():
+                future.set_exception(ConnectionError("mpv IPC connection is closed"))
+        self._requests.clear()
+        try:
+            self._on_event({"event": "connection-closed"})
+        except Exception:
+            logger.exception("mpv IPC event handler failed")
+
+
+class IPCController:
+    """
+    A single thread reading the IPC sockets of every mpv process.
+
+    Usage:
+        connection = IPCController.shared().connect(socket_path, on_event)
+        connection.observe("time-pos", "pause")
+        connection.command("set_property", "pause", True)
+    """
+
+    # seconds to wait for mpv to create its socket
+    CONNECT_TIMEOUT = 5
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._wakeup = os.pipe()
+        self._selector.register(self._wakeup[0], selectors.EVENT_READ)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @classmethod
+    def shared(cls):
+        """Return the controller shared by every mpv player."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def socket_path():
+        """Return a unique path for a new mpv IPC socket."""
+        name = "pydatpiff-mpv-%s-%s.sock" % (os.getpid(), next(_socket_ids))
+        return os.path.join(tempfile.gettempdir(), name)
+
+    def connect(self, path, on_event, timeout=None):
+        """
+        Connect to the IPC socket of an mpv process, waiting for mpv to create it.
+
+        Args:
+            path (str): path of mpv's --input-ipc-server socket
+            on_event (function): called with each event message. See: IPCConnection
+
+        Raises:
+            ConnectionError: mpv did not create its socket in time
+        """
+        deadline = time.time() + (timeout or self.CONNECT_TIMEOUT)
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                if time.time() > deadline:
+                    raise ConnectionError("mpv IPC socket unavailable: %s" % path)
+                time.sleep(0.02)
+
+        connection = IPCConnection(self, sock, on_event)
+        with self._lock:
+            self._selector.register(connection, selectors.EVENT_READ)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="pydatpiff-mpv-ipc")
+                self._thread.daemon = True
+                self._thread.start()
+        os.write(self._wakeup[1], b"\0")
+        return connection
+
+    def _unregister(self, connection):
+        with self._lock:
+            try:
+                self._selector.unregister(connection)
+            except (KeyError, ValueError):
+                pass
+        os.write(self._wakeup[1], b"\0")
+
+    def _run(self):
+        while True:
+            for key, _ in self._selector.select():
+                if key.fileobj == self._wakeup[0]:
+                    os.read(self._wakeup[0], 512)
+                    continue
+                connection = key.fileobj
+                if not connection._read():
+                    connection.close()
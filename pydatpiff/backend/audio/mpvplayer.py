@@ -1,14 +1,18 @@
+import os
 import re
+import struct
+import threading
 from functools import wraps
-from time import sleep, time
+from time import time
 
 from pydatpiff.errors import MvpError
 from pydatpiff.frontend.screen import Verbose
 from pydatpiff.utils.filehandler import File
 
-from ...utils.utils import threader_wrapper
 from .audio_engine import Popen
 from .baseplayer import BasePlayer, MetaData
+from .duration import Mp3Header
+from .mpvipc import IPCController
 
 
 class MPV(BasePlayer):
@@ -16,17 +20,62 @@ class MPV(BasePlayer):
     # Save the user's CPU :-)
     _MAX_INACTIVITY = 60 * 10
 
-    def __init__(self):
+    # properties observed over mpv's IPC socket. See: MPV._on_ipc_event
+    _IPC_PROPERTIES = ("time-pos", "pause", "eof-reached", "volume", "duration")
+
+    def __init__(self, ipc=False, persistent=False):
+        """
+        Args:
+            ipc (bool, optional): control mpv over its JSON IPC socket (--input-ipc-server) instead of stdin.
+                    Playback time and state are then pushed by mpv instead of estimated. (default: False)
+            persistent (bool, optional): keep a single mpv process alive and load each track into it,
+                    so track switches skip mpv's start up and queued tracks play gapless.
+                    Implies ipc. See: MPV.enqueue (default: False)
+        """
         self.time_captured = None
         self._song_path = None
         self._song = None
         self._popen = None
+        self._paused_at = None
+        self._pause_timer = None
+        self._ipc = ipc or persistent
+        self._persistent = persistent
+        self._playing_path = None  # track loaded in the persistent mpv
+        self._queued_path = None  # track mpv plays next. See: MPV.enqueue
+        self._ipc_connection = None
+        self._time_pos = None  # playback time pushed by mpv over IPC
+        self._duration = None  # track length in seconds. See: MPV.set_track
+        self._stream_duration = None  # length of a streamed track, pushed by mpv over IPC
+        self._window = (None, None)  # (start, length) in seconds of the part of the track played
         super().__init__()
 
         # making Baseplayer state -> private to public
         self.state = self._state
 
-    def _pre_popen(self, song):
+    def _pre_popen(self, song, ipc_socket=None):
+        start, length = self._window
+        window = ["--start=%s" % start] if start else []
+        window += ["--length=%s" % length] if length else []
+        if ipc_socket and self._persistent:
+            # options given on the command line apply to every track loaded after.
+            # The persistent mpv starts idle, and loads each track with its own window. See: MPV._load_track
+            return [
+                "mpv",
+                "--no-terminal",
+                "--no-audio-display",
+                "--input-ipc-server=%s" % ipc_socket,
+                "--idle=yes",
+                "--gapless-audio=yes",
+            ]
+        if ipc_socket:
+            return [
+                "mpv",
+                "--no-terminal",
+                "--no-audio-display",
+                "--input-ipc-server=%s" % ipc_socket,
+                *window,
+                "%s" % song,
+            ]
         return [
             "mpv",
             "--input-terminal=yes",
@@ -34,35 +83,90 @@ class MPV(BasePlayer):
             "--input-file=/proc/self/fd/0",
             "--no-term-osd",
             "--osc=no",
+            *window,
             "%s" % song,
         ]
 
-    @threader_wrapper
+    def _connect_ipc(self, popen, ipc_socket):
+        """Connect to mpv's IPC socket and observe the playback properties."""
+        try:
+            connection = IPCController.shared().connect(ipc_socket, lambda message: self._on_ipc_event(popen, message))
+        except ConnectionError:
+            Verbose("Unable to control mpv. Is mpv's IPC supported on your device?")
+            raise MvpError(1)
+        finally:
+            try:
+                os.remove(ipc_socket)  # connected sockets do not need their path
+            except OSError:
+                pass
+        connection.observe(*self._IPC_PROPERTIES)
+        return connection
+
+    def _on_ipc_event(self, popen, message):
+        """
+        Called on the IPC controller's thread with each message mpv pushes.
+        Keeps the player's state in sync with mpv's.
+        """
+        if popen is not self._popen:
+            return
+
+        event = message.get("event")
+        if event == "end-file" and self._persistent:
+            # the persistent mpv stays idle, or moves on to the queued track, at the end of a track
+            if message.get("reason") == "eof":
+                self._playing_path, self._queued_path = self._queued_path, None
+                if not self._track_stopped:
+                    self._time_pos = 0
+                    self._transition(self.TRACK_ENDED)
+            return
+        if event != "property-change":
+            return
+
+        name, data = message.get("name"), message.get("data")
+        if name == "time-pos" and data is not None:
+            self._time_pos = data
+        elif name == "duration" and data:
+            self._stream_duration = data
+        elif name == "volume" and data is not None:
+            self._global_volume = int(data)
+        elif name == "pause" and data is not None:
+            # commands already moved the state. Only changes made by mpv itself are published.
+            if data and self._track_playing:
+                self._transition(self.PAUSED)
+            elif not data and self._track_paused:
+                self._transition(self.RESUMED)
+        elif name == "eof-reached" and data and not self._persistent:
+            self._on_exit(popen)
+
     def _handle_pause_event(self):
         """
-        Captures the time duration when the track is paused.
-        Once track is unpause time will be added back to the original track time
+        Captures the time when the track is paused.
+        Once track is unpause, the paused time will be added back to the original track time.
         This time will be used to calculate the accuracy of current_position
         when pause state changes from pause to playing.
         """
-        rollback = 0
-        while True:
-            rollback += 1
-            if not self._track_paused or self._track_playing:
-                self._track_start_time += rollback
-                return
-            sleep(1)  # must use sleep to prevent high cpu usage while threading
-
-            if rollback > self._MAX_INACTIVITY:
-                Verbose('Pydatpiff program was killed due to "Pause Inactivity"...')
-                exit(1)
+        if self._pause_timer is not None:
+            self._pause_timer.cancel()
+            self._pause_timer = None
+
+        if self._track_paused:
+            self._paused_at = time()
+            self._pause_timer = threading.Timer(self._MAX_INACTIVITY, self._on_pause_inactivity)
+            self._pause_timer.daemon = True
+            self._pause_timer.start()
+        elif self._paused_at is not None:
+            self._track_start_time += time() - self._paused_at
+            self._paused_at = None
+
+    def _on_pause_inactivity(self):
+        Verbose('Pydatpiff player was stopped due to "Pause Inactivity"...')
+        self.stop
 
     @property
     def duration(self):
         """Return track length  in seconds"""
-        if hasattr(self, "_metadata"):
-            return self._metadata.track_duration
-        return 0
+        # streamed tracks have no local file to read their length from
+        return self._duration or self._stream_duration or 0
 
     def _format_time(self, pos=None):
         """Format current song time to clock format"""
@@ -74,7 +178,11 @@ class MPV(BasePlayer):
     @property
     def current_time(self):
         """Current time of track"""
-        time_now = time() - self._track_start_time
+        if self._ipc_connection is not None:
+            # mpv reports the position in the whole track
+            return 0 if self._track_stopped else max((self._time_pos or 0) - (self._window[0] or 0), 0)
+
+        time_now = (self._paused_at or time()) - self._track_start_time
         # always capture time to adjust pause time
         self.time_captured = time_now
 
@@ -122,7 +230,9 @@ class MPV(BasePlayer):
 
         @wraps(func)
         def inner(self, time_sec):
-            self._sync_track_time(time_sec)
+            # mpv pushes the position it seeked to over IPC. See: MPV._on_ipc_event
+            if self._ipc_connection is None:
+                self._sync_track_time(time_sec)
             return func(self, time_sec)
 
         return inner
@@ -139,50 +249,178 @@ class MPV(BasePlayer):
         if not raw_sec.isnumeric():
             Verbose("Must use numerical numbers")
             return
+        if self._ipc_connection is not None:
+            self._ipc_connection.command("seek", int(sec), "relative")
+            return int(sec)
         seek = "seek %s \n" % sec
         self._write_cmd(seek)
         return int(sec)
 
-    def set_track(self, name, path):
-        # media class method
+    def set_track(self, name, path, duration=None, start=None, length=None):
+        """
+        Load a track. Media class method.
+
+        Args:
+            name (str): track's title
+            path (str): path or url of the track
+            duration (float, optional): track's length in seconds, when known
+            start (float, optional): seconds into the track where playback starts
+            length (float, optional): seconds of the track played from start. e.g: a demo
+        """
 
-        if File.is_file(path):
+        is_stream = bool(re.match(r"https?://", str(path)))
+        if is_stream or File.is_file(path):
+            if not self._persistent:
+                # the previous track's process must not report the end of the new track
+                self._kill_process()
             self._song = name
             self._song_path = path
-            self._metadata = MetaData(path)
-            self._track_loaded = True
-            self._track_start_time = time()
+            # mpv streams urls itself, reading only the start of the track before playing
+            self._window = (start, length)
+            if length or duration or is_stream:
+                self._duration = length or duration
+            else:
+                self._duration = self._probe_duration(path)
+            self._stream_duration = None
             self._volume = self._global_volume
-            self.auto_manage_state()
+            self._transition(self.TRACK_LOADED)
+            self._handle_pause_event()  # forget the previous track's pause
+            self._track_start_time = time()
         else:
             raise MvpError(1)
 
-        Popen.unregister()
-
     def _write_cmd(self, cmd):
         """
         Handle user input and write command to media player( VLC or MPV) stdin.
         param: cmd - string character to write
         """
+        if self._ipc_connection is not None:
+            # mpv's IPC accepts the same text commands as stdin
+            self._ipc_connection.send_text(cmd)
+            return
+
         if getattr(self, "_popen"):
             if self._track_loaded and self._popen.is_alive:
-                self._popen.stdin.write("{}\n".format(cmd).encode("utf8"))
-                self._popen.stdin.flush()
+                try:
+                    self._popen.stdin.write("{}\n".format(cmd).encode("utf8"))
+                    self._popen.stdin.flush()
+                except BrokenPipeError:
+                    pass  # mpv exited after the check. MPV._on_exit handles it.
                 return
 
+    def _on_exit(self, popen):
+        """
+        Called once mpv's process exits. mpv exits by itself at the end of the track.
+        See: Popen.register
+        """
+        if popen is self._popen and not self._track_stopped:
+            self._popen = None
+            self._close_ipc()
+            self._transition(self.TRACK_ENDED)
+
+    def _kill_process(self):
+        """Kill this player's mpv process. The processes of other players keep running."""
+        popen, self._popen = self._popen, None
+        self._close_ipc()
+        if popen is not None and popen.is_alive:
+            popen.kill()
+
+    def _close_ipc(self):
+        connection, self._ipc_connection = self._ipc_connection, None
+        if connection is not None:
+            connection.close()
+
     @property
     def play(self):
         # set_track method will handle the loadeding of track
         if self._track_loaded:
             if self._track_playing:
                 return
+            if self._track_paused:
+                self.pause  # noqa - unpause the track
+                return
+            if self._persistent and self._is_running:
+                self._load_track()
+                return
             # if track not loaded, then load it and play
-            self._popen = Popen(self._pre_popen(self._song_path))
-            self._popen.register()
-            self._track_loaded = True
-            self._track_playing = True
-            self.play  # noqa  - this is a property function in baseplayer
+            ipc_socket = IPCController.socket_path() if self._ipc else None
+            self._popen = Popen(self._pre_popen(self._song_path, ipc_socket))
+            self._popen.register(self._on_exit, self._popen)
+            if ipc_socket:
+                self._time_pos = 0
+                self._ipc_connection = self._connect_ipc(self._popen, ipc_socket)
+            if self._persistent:
+                self._playing_path = None
+                self._load_track()
+                return
+            self._playing_path = self._song_path
+            self._track_start_time = time()
             self._volume = self._global_volume
+            self._transition(self.TRACK_STARTED)
+
+    @staticmethod
+    def _probe_duration(path):
+        """Return the length in seconds of an mp3 file, None when it is unknown. See: DurationProvider.duration"""
+        try:
+            # only the mp3's first frames are read. See: Mp3Header
+            duration = Mp3Header.probe_file(path)
+        except (OSError, struct.error):
+            duration = None
+        if duration:
+            return duration
+        try:
+            return MetaData(path).track_duration
+        except Exception:  # mutagen's errors. mutagen is imported on first use
+            return None
+
+    @property
+    def _is_running(self):
+        """True when the persistent mpv process is alive and connected."""
+        connection = self._ipc_connection
+        return self._popen is not None and self._popen.is_alive and connection is not None and not connection.closed
+
+    def _load_track(self):
+        """Play the loaded track in the persistent mpv process."""
+        start, length = self._window
+        if self._playing_path != self._song_path or start or length:
+            # per-file options, so the window does not apply to the track queued after. See: MPV.enqueue
+            if start or length:
+                options = {"start": str(start)} if start else {}
+                if length:
+                    options["end"] = str((start or 0) + length)
+                # named arguments: mpv 0.38 takes an index as loadfile's third positional argument
+                self._ipc_connection.command(
+                    {"name": "loadfile", "url": self._song_path, "flags": "replace", "options": options}
+                )
+            else:
+                self._ipc_connection.command("loadfile", self._song_path, "replace")
+            # a window of a track is not the track mpv queues. See: MPV.enqueue
+            self._playing_path = None if start or length else self._song_path
+        # else mpv already moved on to the queued track
+        self._queued_path = None
+        self._ipc_connection.command("set_property", "pause", False)
+        self._time_pos = 0
+        self._track_start_time = time()
+        self._volume = self._global_volume
+        self._transition(self.TRACK_STARTED)
+
+    def enqueue(self, path):
+        """
+        Queue the track mpv plays once the current track ends, without a gap.
+        Only a persistent mpv can queue tracks. See: MPV(persistent=True)
+
+        Args:
+            path (str): path or url of the next track
+
+        Returns:
+            bool: True when the track was queued
+        """
+        if not (self._persistent and self._is_running):
+            return False
+        self._ipc_connection.command("playlist-clear")  # keeps the current track
+        self._ipc_connection.command("loadfile", path, "append")
+        self._queued_path = path
+        return True
 
     @property
     def pause(self):
@@ -192,15 +430,14 @@ class MPV(BasePlayer):
             if self._track_playing:
                 cmd = "set pause yes \n"
                 self._write_cmd(cmd)
-                self._track_playing = False
-                self._track_paused = True
+                self._transition(self.PAUSED)
                 self._handle_pause_event()
             else:
                 Verbose("\nUnpause")
-                self._track_paused = False
-                self._track_playing = True
                 cmd = "set pause no \n"
                 self._write_cmd(cmd)
+                self._transition(self.RESUMED)
+                self._handle_pause_event()
         else:
             Verbose("No track playing")
         return
@@ -224,11 +461,23 @@ class MPV(BasePlayer):
     @property
     def stop(self):
         """Stop the current track from playing."""
+        # transition first, so the process' exit is not reported as the end of the track. See: MPV._on_exit
+        self._transition(self.STOPPED)
+        self._handle_pause_event()
+        if self._persistent and self._is_running:
+            # keep mpv running, idle, for the next track
+            self._ipc_connection.command("stop")
+            self._playing_path = self._queued_path = None
+            return
         self._write_cmd("quit \n")
-        self._track_stopped = True
-        Popen.unregister()
+        self._kill_process()
         return
 
+    def close(self):
+        """Stop the track, then end this player's mpv process and its IPC connection, even a persistent mpv."""
+        super().close()
+        self._kill_process()
+
     @property
     def _volume(self):
         """Current media player volume"""
@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+
+from pydatpiff.frontend.screen import Verbose
+
+from .baseplayer import BasePlayer
+
+logger = logging.getLogger(__name__)
+
+
+class NullPlayer(BasePlayer):
+    """
+    A player without audio output, for servers, tests and benchmarks.
+
+    It keeps the player state and publishes the player events of a real player,
+    so Media sessions run the same way without a sound device, mpv or VLC.
+    Playback time is simulated, and tracks end once their duration has played.
+
+    Usage:
+        player = NullPlayer(speed=60)  # plays a minute of each track per second
+        player = NullPlayer(speed=None, record=True)  # time only moves with NullPlayer.advance
+        player.set_track("Artist - Song", path, duration=200)
+        player.play
+        player.advance(200)  # ends the track
+        player.timeline  # [(seconds, "track_loaded", "Artist - Song"), ...]
+    """
+
+    def __init__(self, speed=1.0, clock=None, record=False):
+        """
+        Args:
+            speed (float, optional): seconds of a track played per second. None: time only moves
+                    with NullPlayer.advance (default: 1.0 - real time)
+            clock (function, optional): returns the current time in seconds (default: time.monotonic)
+            record (bool, optional): record the player's events in NullPlayer.timeline (default: False)
+        """
+        self.speed = speed
+        self._clock = clock or time.monotonic
+        self._song = None
+        self._path = None
+        self._duration = None  # track length in seconds
+        self._window = (None, None)  # (start, length) in seconds of the part of the track played
+        self._position = 0  # seconds played when the track last started or resumed
+        self._resumed_at = None  # clock time the track last started or resumed
+        self._timer = None  # ends the track. See: NullPlayer._schedule_end
+        self._generation = 0  # outdates the scheduled end of the track
+        self._volume = self._global_volume
+        super().__init__()
+
+        self.timeline = []  # (seconds since the player was created, event, track) of each event
+        self._created_at = time.perf_counter()
+        if record:
+            self.subscribe(self._record)
+
+    def _record(self, event):
+        self.timeline.append((time.perf_counter() - self._created_at, event, self._song))
+        logger.debug("%s: %s", event, self._song)
+
+    @property
+    def duration(self):
+        start, length = self._window
+        return length or self._duration or 0
+
+    def _format_time(self, pos=None):
+        """Format current song time to clock format"""
+        mins, secs = divmod(int(pos or 0), 60)
+        return mins, secs
+
+    @property
+    def current_time(self):
+        position = self._position
+        if self._track_playing and self.speed and self._resumed_at is not None:
+            position += (self._clock() - self._resumed_at) * self.speed
+        return min(position, self.duration) if self.duration else position
+
+    def _hold(self):
+        """Stop the simulated time at the current position."""
+        self._position = self.current_time
+        self._resumed_at = self._clock()
+        self._generation += 1
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def _schedule_end(self):
+        """End the track once the rest of it has played."""
+        if not (self._track_playing and self.speed and self.duration):
+            return
+        remaining = max(self.duration - self._position, 0) / self.speed
+        self._timer = threading.Timer(remaining, self._on_end, args=(self._generation,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_end(self, generation):
+        if generation == self._generation and self._track_playing:
+            self._hold()
+            self._position = self.duration
+            self._transition(self.TRACK_ENDED)
+
+    def advance(self, seconds):
+        """
+        Move the simulated time of the playing track forward, ending the track when it reaches its end.
+
+        Args:
+            seconds (float): seconds of the track played
+        """
+        if not self._track_playing:
+            return
+        self._hold()
+        self._position += seconds
+        if self.duration and self._position >= self.duration:
+            self._on_end(self._generation)
+        else:
+            self._schedule_end()
+
+    def set_track(self, name, path=None, duration=None, start=None, length=None):
+        if path:
+            self._hold()
+            self._song = name
+            self._path = path
+            self._duration = duration
+            self._window = (start, length)
+            self._position = 0
+            self._volume = self._global_volume
+            self._transition(self.TRACK_LOADED)
+        else:
+            Verbose("No media to play")
+
+    def volume(self, level=None):
+        """Set the volume to exact number"""
+        if not level or not isinstance(level, int):
+            return
+        self._volume = min(max(level, 0), 100)
+        self._global_volume = self._volume
+
+    def volume_up(self, level=5):
+        """Turn the media volume up"""
+        self.volume(self._volume + level)
+
+    def volume_down(self, level=5):
+        """Turn the media volume down"""
+        self.volume(self._volume - level)
+
+    @property
+    def play(self):
+        """Play media song"""
+        if not self._track_loaded or self._track_playing:
+            return
+        if self._track_paused:
+            self.pause  # noqa - unpause the track
+            return
+        self._hold()
+        if self._track_stopped or self._system_stopped:
+            self._position = 0
+        self._transition(self.TRACK_STARTED)
+        self._schedule_end()
+
+    @property
+    def pause(self):
+        """Pause and unpause the track."""
+        if self._track_playing:
+            self._hold()
+            self._transition(self.PAUSED)
+        elif self._track_paused:
+            self._hold()
+            self._transition(self.RESUMED)
+            self._schedule_end()
+
+    def _seeker(self, pos=10, rew=True):
+        if not self._track_loaded:
+            return
+        self._hold()
+        position = self._position - pos if rew else self._position + pos
+        self._position = min(max(position, 0), self.duration)
+        self._schedule_end()
+
+    def rewind(self, pos=10):
+        """Rewind track
+        @params: pos:: time(second) to rewind media. default:10(sec)
+        """
+        self._seeker(pos, True)
+
+    def ffwd(self, pos=10):
+        """Fast forward track
+        @params: pos:: time(second) to rewind media. default:10(sec)
+        """
+        self._seeker(pos, False)
+
+    @property
+    def stop(self):
+        """Stops the song"""
+        if self._track_loaded:
+            self._hold()
+            self._transition(self.STOPPED)
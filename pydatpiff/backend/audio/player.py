@@ -1,21 +1,62 @@
+import importlib
+import os
+
 from pydatpiff.errors import InstallationError, PlayerError
 from pydatpiff.utils.utils import Object
 
-from .mpvplayer import MPV
-from .vlcplayer import VLCPlayer
+from .baseplayer import BasePlayer
+
+# player name -> (module, class, options). Players are imported when requested,
+# so importing pydatpiff does not load libvlc.
+_PLAYERS = {
+    "vlc": ("vlcplayer", "VLCPlayer", {}),
+    "mpv": ("mpvplayer", "MPV", {}),
+    "mpv-ipc": ("mpvplayer", "MPV", {"ipc": True}),
+    "mpv-persistent": ("mpvplayer", "MPV", {"persistent": True}),
+    "null": ("nullplayer", "NullPlayer", {}),
+    "recording": ("nullplayer", "NullPlayer", {"record": True}),
+}
+
+
+def _player_class(name):
+    module, class_name, _ = _PLAYERS[name]
+    return getattr(importlib.import_module("." + module, __package__), class_name)
+
+
+def __getattr__(name):
+    # e.g: from pydatpiff.backend.audio.player import MPV
+    for player in ("mpv", "vlc", "null"):
+        if _PLAYERS[player][1] == name:
+            return _player_class(player)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 
 class Player:
     @classmethod
     def getPlayer(cls, player=None):
+        """
+        Return a new player.
+
+        Args:
+            player (str,function,BasePlayer, optional): name of the player. e.g: "mpv", "vlc", "null"
+                    (no audio output) or "recording" (a null player recording its events. See: NullPlayer.timeline).
+                    A player class or a function returning a player is called, and a player is returned as is.
+                    (default: the environment variable PYDATPIFF_PLAYER, else the first player installed)
+        """
+        if player is None:
+            # e.g: PYDATPIFF_PLAYER=null on servers without a sound device
+            player = os.environ.get("PYDATPIFF_PLAYER")
+        if isinstance(player, BasePlayer):
+            return player
+        if callable(player):
+            return player()
 
-        player_options = {"vlc": VLCPlayer, "mpv": MPV}
         # return the player specified by the user
         try:
             if player:
                 player = Object.strip_and_lower(player)
-                selected_player_class = player_options.get(player, None)
-                return selected_player_class.__call__()
+                _, _, options = _PLAYERS[player]
+                return _player_class(player)(**options)
         except:  # noqa
             extended_msg = "\nThe player you have chosen is not compatible with your device.\n"
             raise PlayerError(5, extended_msg)
@@ -26,10 +67,10 @@ class Player:
     @classmethod
     def _getDefaultPlayer(cls):
         # Note: Player order will be respected!
-        default_players = [MPV, VLCPlayer]
+        default_players = ["mpv", "vlc"]
         for player in default_players:
             try:
-                return player.__call__()
+                return _player_class(player).__call__()
             except:  # noqa
                 pass
 
@@ -11,16 +11,26 @@ class VLCPlayer(BasePlayer):
         try:
             self._vlc = vlc.Instance("-q")
             self._player = self._vlc.media_player_new()
+            # VLC reports the end of a track on its own thread
+            events = self._player.event_manager()
+            events.event_attach(vlc.EventType.MediaPlayerEndReached, self._on_end_reached)
+            events.event_attach(vlc.EventType.MediaPlayerEncounteredError, self._on_end_reached)
         except:
             extended_msg = "Please check if your device supports VLC"
             raise PlayerError(1, extended_msg)
 
         self._volume = self._global_volume
+        self._duration = None  # track length in seconds, when known before playing
+        self._window = (None, None)  # (start, length) in seconds of the part of the track played
         super().__init__(*args, **kwargs)
 
     @property
     def duration(self):
-        return self._player.get_length()
+        start, length = self._window
+        if length:
+            return int(length * 1000)
+        # VLC only knows the length once the track is parsed
+        return self._player.get_length() or int((self._duration or 0) * 1000)
 
     def _format_time(self, pos=None):
         """Format current song time to clock format"""
@@ -30,18 +40,30 @@ class VLCPlayer(BasePlayer):
 
     @property
     def current_time(self):
-        return self._player.get_time()
+        # VLC reports the time in the whole track
+        return max(self._player.get_time() - int((self._window[0] or 0) * 1000), 0)
 
-    def set_track(self, name, path=None):
+    def set_track(self, name, path=None, duration=None, start=None, length=None):
         if path:
             self._song = name
             self._path = path
-            self._player.set_mrl(path)
+            self._duration = duration
+            self._window = (start, length)
+            options = [":start-time=%s" % start] if start else []
+            options += [":stop-time=%s" % ((start or 0) + length)] if length else []
+            self._player.set_mrl(path, *options)
             self._volume = self._global_volume
-            self.auto_manage_state()
+            self._transition(self.TRACK_LOADED)
         else:
             Verbose("No media to play")
 
+    def _on_end_reached(self, event):
+        """
+        VLC event callback, called when the track ends or fails.
+        NOTE: VLC's methods must not be called from its event callbacks.
+        """
+        self._transition(self.TRACK_ENDED)
+
     @property
     def _volume(self):
         """Get current media player volume"""
@@ -85,13 +107,11 @@ class VLCPlayer(BasePlayer):
                 self.pause
             else:
                 self._player.play()
-
-            self._track_playing = True
+                self._transition(self.TRACK_STARTED)
         else:
             try:
                 self.stop
-                self.set_track(self._song, self._path)
-                self.state["stopped"] = False
+                self.set_track(self._song, self._path, self._duration, *self._window)
                 return self.play
             except RecursionError:
                 self.state["stopped"] = True
@@ -101,9 +121,8 @@ class VLCPlayer(BasePlayer):
         """Pause the media song"""
 
         is_paused = self._track_paused
-        self._track_playing = is_paused
         self._player.pause()
-        self._track_paused = not is_paused
+        self._transition(self.RESUMED if is_paused else self.PAUSED)
 
     def _seeker(self, pos=10, rew=True):
         if self._state["stopped"]:
@@ -137,4 +156,4 @@ class VLCPlayer(BasePlayer):
     @property
     def stop(self):
         self._player.stop()
-        self._track_stopped = True
+        self._transition(self.STOPPED)
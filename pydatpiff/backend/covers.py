@@ -0,0 +1,159 @@
+import io
+import logging
+import threading
+from concurrent.futures import Future
+
+from pydatpiff.utils.cache import CoverCache
+from pydatpiff.utils.request import Session
+from pydatpiff.utils.utils import ThreadQueue
+
+logger = logging.getLogger(__name__)
+
+
+class CoverService:
+    """
+    Album cover images, requested once and kept in a disk cache shared across sessions.
+
+    Covers are served by url, or by mixtape link once a Mixtape's covers are added.
+    Thumbnails require Pillow: pip install pydatpiff[thumbnails]
+
+    Usage:
+        covers = CoverService.shared()
+        covers.add(mixtape)  # requests every cover of the mixtape concurrently
+        path = covers.get(mixtape.links[0], thumbnail=(128, 128))
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cache=None, session=None):
+        """
+        Args:
+            cache (CoverCache, optional): disk cache of the covers (default: CoverCache.shared)
+            session (Session, optional): session requesting the covers
+        """
+        # an empty cache is falsy. See: DiskCache.__len__
+        self.cache = cache if cache is not None else CoverCache.shared()
+        self._session = session or Session()
+        self._links = {}  # mixtape link -> cover url
+        self._pending = {}  # cover url -> Future of its path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Return the cover service shared by every Media and download."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def fetch(self, url):
+        """
+        Return the path of a cover's cached image, requesting it on first use.
+        Concurrent calls for the same url wait for the same request.
+
+        Returns:
+            str: path of the image, or None when the cover is unavailable
+        """
+        path = self.cache.path(url)
+        if path is not None:
+            return path
+
+        with self._lock:
+            future = self._pending.get(url)
+            requesting = future is None
+            if requesting:
+                future = self._pending[url] = Future()
+        if requesting:
+            # requested on the calling thread. Waiting on a worker pool from its own worker could deadlock.
+            try:
+                future.set_result(self._request(url))
+            except Exception as error:
+                # the threads waiting for the same url raise it too
+                future.set_exception(error)
+            finally:
+                with self._lock:
+                    self._pending.pop(url, None)
+        return future.result()
+
+    def _request(self, url):
+        try:
+            response = self._session.method("GET", url, bypass=True)
+        except Exception:
+            logger.warning("Cover unavailable: %s", url)
+            return None
+        if not response or not response.content:
+            return None
+        return self.cache.put(url, response.content)
+
+    def fetch_all(self, urls):
+        """
+        Request covers concurrently.
+
+        Returns:
+            dict: url -> path of each cover's image, None when a cover is unavailable
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        return dict(zip(urls, ThreadQueue(self.fetch, urls).execute()))
+
+    def add(self, mixtape):
+        """
+        Request every cover of a Mixtape concurrently, and serve them by mixtape link. See: CoverService.get
+
+        Returns:
+            dict: mixtape link -> path of its cover's image
+        """
+        links = dict(zip(mixtape.links or [], mixtape.album_covers or []))
+        with self._lock:
+            self._links.update(links)
+        paths = self.fetch_all(links.values())
+        return {link: paths.get(url) for link, url in links.items()}
+
+    def get(self, link, thumbnail=None):
+        """
+        Return the path of a mixtape's cover. See: CoverService.add
+
+        Args:
+            link (str): mixtape link. See: Mixtape.links
+            thumbnail (tuple, optional): (width, height) of a thumbnail to return instead of the cover
+
+        Returns:
+            str: path of the image, or None when the cover is unknown or unavailable
+        """
+        url = self._links.get(link)
+        if url is None:
+            return None
+        if thumbnail:
+            return self.thumbnail(url, thumbnail)
+        return self.fetch(url)
+
+    def thumbnail(self, url, size=(128, 128)):
+        """
+        Return the path of a cover's thumbnail, created once and kept in the cache.
+        The thumbnail keeps the cover's aspect ratio and fits within size.
+
+        Args:
+            url (str): cover's url
+            size (tuple, optional): (width, height) the thumbnail fits in (default: (128, 128))
+
+        Raises:
+            ImportError: Pillow is not installed
+        """
+        key = "%s#thumbnail=%sx%s" % (url, size[0], size[1])
+        path = self.cache.path(key)
+        if path is not None:
+            return path
+
+        source = self.fetch(url)
+        if source is None:
+            return None
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ImportError("Cover thumbnails require Pillow: pip install pydatpiff[thumbnails]")
+
+        with Image.open(source) as image:
+            image.thumbnail(size)
+            buffer = io.BytesIO()
+            image.convert("RGB").save(buffer, format="JPEG", quality=85)
+        return self.cache.put(key, buffer.getvalue())
@@ -0,0 +1,822 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+
+from pydatpiff.errors import DownloadError
+from pydatpiff.utils.filehandler import File
+from pydatpiff.utils.request import RateLimiter, Session
+
+from .audio.duration import Mp3Header
+from .mediasetup import Album, Mp3
+from .tagging import Tagger
+
+logger = logging.getLogger(__name__)
+
+
+def read_json_lines(path):
+    """
+    Return the records of a json lines file, one json object per line. Lines cut short by a crash are skipped.
+    A file holding a single json object (e.g: saved before json lines were used) is returned as one record.
+    """
+    with open(path, "r") as f:
+        text = f.read()
+    try:
+        records = [json.loads(text)]
+    except ValueError:
+        records = []
+        for line in text.splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning("Skipped an unreadable line of %s", path)
+    return [record for record in records if isinstance(record, dict)]
+
+
+def append_json_line(path, record):
+    """Append a record to a json lines file. See: read_json_lines"""
+    line = (json.dumps(record) + "\n").encode()
+    with open(path, "a+b") as f:
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                # the last line was cut short, or the file is a single json object
+                line = b"\n" + line
+        f.write(line)
+
+
+def write_json_lines(path, records):
+    """Replace a json lines file with records, atomically."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_file = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+    os.replace(tmp_file, path)
+
+
+def album_dir_name(artist, album, output):
+    """Return the folder an album is downloaded to. e.g: <output>/<artist> - <album>"""
+    return os.path.join(output, File.standardize_file_name(" - ".join((artist, album))))
+
+
+def song_file_name(artist, song, output):
+    """Return the path a song is downloaded to. e.g: <output>/<artist> - <song>.mp3"""
+    title = " - ".join((artist, song.strip() + ".mp3"))
+    return File.join(output, File.standardize_file_name(title))
+
+
+def album_tags(artist, album, song, track, cover=None):
+    """Return the ID3 tags of an album's track. See: Tagger.tag"""
+    return {"title": song.strip(), "artist": artist, "album": album, "track": track, "cover": cover}
+
+
+class DownloadProgress:
+    """Progress of every track of an album download. See: AlbumDownloader"""
+
+    # progress events
+    STARTED = "started"
+    PROGRESS = "progress"  # a chunk of a track was written
+    COMPLETED = "completed"
+    SKIPPED = "skipped"  # the track was already downloaded
+    DEDUPLICATED = "deduplicated"  # the track was linked to an identical track already downloaded
+    FAILED = "failed"
+
+    def __init__(self, tracks):
+        self.tracks = tracks
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.deduplicated = 0
+        self.bytes_downloaded = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "<DownloadProgress %s/%s tracks %s bytes>" % (self.done, self.tracks, self.bytes_downloaded)
+
+    @property
+    def done(self):
+        """Number of tracks finished, whether they completed, were skipped, deduplicated or failed."""
+        return self.completed + self.skipped + self.deduplicated + self.failed
+
+    def _update(self, **counts):
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+
+class DownloadManifest:
+    """
+    Index of downloaded tracks by content hash. Each change is appended to a json lines file.
+
+    The same track posted on several mixtapes is only requested once. Copies tagged alike are hardlinks
+    to the first file, others are copied then tagged. A track whose url was already downloaded is not
+    requested again.
+
+    File layout, one json object per line. The file is rewritten as a single snapshot once it grows
+    past compact_after records:
+        {"hashes": {"<sha256>": {"<file path>": <size>}}, "urls": {"<mp3 url>": "<sha256>"},
+         "tags": {"<file path>": {"title": "<title>", ...}}}  - snapshot
+        {"op": "add", "hash": "<sha256>", "path": "<file path>", "size": <size>, "url": "<mp3 url>", "tags": {...}}
+        {"op": "size", "hash": "<sha256>", "path": "<file path>", "size": <size>}
+    """
+
+    compact_after = 1000  # records appended before the file is rewritten on load
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str, optional): manifest's json lines file. The manifest is not saved without one.
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._file_locks = {}  # (device, inode) -> Lock of each file. See: DownloadManifest.using
+        self._storing = threading.Lock()  # See: DownloadManifest.storing
+        self._manifest = self._load()
+
+    def _load(self):
+        manifest = {"hashes": {}, "urls": {}, "tags": {}}
+        if not self.path or not os.path.isfile(self.path):
+            return manifest
+        try:
+            records = read_json_lines(self.path)
+        except OSError:
+            logger.warning("Download manifest is unreadable, starting a new manifest: %s", self.path)
+            return manifest
+
+        for record in records:
+            try:
+                if "hashes" in record:
+                    manifest.update(record)
+                else:
+                    self._apply(manifest, record)
+            except (KeyError, TypeError, AttributeError):
+                logger.warning("Skipped an invalid record of the download manifest: %s", self.path)
+        if len(records) > self.compact_after:
+            write_json_lines(self.path, [manifest])
+        return manifest
+
+    @staticmethod
+    def _apply(manifest, record):
+        path = record["path"]
+        manifest["hashes"].setdefault(record["hash"], {})[path] = record["size"]
+        if record["op"] == "add":
+            if record.get("url"):
+                manifest["urls"][record["url"]] = record["hash"]
+            if record.get("tags"):
+                manifest["tags"][path] = record["tags"]
+            else:
+                manifest["tags"].pop(path, None)
+
+    def _record(self, record):
+        """Apply a change to the manifest, and append it to the manifest's file."""
+        with self._lock:
+            self._apply(self._manifest, record)
+            if self.path:
+                append_json_line(self.path, record)
+
+    @staticmethod
+    def _is_intact(path, size):
+        return os.path.isfile(path) and os.path.getsize(path) == size
+
+    def add(self, content_hash, path, link=None, tags=None):
+        """Record a downloaded file's content hash, the url it was downloaded from and the tags it is tagged with."""
+        path = os.path.abspath(path)
+        record = {"op": "add", "hash": content_hash, "path": path, "size": os.path.getsize(path)}
+        record.update({"url": link, "tags": tags})
+        self._record(record)
+
+    def find(self, content_hash, tags=None):
+        """
+        Return a downloaded file with content_hash, None when no intact file has it.
+        A file tagged with tags is returned first. See: DownloadManifest.tags_of
+        """
+        with self._lock:
+            paths = list(self._manifest["hashes"].get(content_hash, {}))
+        found = [path for path in paths if self._is_recorded(content_hash, path)]
+        tagged = [path for path in found if tags is not None and self.tags_of(path) == tags]
+        return (tagged or found or [None])[0]
+
+    def _is_recorded(self, content_hash, path):
+        """Return True when path is intact, once the file is no longer changing. See: DownloadManifest.updating"""
+        with self.using(path):
+            with self._lock:
+                size = self._manifest["hashes"].get(content_hash, {}).get(path)
+            return size is not None and self._is_intact(path, size)
+
+    def hash_of(self, link):
+        """Return the content hash of the track downloaded from link, None when link was never downloaded."""
+        return self._manifest["urls"].get(link)
+
+    def find_url(self, link, tags=None):
+        """Return a downloaded file of link's content. See: DownloadManifest.find"""
+        content_hash = self.hash_of(link)
+        return self.find(content_hash, tags) if content_hash else None
+
+    def tags_of(self, path):
+        """Return the tags a downloaded file was tagged with, None when it was not tagged."""
+        return self._manifest["tags"].get(os.path.abspath(path))
+
+    @contextmanager
+    def using(self, path):
+        """
+        Hold a downloaded file while it is copied or changed.
+        Threads using the same file, or one of its hardlinks, wait for each other.
+        """
+        try:
+            stat = os.stat(path)
+            key = (stat.st_dev, stat.st_ino)
+        except OSError:
+            key = os.path.abspath(path)
+        with self._lock:
+            lock = self._file_locks.setdefault(key, threading.Lock())
+        with lock:
+            yield
+
+    @contextmanager
+    def storing(self):
+        """
+        Hold while a downloaded track is looked up then recorded. See: AlbumDownloader._store
+        Identical tracks downloaded at once are then stored once.
+        """
+        with self._storing:
+            yield
+
+    @contextmanager
+    def updating(self, path):
+        """
+        Change a downloaded file. e.g: tag it. See: Tagger
+        The file is not looked up or copied while it changes, and its new size is recorded after.
+        """
+        with self.using(path):
+            yield
+            self.refresh(path)
+
+    def refresh(self, path):
+        """Record the new size of a file changed after its download, and of its hardlinks."""
+        path = os.path.abspath(path)
+        with self._lock:
+            changed = [
+                {"op": "size", "hash": content_hash, "path": other, "size": os.path.getsize(other)}
+                for content_hash, paths in self._manifest["hashes"].items()
+                if path in paths
+                for other in paths
+                if os.path.isfile(other) and os.path.samefile(other, path)
+            ]
+            for record in changed:
+                self._record(record)
+
+    def is_complete(self, path):
+        """
+        Return True when path is a recorded download of the size recorded,
+        None when the manifest has no record of path.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            for paths in self._manifest["hashes"].values():
+                if path in paths:
+                    return self._is_intact(path, paths[path])
+
+
+class AlbumDownloader:
+    """
+    Download an album's tracks concurrently, writing each track to disk as it arrives.
+
+    Each track is written in chunks to "<file>.part", then renamed to its file once complete,
+    so an interrupted download never leaves a truncated mp3 behind. An interrupted track is
+    resumed from the end of its ".part" file, and tracks already downloaded are skipped.
+
+    Each track is hashed as it is written, and checked against its Content-Length and for mp3 frames
+    before it is renamed. With a DownloadManifest, identical tracks are stored once. See: DownloadManifest
+
+    Usage:
+        downloader = AlbumDownloader(workers=4, on_progress=print)
+        failed = downloader.download([(mp3_url, "/music/Artist - Song.mp3")])
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    PART_SUFFIX = ".part"
+
+    def __init__(
+        self,
+        workers=3,
+        session=None,
+        audio_cache=None,
+        on_progress=None,
+        slots=None,
+        rate_limiter=None,
+        manifest=None,
+        tagger=None,
+    ):
+        """
+        Args:
+            workers (int, optional): number of tracks downloaded at once (default: 3)
+            session (Session, optional): session requesting the tracks
+            audio_cache (AudioCache, optional): cached tracks are copied from the cache instead of requested
+            on_progress (function, optional): called with (event, path, progress) for each progress event.
+                    e.g: (DownloadProgress.COMPLETED, "/music/Artist - Song.mp3", DownloadProgress)
+            slots (threading.Semaphore, optional): caps the tracks downloading at once across downloaders
+            rate_limiter (RateLimiter, optional): spaces out the requests to each host
+            manifest (DownloadManifest, optional): index of the tracks already downloaded
+            tagger (Tagger, optional): tags the downloaded tracks. See: pydatpiff.backend.tagging.Tagger
+        """
+        self.workers = workers
+        self._session = session or Session()
+        self.audio_cache = audio_cache
+        self.on_progress = on_progress
+        self.slots = slots
+        self.rate_limiter = rate_limiter
+        self.manifest = manifest
+        self.tagger = tagger
+        self.progress = None
+        self._tagging = []  # Future of each track being tagged
+
+    def _report(self, event, path):
+        if self.on_progress is not None:
+            try:
+                self.on_progress(event, path, self.progress)
+            except Exception:
+                logger.exception("Download progress callback failed: %s", event)
+
+    def download(self, tracks):
+        """
+        Download tracks concurrently. Returns once every track is downloaded and tagged.
+
+        Args:
+            tracks (list): (mp3 url, file path) or (mp3 url, file path, tags) of each track.
+                    Tags are written by the downloader's tagger. See: Tagger.tag
+
+        Returns:
+            list: (mp3 url, file path, exception) of each track that failed
+        """
+        tracks = [tuple(track) + (None,) * (3 - len(track)) for track in tracks]
+        self.progress = DownloadProgress(len(tracks))
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pydatpiff-download") as pool:
+            futures = {pool.submit(self.download_track, link, path, tags): (link, path) for link, path, tags in tracks}
+            for future in as_completed(futures):
+                link, path = futures[future]
+                error = future.exception()
+                if error is not None:
+                    logger.warning("Download failed: %s - %r", path, error)
+                    self.progress._update(failed=1)
+                    self._report(DownloadProgress.FAILED, path)
+                    failed.append((link, path, error))
+
+        # tracks were tagged while the others downloaded
+        for future in wait(self._tagging).done:
+            if future.exception() is not None:
+                logger.warning("Tagging failed: %r", future.exception())
+        self._tagging = []
+        return failed
+
+    def download_track(self, link, path, tags=None):
+        """
+        Download a single track to path, resuming its ".part" file if one exists.
+        Downloaded tracks are tagged with tags in the background. See: AlbumDownloader.tagger
+
+        Returns:
+            bool: True when the track was downloaded, False when it was already downloaded
+
+        Raises:
+            RequestError: the track could not be requested
+            DownloadError: the connection closed before the whole track was received, or the track is not an mp3
+        """
+        if self.progress is None:
+            self.progress = DownloadProgress(1)
+        if os.path.isfile(path) and self._is_complete(path):
+            self.progress._update(skipped=1)
+            self._report(DownloadProgress.SKIPPED, path)
+            return False
+
+        if self.slots is not None:
+            with self.slots:
+                self._download(link, path, tags)
+        else:
+            self._download(link, path, tags)
+        return True
+
+    def _is_complete(self, path):
+        """Return True when the file at path is an intact download."""
+        complete = self.manifest.is_complete(path) if self.manifest is not None else None
+        if complete is None:
+            # downloaded without a manifest
+            return Mp3Header.probe_file(path) is not None
+        return complete
+
+    @staticmethod
+    def _hash_file(path, content_hash=None):
+        """Hash a file in chunks. Returns the hashlib object, updated with the file's content."""
+        content_hash = content_hash or hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(AlbumDownloader.CHUNK_SIZE), b""):
+                content_hash.update(chunk)
+        return content_hash
+
+    @staticmethod
+    def _link(source, path):
+        """Hardlink path to source, copying source where hardlinks are not supported."""
+        if os.path.isfile(path):
+            os.remove(path)
+        try:
+            os.link(source, path)
+        except OSError:
+            shutil.copyfile(source, path)
+
+    def _link_duplicate(self, duplicate, path, tags=None):
+        """
+        Store path as a copy of duplicate, an identical track already downloaded.
+        Tracks tagged alike share one file (see: AlbumDownloader._link), others are copied to be tagged.
+
+        Returns:
+            bool: True when path is a copy that must be tagged
+        """
+        retag = bool(tags) and self.tagger is not None and self.manifest.tags_of(duplicate) != tags
+        if retag:
+            if os.path.isfile(path):
+                # path may be a hardlink, which the copy would write through
+                os.remove(path)
+            with self.manifest.using(duplicate):
+                shutil.copyfile(duplicate, path)
+        else:
+            self._link(duplicate, path)
+        return retag
+
+    def _download(self, link, path, tags=None):
+        self._report(DownloadProgress.STARTED, path)
+        # the url was already downloaded, so the track is not requested again
+        content_hash = self.manifest.hash_of(link) if self.manifest is not None else None
+        duplicate = self.manifest.find(content_hash, tags) if content_hash else None
+        if not duplicate:
+            content_hash = self._fetch_part(link, path + self.PART_SUFFIX)
+            # the same track was downloaded from another url (e.g: another mixtape)
+            duplicate = self._store(link, path, content_hash, tags)
+
+        if duplicate:
+            retag = self._link_duplicate(duplicate, path, tags)
+            # hardlinks keep the tags of the file they share
+            self.manifest.add(content_hash, path, link, tags if retag else self.manifest.tags_of(duplicate))
+            self.progress._update(deduplicated=1)
+            event = DownloadProgress.DEDUPLICATED
+        else:
+            retag = bool(tags) and self.tagger is not None
+            self.progress._update(completed=1)
+            event = DownloadProgress.COMPLETED
+        if retag:
+            guard = self.manifest.updating if self.manifest is not None else None
+            self._tagging.append(self.tagger.tag(path, tags, guard=guard))
+        self._report(event, path)
+
+    def _store(self, link, path, content_hash, tags=None):
+        """
+        Rename a downloaded track's ".part" file to path, and record it in the manifest.
+        Identical tracks downloaded at once are stored one at a time, so only the first one is kept.
+
+        Returns:
+            str: an identical track already downloaded, kept instead of the ".part" file. None when stored.
+        """
+        part = path + self.PART_SUFFIX
+        if self.manifest is None:
+            os.replace(part, path)
+            return None
+        with self.manifest.storing():
+            duplicate = self.manifest.find(content_hash, tags)
+            if duplicate and os.path.abspath(duplicate) != os.path.abspath(path):
+                os.remove(part)
+                return duplicate
+            os.replace(part, path)
+            self.manifest.add(content_hash, path, link, tags if self.tagger is not None else None)
+
+    def _fetch_part(self, link, part):
+        """
+        Write the track to its ".part" file, from the audio cache or requested, and check it is an mp3.
+
+        Returns:
+            str: sha256 hash of the track
+        """
+        content_hash = self._copy_cached(link, part)
+        if content_hash is None:
+            if self.rate_limiter is not None:
+                self.rate_limiter.wait(link)
+            content_hash = self._write_part(link, part)
+
+        if Mp3Header.probe_file(part) is None:
+            os.remove(part)
+            raise DownloadError(3, "no mp3 frame found: %s" % link)
+        return content_hash
+
+    def _copy_cached(self, link, part):
+        """
+        Copy the track from the audio cache to its ".part" file.
+
+        Returns:
+            str: sha256 hash of the track, None when the track is not cached or its cached file is damaged
+        """
+        cached = self.audio_cache.path(link) if self.audio_cache is not None else None
+        if not cached:
+            return None
+        shutil.copyfile(cached, part)
+        content_hash = self._hash_file(part).hexdigest()
+        # the audio cache is addressed by content hash, so a cached file cut short no longer matches it
+        if content_hash != self.audio_cache.hash_of(link):
+            logger.warning("Damaged cached track requested again: %s", link)
+            os.remove(part)
+            self.audio_cache.remove(link)
+            return None
+        self.progress._update(bytes_downloaded=os.path.getsize(part))
+        return content_hash
+
+    def _write_part(self, link, part):
+        """
+        Write the track's body to its ".part" file, continuing from the file's end.
+
+        Returns:
+            str: sha256 hash of the whole track, computed as it is written
+        """
+        start = os.path.getsize(part) if os.path.isfile(part) else 0
+        response = self._session.stream(link, start=start)
+        content_hash = hashlib.sha256()
+        try:
+            if response.status_code == 416:
+                # the partial file is complete
+                return self._hash_file(part).hexdigest()
+            if response.status_code != 206:
+                start = 0  # the server sent the whole track
+            elif start:
+                # resumed files are hashed from their start
+                self._hash_file(part, content_hash)
+
+            length = response.headers.get("Content-Length")
+            expected = start + int(length) if length is not None else None
+            written = start
+            with open(part, "ab" if start else "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    f.write(chunk)
+                    content_hash.update(chunk)
+                    written += len(chunk)
+                    self.progress._update(bytes_downloaded=len(chunk))
+                    self._report(DownloadProgress.PROGRESS, part[: -len(self.PART_SUFFIX)])
+        finally:
+            response.close()
+
+        if expected is not None and written < expected:
+            # keep the partial file, so the next download resumes it
+            raise DownloadError(1, "%s of %s bytes received" % (written, expected))
+        if expected is not None and written > expected:
+            os.remove(part)
+            raise DownloadError(1, "%s bytes received, expected %s" % (written, expected))
+        return content_hash.hexdigest()
+
+
+class DownloadJournal:
+    """
+    Status of each album of a bulk download. Each change is appended to a json lines file.
+    A crashed or interrupted download reads it back to skip the albums already downloaded.
+
+    File layout, one json object per line. The latest line of an album is its status:
+        {"album": "<album url>", "status": "done", "failed": [], "bytes": 0}
+    """
+
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+    compact_after = 1000  # records appended before the file is rewritten on load
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str, optional): journal's json lines file. The journal is not saved without one.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._jobs = self._load()
+
+    def _load(self):
+        if not self.path or not os.path.isfile(self.path):
+            return {}
+        try:
+            records = read_json_lines(self.path)
+        except OSError:
+            logger.warning("Download journal is unreadable, starting a new journal: %s", self.path)
+            return {}
+
+        jobs = {}
+        for record in records:
+            if "album" in record:
+                jobs[record.pop("album")] = record
+            else:
+                # journal saved as a single json object. e.g: {"<album url>": {"status": "done", ...}}
+                jobs.update(record)
+        if len(records) > self.compact_after:
+            write_json_lines(self.path, [dict(job, album=album) for album, job in jobs.items()])
+        return jobs
+
+    def status(self, album):
+        """Return an album's status, None when the album was never started."""
+        job = self._jobs.get(album)
+        if job:
+            return job["status"]
+
+    def update(self, album, status, failed=(), size=0):
+        """Record an album's status and append it to the journal."""
+        with self._lock:
+            self._jobs[album] = {"status": status, "failed": list(failed), "bytes": size}
+            if self.path:
+                append_json_line(self.path, dict(self._jobs[album], album=album))
+
+
+class DownloadReport:
+    """Totals and throughput of a bulk download. See: DownloadScheduler"""
+
+    def __init__(self):
+        self.albums = 0
+        self.albums_failed = 0
+        self.albums_skipped = 0  # downloaded by a previous run. See: DownloadJournal
+        self.tracks = 0
+        self.tracks_failed = 0
+        self.tracks_skipped = 0
+        self.tracks_deduplicated = 0  # linked to an identical track. See: DownloadManifest
+        self.bytes_downloaded = 0
+        self.started = time.monotonic()
+        self.elapsed = 0
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return (
+            "Albums: %s downloaded, %s skipped, %s failed\n"
+            "Tracks: %s downloaded, %s skipped, %s deduplicated, %s failed\n"
+            "Downloaded %s in %.1fs (%s/s)"
+            % (
+                self.albums,
+                self.albums_skipped,
+                self.albums_failed,
+                self.tracks,
+                self.tracks_skipped,
+                self.tracks_deduplicated,
+                self.tracks_failed,
+                File.get_human_readable_file_size(self.bytes_downloaded),
+                self.elapsed,
+                File.get_human_readable_file_size(int(self.throughput)),
+            )
+        )
+
+    @property
+    def throughput(self):
+        """Bytes downloaded per second."""
+        return self.bytes_downloaded / self.elapsed if self.elapsed else 0
+
+    def _add(self, progress):
+        with self._lock:
+            self.tracks += progress.completed
+            self.tracks_skipped += progress.skipped
+            self.tracks_deduplicated += progress.deduplicated
+            self.tracks_failed += progress.failed
+            self.bytes_downloaded += progress.bytes_downloaded
+
+
+class DownloadScheduler:
+    """
+    Download many albums of a Mixtape concurrently.
+
+    Each album has its own Album and Mp3, so albums download in parallel without
+    sharing a Media. The number of tracks downloading at once is capped across all albums.
+
+    Usage:
+        scheduler = DownloadScheduler("/music", albums=4, tracks=12, rate=5, journal="/music/journal.json")
+        report = scheduler.download(Mixtape("hot"))
+        print(report)
+    """
+
+    # manifest of the downloaded tracks, in the output folder. See: DownloadManifest
+    MANIFEST_NAME = ".pydatpiff-manifest.json"
+
+    def __init__(
+        self,
+        output,
+        albums=2,
+        tracks=8,
+        rate=None,
+        journal=None,
+        session=None,
+        audio_cache=None,
+        on_progress=None,
+        tag=True,
+    ):
+        """
+        Args:
+            output (str): folder the albums are downloaded to
+            albums (int, optional): number of albums downloaded at once (default: 2)
+            tracks (int, optional): number of tracks downloaded at once, across all albums (default: 8)
+            rate (float, optional): requests per second allowed to each host (default: unlimited)
+            journal (str, optional): json file recording each album's status. See: DownloadJournal
+            session (Session, optional): session requesting the tracks
+            audio_cache (AudioCache, optional): cached tracks are copied from the cache instead of requested
+            on_progress (function, optional): called with (event, path, progress) for each track.
+                    See: AlbumDownloader
+            tag (bool, optional): write ID3 tags and cover art to the downloaded tracks (default: True)
+        """
+        self.output = output
+        self.albums = albums
+        self.tracks = tracks
+        self.rate_limiter = RateLimiter(rate)
+        self._page_session = Session(rate_limiter=self.rate_limiter)
+        self.journal = DownloadJournal(journal)
+        self._session = session or Session()
+        self.audio_cache = audio_cache
+        self.on_progress = on_progress
+        self.manifest = DownloadManifest(os.path.join(output, self.MANIFEST_NAME))
+        self.tagger = Tagger.shared() if tag else None
+        self._slots = threading.BoundedSemaphore(tracks)
+
+    def download(self, mixtape, selection=None):
+        """
+        Download a Mixtape's albums.
+
+        Args:
+            mixtape (Mixtape): pydatpiff.Mixtape instance
+            selection (list, optional): indexes of the albums to download (default: every album)
+
+        Returns:
+            DownloadReport: totals and throughput of the download
+        """
+        if not os.path.isdir(self.output):
+            raise FileNotFoundError("Invalid directory: %s" % self.output)
+
+        indexes = range(len(mixtape)) if selection is None else selection
+        covers = mixtape.album_covers or []
+        jobs = [
+            (mixtape.artists[index], mixtape.links[index], covers[index] if index < len(covers) else None)
+            for index in indexes
+        ]
+        report = DownloadReport()
+        with ThreadPoolExecutor(max_workers=self.albums, thread_name_prefix="pydatpiff-album") as pool:
+            futures = {
+                pool.submit(self.download_album, artist, link, report, cover): link for artist, link, cover in jobs
+            }
+            for future in as_completed(futures):
+                if future.exception() is not None:
+                    logger.warning("Album download failed: %s - %r", futures[future], future.exception())
+                    self.journal.update(futures[future], DownloadJournal.FAILED)
+                    with report._lock:
+                        report.albums_failed += 1
+        report.elapsed = time.monotonic() - report.started
+        return report
+
+    def download_album(self, artist, link, report=None, cover=None):
+        """
+        Download a single album. Albums the journal records as done are skipped.
+
+        Args:
+            artist (str): album's artist
+            link (str): album's link. See: Mixtape.links
+            report (DownloadReport, optional): report the album's totals are added to
+            cover (str, optional): url of the album's cover art. See: Mixtape.album_covers
+
+        Returns:
+            list: (mp3 url, file path, exception) of each track that failed
+        """
+        report = report or DownloadReport()
+        if self.journal.status(link) == DownloadJournal.DONE:
+            with report._lock:
+                report.albums_skipped += 1
+            return []
+
+        self.journal.update(link, DownloadJournal.PENDING)
+        album = Album(link)
+        # the album's pages are requested from the album's own hosts. See: Album._page_requests
+        album._session = self._page_session
+        mp3 = Mp3(album)
+        output = album_dir_name(artist, album.name, self.output)
+        os.makedirs(output, exist_ok=True)
+
+        tracks = [
+            (url, song_file_name(artist, song, output), album_tags(artist, album.name, song, number, cover))
+            for number, (song, url) in enumerate(zip(mp3.songs, mp3.mp3_urls), 1)
+        ]
+        downloader = AlbumDownloader(
+            workers=self.tracks,
+            session=self._session,
+            audio_cache=self.audio_cache,
+            on_progress=self.on_progress,
+            slots=self._slots,
+            rate_limiter=self.rate_limiter,
+            manifest=self.manifest,
+            tagger=self.tagger,
+        )
+        failed = downloader.download(tracks)
+        report._add(downloader.progress)
+        with report._lock:
+            if failed:
+                report.albums_failed += 1
+            else:
+                report.albums += 1
+
+        status = DownloadJournal.FAILED if failed else DownloadJournal.DONE
+        self.journal.update(link, status, [path for _, path, _ in failed], downloader.progress.bytes_downloaded)
+        return failed
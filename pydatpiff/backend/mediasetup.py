@@ -1,14 +1,37 @@
 import re
+import threading
+from functools import wraps
 
 from pydatpiff.constants import SERVER_DOWN_MSG
 from pydatpiff.errors import DatpiffError, Mp3Error
 from pydatpiff.urls import Urls
 from pydatpiff.utils.request import Session
-from pydatpiff.utils.utils import Object
+from pydatpiff.utils.utils import Object, ThreadQueue
 
 from .scraper import MediaScraper
 
 
+def album_page(page):
+    """
+    Property decorator for album fields that are parsed from one of Datpiff's web pages.
+
+    The decorated function receives the text of the page it declares. Each page is
+    requested once, on the first access of any field that needs it. See: Album._page_requests
+
+    Args:
+        page (str): name of the page the field is parsed from ("embed" or "album")
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def inner(self):
+            return f(self, self._load_page(page))
+
+        return property(inner)
+
+    return decorator
+
+
 class DatpiffPlayer:
     """
     Datpiff's frontend media player object
@@ -39,9 +62,13 @@ class DatpiffPlayer:
             raise Mp3Error(3, "Could not find album's name")
         return self.name
 
-    @property
-    def embedded_player_content(self):
+    @album_page("embed")
+    def embedded_player_content(self, content):
         """Returns Datpiff embedded player response text"""
+        return content
+
+    def _request_embedded_player(self):
+        """Request Datpiff's embedded player page for the current album."""
         # Note: Request Sessions are being cached for every request.
         #      If the url endpoint is found in the cached, the request
         #      will NOT be recalled.  Instead, the cached response will be returned.
@@ -97,28 +124,74 @@ class Album(DatpiffPlayer):
     includes:
         Album uploader name and bio
         Album's name and songs
+
+    Album's data is loaded lazily. No request is made until a field is accessed, and
+    each of the album's pages is requested at most once.
     """
 
     _session = Session()
 
-    def __init__(self, link):
+    # Album's web pages and the method used to request each page.
+    # Fields declare the page they are parsed from with `album_page`.
+    _page_requests = {
+        "embed": "_request_embedded_player",
+        "album": "_request_album_html",
+    }
+
+    def __init__(self, link, eager=False):
         """
         Media player Album object constructor.
         :param link: Link to the media player page.
+        :param eager: request all of the album's pages concurrently on initialization
+                        instead of on first access (default: False)
         """
 
         self._name = None
+        self._pages = {}
+        self._record = {}  # fields already parsed from the embedded player page. See: CrawlPipeline.albums
+        self._page_locks = {page: threading.Lock() for page in self._page_requests}
         self.link = "".join((Urls.datpiff["album"], link))
-        self._check_datpiff_version()
+        if eager:
+            self._load_pages()
 
     def __str__(self):
         return self.name
 
+    def _load_page(self, page):
+        """
+        Return the text of one of the album's pages, requesting it on first access.
+
+        Args:
+            page (str): name of the page. See: Album._page_requests
+        """
+        with self._page_locks[page]:
+            if page not in self._pages:
+                request = getattr(self, self._page_requests[page])
+                self._pages[page] = request()
+        return self._pages[page]
+
+    def _load_pages(self):
+        """Request all the album's pages concurrently."""
+        ThreadQueue(self._load_page, list(self._page_requests)).execute()
+
+    def _parsed(self, field, parser):
+        """
+        Return a field of the embedded player page, parsing the page only when the field was not parsed already.
+
+        Args:
+            field (str): name of the field. See: scraper.parse_album_page
+            parser (function): parses the field from the page's text
+        """
+        if field in self._record:
+            return self._record[field]
+        return parser(self.embedded_player_content)
+
     @property
     def name(self):
         # for desktop version issue we will use the mobile version
-        if hasattr(self, "_name"):
-            return self._name
+        if self._name is None:
+            self._check_datpiff_version()
+        return self._name
 
     @name.setter
     def name(self, album):
@@ -131,10 +204,9 @@ class Album(DatpiffPlayer):
 
     @property
     def bio(self):
-        return MediaScraper.get_uploader_bio(self.embedded_player_content)
+        return self._parsed("bio", MediaScraper.get_uploader_bio)
 
-    @property
-    def _album_html(self):
+    def _request_album_html(self):
         """
         Return the requests' response from the current Mixtape link
             See __init__ or mixtapes.Mixtape.links.
@@ -146,9 +218,14 @@ class Album(DatpiffPlayer):
             return response.text
         return " "
 
-    @property
-    def uploader(self):
-        return MediaScraper.get_uploader_name(self._album_html)
+    @album_page("album")
+    def _album_html(self, content):
+        """Return the text of the current Mixtape's page."""
+        return content
+
+    @album_page("album")
+    def uploader(self, content):
+        return MediaScraper.get_uploader_name(content)
 
     @classmethod
     def lookup_song(cls, links, song, *args, **kwargs):
@@ -177,6 +254,12 @@ class Mp3:
         self.album = album
         self.album_response = album.embedded_player_content
 
+    def _parsed(self, field, parser):
+        """Return a field of the album's page. Albums loaded by a CrawlPipeline were parsed already."""
+        if isinstance(self.album, Album):
+            return self.album._parsed(field, parser)
+        return parser(self.album_response)
+
     def __len__(self):
         if self.songs:
             return len(self.songs)
@@ -190,18 +273,23 @@ class Mp3:
     @property
     def songs(self):
         """Returns all songs name from album."""
-        return MediaScraper.get_song_titles(self.album_response)
+        return self._parsed("songs", MediaScraper.get_song_titles)
+
+    @property
+    def durations(self):
+        """Returns all songs duration listed on the album's page. e.g: ["02:14", "03:29"]"""
+        return self._parsed("durations", MediaScraper.get_duration_from)
 
     @property
     def __urlencoded_tracks(self):
         """Url encode audio url"""
-        songs = MediaScraper.get_mp3_urls(self.album_response)
+        songs = self._parsed("mp3_urls", MediaScraper.get_mp3_urls)
         return [re.sub(r"\s", "%20", song) for song in songs]
 
     @property
     def _album_id(self):
         """Media Album reference ID number Ex: 6/m1393dba"""
-        return MediaScraper.get_embed_player_id(self.album_response)
+        return self._parsed("player_id", MediaScraper.get_embed_player_id)
 
     @property
     def mp3_urls(self):
@@ -0,0 +1,166 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from pydatpiff.mixtapes import Mixtape
+from pydatpiff.utils.request import Session
+
+from .mediasetup import Album
+from .scraper import parse_album_page, parse_mixtape_page
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlPipeline:
+    """
+    Two stage pipeline for large crawls.
+
+    I/O threads request the pages, and a process pool parses them into records of
+    builtin types that are merged back into Mixtape and Album objects. Parsing is CPU
+    bound, so parsing off the request threads lets a crawl scale with the machine's cores.
+
+    Usage:
+        with CrawlPipeline(processes=16) as pipeline:
+            mixtapes = pipeline.crawl(["hot", "new", "top"])
+            pipeline.index_albums(mixtapes["hot"])
+    """
+
+    def __init__(self, processes=None, io_workers=16):
+        """
+        Args:
+            processes (int, optional): number of parsing processes (default: number of cores)
+            io_workers (int, optional): number of threads requesting pages (default: 16)
+        """
+        self.processes = processes
+        self.io_workers = io_workers
+        self._session = Session()
+        self._io_pool = None
+        self._process_pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _pools(self):
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="pydatpiff-io")
+            self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+        return self._io_pool, self._process_pool
+
+    def close(self):
+        """Shut down the pipeline's threads and processes."""
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+            self._process_pool.shutdown(wait=True)
+            self._io_pool = self._process_pool = None
+
+    def _request(self, url):
+        return self._session.method("GET", url).text
+
+    def _run(self, parser, urls):
+        """
+        Request every url and parse each page on the process pool as soon as it arrives.
+
+        Returns:
+            list: (page text, record) of each url, in url order. (None, None) when a page fails.
+        """
+        io_pool, process_pool = self._pools()
+        requests = {io_pool.submit(self._request, url): position for position, url in enumerate(urls)}
+
+        texts = [None] * len(urls)
+        parsing = {}
+        for request in as_completed(requests):
+            position = requests[request]
+            try:
+                texts[position] = request.result()
+            except Exception:
+                logger.warning("Page unavailable: %s", urls[position])
+                continue
+            parsing[position] = process_pool.submit(parser, texts[position])
+
+        results = [(None, None)] * len(urls)
+        for position, parse in parsing.items():
+            try:
+                results[position] = (texts[position], parse.result())
+            except Exception:
+                logger.warning("Page could not be parsed: %s", urls[position])
+        return results
+
+    def parse(self, parser, urls):
+        """
+        Request every url and parse its page with parser on the process pool.
+
+        Args:
+            parser (function): module level function that parses a page's text.
+                    e.g: pydatpiff.backend.scraper.parse_mixtape_page
+            urls (list): pages' urls
+
+        Returns:
+            list: record of each url, in url order. None when a page fails.
+        """
+        return [record for _, record in self._run(parser, urls)]
+
+    def mixtape_pages(self, urls):
+        """Return the parsed record of each mixtape page. See: scraper.parse_mixtape_page"""
+        return self.parse(parse_mixtape_page, urls)
+
+    def crawl(self, categories=None, limit=None):
+        """
+        Load the mixtapes of several categories at once.
+
+        Args:
+            categories (list, optional): Mixtape's categories (default: all categories)
+            limit (int, optional): maximum mixtapes per category
+
+        Returns:
+            dict: category -> pydatpiff.Mixtape
+        """
+        categories = list(categories or Mixtape.valid_categories)
+        self._pools()  # create the pools before they are shared by every category
+        with ThreadPoolExecutor(max_workers=len(categories) or 1) as pool:
+            mixtapes = pool.map(lambda category: Mixtape(category=category, limit=limit, pipeline=self), categories)
+            return dict(zip(categories, mixtapes))
+
+    def albums(self, links):
+        """
+        Load several albums at once.
+
+        Args:
+            links (list): Mixtape's links. See: pydatpiff.Mixtape.links
+
+        Returns:
+            list: Album of each link, with its embedded player page already loaded and parsed.
+                    None when an album is unavailable.
+        """
+        albums = [Album(link) for link in links]
+        urls = [album.build_web_player_url(album._album_ID) for album in albums]
+
+        results = []
+        for album, (text, record) in zip(albums, self._run(parse_album_page, urls)):
+            if record is None or record["name"] is None:
+                results.append(None)
+                continue
+            album._pages["embed"] = text
+            # Album and Mp3 read the fields parsed on the process pool instead of parsing the page again
+            album._record = record
+            album.name = record["name"]
+            results.append(album)
+        return results
+
+    def index_albums(self, mixtape):
+        """
+        Add every album of a Mixtape to its song index. See: pydatpiff.Mixtape.song_index
+
+        Args:
+            mixtape (instance class) -- pydatpiff.Mixtape instance
+        """
+        song_index = mixtape.song_index
+        pending = [index for index in range(len(mixtape)) if index not in song_index]
+        albums = [Album(mixtape.links[index]) for index in pending]
+        urls = [album.build_web_player_url(album._album_ID) for album in albums]
+
+        for index, record in zip(pending, self.parse(parse_album_page, urls)):
+            if record and record["name"] is not None:
+                song_index.add_album(index, record["name"], record["songs"])
+        return song_index
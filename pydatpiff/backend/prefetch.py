@@ -0,0 +1,114 @@
+import logging
+import threading
+
+from pydatpiff.utils.utils import Executor
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchScheduler:
+    """
+    Fetch the next tracks of an album in the background while the current track plays,
+    so the next track starts without waiting for its download.
+
+    Usage:
+        prefetcher = PrefetchScheduler(fetch, at=0.5, depth=2)
+        # start fetching the next two songs halfway through a 200 second track
+        prefetcher.schedule([next_link, following_link], duration=200)
+        # returns the in-flight or finished prefetch instead of requesting the song again
+        path = prefetcher.fetch(next_link)
+    """
+
+    def __init__(self, fetch, at=0.5, depth=1, on_fetched=None):
+        """
+        Args:
+            fetch (function): requests a song's mp3 url into the audio cache and returns its path
+            at (float, optional): when to start prefetching. Below 1, the fraction of the
+                    current track played. Otherwise, the seconds remaining in the current track.
+                    (default: 0.5 - halfway through the track)
+            depth (int, optional): number of following tracks to prefetch (default: 1)
+            on_fetched (function, optional): called with (link, path) once a prefetch succeeds
+        """
+        self._fetch = fetch
+        self._on_fetched = on_fetched
+        self.at = at
+        self.depth = depth
+        self._timer = None
+        self._pending = {}  # mp3 url -> Future
+        self._lock = threading.Lock()
+
+    def delay(self, duration):
+        """Return the seconds to wait before prefetching, for a track of duration seconds."""
+        if not duration:
+            # unknown track length
+            return 0
+        if self.at < 1:
+            return duration * self.at
+        return max(duration - self.at, 0)
+
+    def schedule(self, links, duration=0):
+        """
+        Prefetch the next tracks once the current track reaches the prefetch point.
+        Replaces the previous schedule.
+
+        Args:
+            links (list): mp3 urls of the tracks following the current track, in play order
+            duration (float, optional): length of the current track in seconds (default: prefetch now)
+        """
+        self.cancel()
+        links = list(links)[: self.depth]
+        if not links:
+            return
+
+        timer = threading.Timer(self.delay(duration), self.prefetch, args=(links,))
+        timer.daemon = True
+        with self._lock:
+            self._timer = timer
+        timer.start()
+
+    def cancel(self):
+        """Cancel the scheduled prefetch. Prefetches already running are kept for PrefetchScheduler.fetch."""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def prefetch(self, links):
+        """Start fetching each link in the background."""
+        for link in links:
+            self._submit(link)
+
+    def _submit(self, link):
+        with self._lock:
+            future = self._pending.get(link)
+            submitted = future is None
+            if submitted:
+                future = self._pending[link] = Executor.pool().submit(self._fetch, link)
+        if submitted:
+            # a finished future calls back right away, on this thread, so the lock must be released
+            future.add_done_callback(lambda _: self._done(link))
+        return future
+
+    def _done(self, link):
+        with self._lock:
+            future = self._pending.pop(link, None)
+        if future is None:
+            return
+        if future.exception() is not None:
+            logger.warning("Prefetch failed: %s", link)
+        elif self._on_fetched is not None and future.result():
+            self._on_fetched(link, future.result())
+
+    def fetch(self, link):
+        """
+        Return the path of a song's cached audio.
+        Waits for a running prefetch of link instead of requesting the song twice.
+        """
+        with self._lock:
+            future = self._pending.get(link)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass  # retry below
+        return self._fetch(link)
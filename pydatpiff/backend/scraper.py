@@ -2,8 +2,6 @@ import logging
 import re
 from functools import wraps
 
-import bs4
-
 from pydatpiff.constants import ampersands
 from pydatpiff.errors import Mp3Error
 from pydatpiff.urls import Urls
@@ -25,16 +23,95 @@ def escape_html_characters(char_list):
     return results
 
 
+def _parse_mixtape_items(bs4_content_list):
+    """Return the mixtapes' details from a page's mixtape listing."""
+    record = {
+        "artists": [],
+        "mixtapes": [],
+        "links": [],
+        "ratings": [],
+        "views": [],
+        "album_covers": [],
+    }
+    for content in bs4_content_list.findAll(class_="contentItemInner"):
+        # set album covers
+        record["album_covers"].extend([elem.find("img").get("src") for elem in content.findAll(class_="contentThumb")])
+
+        # set artists
+        record["artists"].extend([elem.text for elem in content.findAll(class_="artist")])
+
+        # Set mixtapes and links
+        links = [elem.find("a") for elem in content.findAll(class_="title")]
+
+        record["mixtapes"].extend([re.sub(r"listen\sto", "", link.get("title")).strip() for link in links])
+        record["links"].extend([link.get("href") for link in links])
+
+        # Set ratings and views
+        record["ratings"].extend([int(re.match(r"\d*", content.find(class_="text").img.get("alt"))[0])])
+        record["views"].extend(
+            [
+                int(
+                    re.sub(
+                        r"\D*",
+                        "",
+                        content.findAll(class_="text")[1].span.text,
+                    )[0]
+                )
+            ]
+        )
+    return record
+
+
+def parse_mixtape_page(text):
+    """
+    Parse a Datpiff mixtape's page.
+
+    The record returned only contains builtin types, so pages can be parsed
+    on a process pool. See: pydatpiff.backend.pipeline.CrawlPipeline
+
+    Args:
+        text (str): mixtape page's html
+
+    Returns:
+        dict: mixtapes' artists, mixtapes, links, ratings, views and album_covers,
+            and the total number of mixtapes on the page. None if no mixtapes are found.
+    """
+    # fmt: off
+    content_container_id = "leftColumnWide"  # Datpiff Mixtape's main content wrapper
+    content_wrapper_class = 'contentListing'
+    mixtapes_content_items = "contentItem"  # Mixtape' Content Wrapper
+    # fmt: on
+
+    # Using BeautifulSoap
+    import bs4
+
+    soup = bs4.BeautifulSoup(text, "html.parser")
+    content_container = soup.find(id=content_container_id)
+    if not content_container:
+        return None
+
+    content_listing = content_container.find(class_=content_wrapper_class)
+    mixtape_items = content_listing.findAll(class_=mixtapes_content_items)
+
+    record = _parse_mixtape_items(content_listing)
+    record["total"] = len(mixtape_items)
+    return record
+
+
 class MixtapeScraper:
     _MAX_RETRY = 5
     _MAX_MIXTAPES_PER_PAGE = 52  # maximum amount of mixtapes available per Datpiff's Page
 
-    def __init__(self, base_response, limit=600):
+    def __init__(self, base_response, limit=600, pipeline=None):
+        import bs4
+
         self._base_response = base_response  # Session.response
         self._soup = bs4.BeautifulSoup(base_response.text, "html.parser")
 
         # prepare request session
         self._session = Session()
+        # optional pydatpiff.backend.pipeline.CrawlPipeline used to fetch and parse pages
+        self._pipeline = pipeline
 
         self._total_mixtapes = 0  # total mixtapes found
         # total mixtapes requested by user
@@ -60,34 +137,17 @@ class MixtapeScraper:
         for attr in self._attribute_list:
             setattr(self, attr, [])
 
-    def _setMedias_attributes(self, bs4_content_list):
-
-        for content in bs4_content_list.findAll(class_="contentItemInner"):
-            # set album covers
-            self._album_covers.extend([elem.find("img").get("src") for elem in content.findAll(class_="contentThumb")])
-
-            # set artists
-            self._artists.extend([elem.text for elem in content.findAll(class_="artist")])
-
-            # Set mixtapes and links
-            links = [elem.find("a") for elem in content.findAll(class_="title")]
-
-            self._mixtapes.extend([re.sub(r"listen\sto", "", link.get("title")).strip() for link in links])
-            self._links.extend([link.get("href") for link in links])
-
-            # Set ratings and views
-            self._ratings.extend([int(re.match(r"\d*", content.find(class_="text").img.get("alt"))[0])])
-            self._views.extend(
-                [
-                    int(
-                        re.sub(
-                            r"\D*",
-                            "",
-                            content.findAll(class_="text")[1].span.text,
-                        )[0]
-                    )
-                ]
-            )
+    def _merge_mixtape_record(self, record):
+        """
+        Add a parsed mixtape page's details to the Mixtape's attributes.
+        See: parse_mixtape_page
+        """
+        if not record:
+            return
+        # Set total mixtapes found
+        self.total_mixtapes = record["total"]
+        for attr in self._attribute_list:
+            getattr(self, attr).extend(record[attr.lstrip("_")])
 
     @property
     def total_mixtapes(self):
@@ -112,23 +172,8 @@ class MixtapeScraper:
             [int]: total number of mixtape's on page
         """
         text = self._session.method("GET", url=url).text
-        # fmt: off
-        content_container_id = "leftColumnWide"  # Datpiff Mixtape's main content wrapper
-        content_wrapper_class = 'contentListing'
-        mixtapes_content_items = "contentItem"  # Mixtape' Content Wrapper
-        # fmt: on
         try:
-            # Using BeautifulSoap
-            soup = bs4.BeautifulSoup(text, "html.parser")
-            content_container = soup.find(id=content_container_id)
-            if content_container:
-                content_listing = content_container.find(class_=content_wrapper_class)
-                mixtape_items = content_listing.findAll(class_=mixtapes_content_items)
-                # Set total mixtapes found
-                self.total_mixtapes = len(mixtape_items)
-
-                # set attribute for Mixtape Class
-                self._setMedias_attributes(content_listing)
+            self._merge_mixtape_record(parse_mixtape_page(text))
         except:
             logger.exception("CacheContentError")
             return 0
@@ -155,6 +200,9 @@ class MixtapeScraper:
         """
         page_links = pagination.find(class_="links").findAll("a")
         page_links = [BASE_URL + link.get("href") for link in page_links]
+        if self._pipeline is not None:
+            return self._get_pipeline_pages(page_links)
+
         for page_number, link in enumerate(page_links, start=1):
             # get the page link and parse it
             self._parse_mixtape_page(link)
@@ -172,6 +220,20 @@ class MixtapeScraper:
             self._parse_mixtape_page(self._base_response.url)
             return [self._base_response.url]
 
+    def _get_pipeline_pages(self, page_links):
+        """
+        Request and parse all the pages needed to reach the mixtape limit at once.
+        See: pydatpiff.backend.pipeline.CrawlPipeline
+        """
+        total_pages = -(-self._MIXTAPE_LIMIT // self._MAX_MIXTAPES_PER_PAGE)  # round up
+        page_links = page_links[: max(total_pages, 1)]
+        records = self._pipeline.mixtape_pages(page_links)
+        for page_number, record in enumerate(records, start=1):
+            self._merge_mixtape_record(record)
+            if self.total_mixtapes >= self._MIXTAPE_LIMIT:
+                return page_links[:page_number]
+        return page_links
+
     def _request_get(self, url):
         """
         Thread safe request session's method.
@@ -244,3 +306,28 @@ class MediaScraper:
             return re.findall(r"fix.concat\(\s\'(.*\w*)\'", text)  # noqa
         except AttributeError:
             raise Mp3Error(4)
+
+
+def parse_album_page(text):
+    """
+    Parse a Datpiff album's embedded player page.
+
+    The record returned only contains builtin types, so pages can be parsed
+    on a process pool. See: pydatpiff.backend.pipeline.CrawlPipeline
+
+    Args:
+        text (str): embedded player page's html
+
+    Returns:
+        dict: album's name, bio, songs, mp3_urls, durations and player_id. See: MediaScraper.get_embed_player_id
+    """
+    name = re.search(r"class=\"title\">(.*)<", text)
+    player_id = re.search(r"/mixtapes/([\w\/]*)", text)
+    return {
+        "name": name.group(1).strip() if name else None,
+        "player_id": player_id.group(1) if player_id else None,
+        "bio": MediaScraper.get_uploader_bio(text),
+        "songs": MediaScraper.get_song_titles(text),
+        "mp3_urls": MediaScraper.get_mp3_urls(text),
+        "durations": MediaScraper.get_duration_from(text),
+    }
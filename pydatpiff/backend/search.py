@@ -0,0 +1,226 @@
+import math
+import re
+import threading
+from collections import Counter
+
+from pydatpiff.utils.utils import Object
+
+
+class SearchEngine:
+    """
+    Fuzzy, ranked search over a Mixtape's artists, mixtape titles and song titles.
+
+    Every title is split into n-grams (trigrams by default). A query first collects
+    the titles sharing the most n-grams with it, then only those candidates are ranked
+    by edit distance and by the mixtape's popularity (ratings and views).
+    Typos are tolerated. e.g: "wokesha" matches "Wockesha (Remix)".
+    """
+
+    ARTIST = "artist"
+    MIXTAPE = "mixtape"
+    SONG = "song"
+
+    # maximum edit distance allowed per character of the query
+    MAX_DISTANCE_RATIO = 0.34
+    # number of titles ranked by edit distance per query
+    MAX_CANDIDATES = 50
+    # how much popularity can raise a title's score. Similarity is scored from 0 to 1.
+    POPULARITY_WEIGHT = 0.1
+
+    def __init__(self, ngram=3):
+        self.ngram = ngram
+        self._documents = []  # [(kind, title, normalized title, payload, popularity)]
+        self._grams = {}  # n-gram -> {document id}
+        self._albums = set()  # mixtape indexes whose songs are indexed
+        self._popularity = []  # popularity of each mixtape. See: SearchEngine.popularity
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    @classmethod
+    def from_mixtape(cls, mixtape, **kwargs):
+        """
+        Create a search engine with all of a Mixtape's artists and mixtape titles.
+        Songs are added per album. See: SearchEngine.add_album
+
+        Args:
+            mixtape (instance class) -- pydatpiff.Mixtape instance
+        """
+        engine = cls(**kwargs)
+        engine._popularity = cls.popularity(mixtape)
+        for index, (artist, title) in enumerate(zip(mixtape.artists or [], mixtape.mixtapes or [])):
+            engine.add(cls.ARTIST, artist, {"index": index + 1}, engine._popularity[index])
+            engine.add(cls.MIXTAPE, title, {"index": index + 1}, engine._popularity[index])
+        return engine
+
+    @staticmethod
+    def popularity(mixtape):
+        """
+        Return each mixtape's popularity from 0 to 1,
+        weighting its rating and its views equally.
+        """
+        ratings = mixtape.ratings or []
+        views = mixtape.views or []
+        max_rating = max(ratings, default=0) or 1
+        max_views = math.log1p(max(views, default=0)) or 1
+
+        results = []
+        for index in range(len(mixtape)):
+            rating = ratings[index] if index < len(ratings) else 0
+            view = views[index] if index < len(views) else 0
+            results.append(0.5 * rating / max_rating + 0.5 * math.log1p(view) / max_views)
+        return results
+
+    @staticmethod
+    def normalize(text):
+        """Lowercase text and collapse punctuation and whitespace to single spaces."""
+        return " ".join(re.findall(r"\w+", Object.strip_and_lower(text)))
+
+    def _ngrams(self, text, query=False):
+        """
+        Return the n-grams of text. Titles also include the first letter of each word (e.g: " w"),
+        so a query's single letter words match titles by prefix.
+        """
+        padded = " %s " % text
+        grams = {padded[i : i + self.ngram] for i in range(len(padded) - self.ngram + 1)}
+        words = text.split()
+        if query:
+            words = [word for word in words if len(word) < self.ngram - 1]
+        grams.update(" " + word[0] for word in words)
+        return grams
+
+    def add(self, kind, title, payload=None, popularity=0):
+        """
+        Index a single title.
+
+        Args:
+            kind (str): type of title - SearchEngine.ARTIST, MIXTAPE or SONG
+            title (str): title to index
+            payload (dict, optional): data returned with the title in search results
+            popularity (float, optional): popularity of the title from 0 to 1
+        """
+        with self._lock:
+            self._add(kind, title, payload, popularity)
+
+    def _add(self, kind, title, payload=None, popularity=0):
+        """Index a single title. The caller holds the index lock. See: SearchEngine.add"""
+        normalized = self.normalize(title)
+        if not normalized:
+            return
+
+        document_id = len(self._documents)
+        self._documents.append((kind, title, normalized, payload or {}, popularity))
+        for gram in self._ngrams(normalized):
+            self._grams.setdefault(gram, set()).add(document_id)
+
+    def add_album(self, mixtape_index, album_name, songs):
+        """
+        Index all songs from a mixtape's album once.
+
+        Args:
+            mixtape_index (int): index of the album in Mixtape.links
+            album_name (str): name of the album
+            songs (list): album's song titles
+        """
+        popularity = self._popularity
+        popularity = popularity[mixtape_index] if mixtape_index < len(popularity) else 0
+        # searches never see half an album, and an album added at once by two threads is indexed once
+        with self._lock:
+            if mixtape_index in self._albums:
+                return
+            self._albums.add(mixtape_index)
+            for track_index, song in enumerate(songs):
+                payload = {"index": mixtape_index + 1, "album": album_name, "song": song, "track": track_index + 1}
+                self._add(self.SONG, song, payload, popularity)
+
+    @staticmethod
+    def edit_distance(query, text):
+        """
+        Return the fewest edits needed for query to match any part of text.
+        (Levenshtein distance, where the skipped start and end of text are free)
+        """
+        previous = [0] * (len(text) + 1)
+        for i, query_char in enumerate(query, start=1):
+            current = [i]
+            for j, text_char in enumerate(text, start=1):
+                cost = 0 if query_char == text_char else 1
+                current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost))
+            previous = current
+        return min(previous)
+
+    def _distance(self, query, normalized):
+        """
+        Return the edit distance between query and a normalized title.
+        Matches starting mid-word cost one extra edit, and the words of query may be in any order.
+        """
+        text = " " + normalized
+        distance = self.edit_distance(" " + query, text)
+        words = query.split()
+        if len(words) > 1:
+            distance = min(distance, sum(self.edit_distance(" " + word, text) for word in words))
+        return distance
+
+    def _candidates(self, query, kind=None):
+        """Return ids of the documents sharing the most n-grams with query."""
+        kinds = (kind,) if Object.is_string(kind) else kind
+        counts = Counter()
+        for gram in self._ngrams(query, query=True):
+            counts.update(self._grams.get(gram, ()))
+
+        if kinds is not None:
+            counts = Counter({key: count for key, count in counts.items() if self._documents[key][0] in kinds})
+        return [document_id for document_id, _ in counts.most_common(self.MAX_CANDIDATES)]
+
+    def search(self, query, kind=None, limit=10):
+        """
+        Return the titles that best match query, best match first.
+
+        Args:
+            query (str): title to search for. Typos are tolerated.
+            kind (str,tuple, optional): only return titles of this kind or kinds. See: SearchEngine.ARTIST
+            limit (int, optional): maximum number of results (default: 10)
+
+        Returns:
+            list -- dicts of (kind, title, score) and the title's payload.
+        """
+        query = self.normalize(query)
+        if not query:
+            return []
+
+        max_distance = int(len(query) * self.MAX_DISTANCE_RATIO)
+        results = []
+        with self._lock:
+            for document_id in self._candidates(query, kind):
+                doc_kind, title, normalized, payload, popularity = self._documents[document_id]
+                distance = self._distance(query, normalized)
+                if distance > max_distance:
+                    continue
+                similarity = 1 - distance / len(query)
+                score = similarity + self.POPULARITY_WEIGHT * popularity
+                results.append(dict(payload, kind=doc_kind, title=title, score=round(score, 4)))
+
+        # best score first, then the shortest title
+        results.sort(key=lambda result: (-result["score"], len(result["title"])))
+        return results[:limit]
+
+    @classmethod
+    def closest(cls, query, options):
+        """
+        Return the index of the option that best matches query.
+
+        Args:
+            query (str): title to search for. Typos are tolerated.
+            options (list): titles to select from
+
+        Raises:
+            ValueError: no option matches query
+        """
+        engine = cls()
+        for index, option in enumerate(options):
+            engine.add("option", option, {"option": index})
+
+        results = engine.search(query, limit=1)
+        if not results:
+            raise ValueError("No value found for {}".format(query))
+        return results[0]["option"]
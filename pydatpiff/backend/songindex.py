@@ -0,0 +1,195 @@
+import logging
+import re
+import threading
+from bisect import bisect_left, insort
+
+from pydatpiff.errors import DatpiffError, Mp3Error, RequestError
+from pydatpiff.utils.utils import Object, ThreadQueue
+
+from .mediasetup import Album, Mp3
+
+logger = logging.getLogger(__name__)
+
+
+class SongIndex:
+    """
+    Inverted index of song titles across all of a Mixtape's albums.
+
+    Every word of a song's title maps to the (mixtape index, track index) postings
+    of the songs that contain it. Albums are requested once, when the index is first
+    built, and albums added later are indexed incrementally. See: SongIndex.add_album
+    """
+
+    def __init__(self, mixtape):
+        """
+        Args:
+            mixtape (instance class) -- pydatpiff.Mixtape instance
+        """
+        self.mixtape = mixtape
+        self._postings = {}  # word -> {(mixtape index, track index)}
+        self._words = []  # sorted words, used for prefix lookups
+        self._albums = {}  # mixtape index -> (album name, songs)
+        self._lock = threading.Lock()
+        self._subscribers = []  # See: SongIndex.subscribe
+
+    def __len__(self):
+        return sum(len(songs) for _, songs in self._albums.values())
+
+    def __contains__(self, mixtape_index):
+        return mixtape_index in self._albums
+
+    @staticmethod
+    def tokenize(text):
+        """Split text into lowercase words."""
+        return re.findall(r"\w+", Object.strip_and_lower(text))
+
+    def add_album(self, mixtape_index, album_name, songs):
+        """
+        Index all songs from a mixtape's album.
+        Re-adding an album replaces its previous postings.
+
+        Args:
+            mixtape_index (int): index of the album in Mixtape.links
+            album_name (str): name of the album
+            songs (list): album's song titles
+        """
+        with self._lock:
+            if mixtape_index in self._albums:
+                self._remove_album(mixtape_index)
+
+            self._albums[mixtape_index] = (album_name, list(songs))
+            for track_index, song in enumerate(songs):
+                for word in self.tokenize(song):
+                    if word not in self._postings:
+                        self._postings[word] = set()
+                        insort(self._words, word)
+                    self._postings[word].add((mixtape_index, track_index))
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(mixtape_index, album_name, songs)
+            except Exception:
+                logger.exception("Song index subscriber failed: %s", album_name)
+
+    def subscribe(self, callback):
+        """
+        Call callback with the (mixtape index, album name, songs) of each album indexed from now on.
+        e.g: SearchEngine.add_album. See: pydatpiff.Mixtape.search_engine
+
+        Args:
+            callback (function): function called on the thread indexing the album
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def _remove_album(self, mixtape_index):
+        _, songs = self._albums.pop(mixtape_index)
+        for track_index, song in enumerate(songs):
+            for word in self.tokenize(song):
+                postings = self._postings.get(word)
+                if postings is None:
+                    continue
+                postings.discard((mixtape_index, track_index))
+                if not postings:
+                    del self._postings[word]
+                    self._words.pop(bisect_left(self._words, word))
+
+    def albums(self):
+        """Yield the (mixtape index, album name, songs) of every indexed album."""
+        with self._lock:
+            albums = list(self._albums.items())
+        for mixtape_index, (album_name, songs) in albums:
+            yield mixtape_index, album_name, songs
+
+    def _fetch_album(self, mixtape_index):
+        """
+        Request an album from the mixtape and return its index, name and songs.
+        Returns None when the album is unavailable.
+        """
+        try:
+            album = Album(self.mixtape.links[mixtape_index])
+            return mixtape_index, album.name, Mp3(album).songs
+        except (DatpiffError, Mp3Error, RequestError):
+            logger.warning("Album unavailable: %s", self.mixtape.links[mixtape_index])
+
+    def _pending(self):
+        return [index for index in range(len(self.mixtape)) if index not in self]
+
+    def _stream_pending(self):
+        """
+        Request every album that has not been indexed yet, indexing each album as soon as it is loaded.
+        Yields the mixtape index of each indexed album. Albums that fail or time out are skipped.
+        """
+        for task in ThreadQueue(self._fetch_album, self._pending()).stream():
+            if task.ok and task.result:
+                self.add_album(*task.result)
+                yield task.result[0]
+
+    def update(self):
+        """Index every album in the mixtape that has not been indexed yet."""
+        for _ in self._stream_pending():
+            pass
+
+    def _words_with_prefix(self, prefix):
+        for position in range(bisect_left(self._words, prefix), len(self._words)):
+            word = self._words[position]
+            if not word.startswith(prefix):
+                break
+            yield word
+
+    def _match(self, words, albums=None):
+        """Return the sorted (mixtape index, track index) of songs matching every word."""
+        with self._lock:
+            matches = None
+            for word in words:
+                postings = set()
+                for indexed_word in self._words_with_prefix(word):
+                    postings.update(self._postings[indexed_word])
+                if albums is not None:
+                    postings = {posting for posting in postings if posting[0] in albums}
+
+                matches = postings if matches is None else matches & postings
+                if not matches:
+                    return []
+            return sorted(matches)
+
+    def _result(self, mixtape_index, track_index):
+        album_name, songs = self._albums[mixtape_index]
+        return {
+            "index": mixtape_index + 1,
+            "album": album_name,
+            "song": songs[track_index],
+            "track": track_index + 1,
+        }
+
+    def iter_search(self, name):
+        """
+        Yield every song whose title contains all words in name, as soon as it is found.
+        Songs from albums already indexed are yielded first, then the songs of
+        each remaining album as it is loaded. See: SongIndex.search
+        """
+        words = self.tokenize(name)
+        if not words:
+            return
+
+        for posting in self._match(words):
+            yield self._result(*posting)
+
+        for mixtape_index in self._stream_pending():
+            for posting in self._match(words, albums={mixtape_index}):
+                yield self._result(*posting)
+
+    def search(self, name):
+        """
+        Return every song whose title contains all words in name.
+        Words are matched by prefix. e.g: "green lan" matches "Green Lantern".
+
+        Args:
+            name (str): song title to search for.
+
+        Returns:
+            list -- dicts of (index, album, song, track). index and track are one-based.
+        """
+        results = list(self.iter_search(name))
+        return sorted(results, key=lambda result: (result["index"], result["track"]))
@@ -0,0 +1,102 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from .covers import CoverService
+
+
+class Tagger:
+    """
+    Write ID3 tags and cover art to downloaded mp3s on a worker pool,
+    so tagging never holds up the downloads.
+
+    Each album's cover art is requested once, through the CoverService, and embedded in all of its tracks.
+
+    Usage:
+        tagger = Tagger.shared()
+        future = tagger.tag("Artist - Song.mp3", {"title": "Song", "artist": "Artist", "album": "Album",
+                                                  "track": 1, "cover": cover_url})
+        future.result()
+    """
+
+    workers = 2
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, workers=None, covers=None):
+        """
+        Args:
+            workers (int, optional): number of threads tagging files (default: Tagger.workers)
+            covers (CoverService, optional): cover art provider (default: CoverService.shared)
+        """
+        self._pool = ThreadPoolExecutor(max_workers=workers or self.workers, thread_name_prefix="pydatpiff-tag")
+        self.covers = covers or CoverService.shared()
+
+    @classmethod
+    def shared(cls):
+        """Return the tagger shared by every download."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def artwork(self, url):
+        """
+        Return the cover art at url, requesting it on first use.
+        Tracks of the same album wait for the same request. See: CoverService.fetch
+
+        Returns:
+            bytes: the image, or None when it is unavailable
+        """
+        path = self.covers.fetch(url)
+        if path is not None:
+            with open(path, "rb") as f:
+                return f.read()
+
+    @staticmethod
+    def _mime(image):
+        return "image/png" if image[:8] == b"\x89PNG\r\n\x1a\n" else "image/jpeg"
+
+    def tag(self, path, tags, guard=None):
+        """
+        Tag an mp3 in the background.
+
+        Args:
+            path (str): mp3 file
+            tags (dict): "title", "artist", "album", "track" (number) and "cover" (url), each optional.
+                    A tag set to None is removed from the file. e.g: the tags of the album a track was copied from
+            guard (function, optional): called with path. Returns a context manager held while the file
+                    is written. e.g: DownloadManifest.updating
+
+        Returns:
+            concurrent.futures.Future: completes once the file is tagged
+        """
+        return self._pool.submit(self._tag, path, tags, guard)
+
+    def _tag(self, path, tags, guard=None):
+        from mutagen.id3 import APIC, ID3, TALB, TIT2, TPE1, TRCK, ID3NoHeaderError
+
+        image = self.artwork(tags["cover"]) if tags.get("cover") else None
+        try:
+            id3 = ID3(path)
+        except ID3NoHeaderError:
+            id3 = ID3()
+
+        frames = {"title": TIT2, "artist": TPE1, "album": TALB, "track": TRCK}
+        for name, frame in frames.items():
+            if name in tags:
+                id3.delall(frame.__name__)
+            if tags.get(name) is not None:
+                id3.add(frame(encoding=3, text=str(tags[name])))
+        if image or "cover" in tags:
+            id3.delall("APIC")
+        if image:
+            id3.add(APIC(encoding=3, mime=self._mime(image), type=3, desc="Cover", data=image))
+        with guard(path) if guard is not None else nullcontext():
+            id3.save(path)
+        return path
+
+    def close(self):
+        """Wait for the files being tagged, then stop the workers."""
+        self._pool.shutdown(wait=True)
@@ -87,6 +87,7 @@ verbose_message = {
     "INVALID_DIRECTORY": "Invalid directory: %s",
     "SAVE_SONG": "Saving song: %s ...",
     "SAVE_ALBUM": "Album saved: %s to %s",
+    "DOWNLOAD_FAILED": "Failed to download: %s",
     "AUTO_PLAY_NO_SONG": "Play a song first to enable autoplay",
     "AUTO_PLAY_NEXT_SONG": "Playing next song",
     "AUTO_PLAY_LAST_SONG": "No more songs left to autoplay",
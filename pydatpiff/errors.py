@@ -73,6 +73,7 @@ class MediaError(Error):
         7: "media player not found",
         8: "song not found",
         9: "song unavailable",
+        10: "too many sessions",
     }
 
 
@@ -127,6 +128,14 @@ class RequestError(Error):
     }
 
 
+class DownloadError(Error):
+    __error__ = {
+        1: "incomplete download",
+        2: "download failed",
+        3: "invalid mp3",
+    }
+
+
 class BuildError(Error):
     __error__ = {
         1: "user selection",
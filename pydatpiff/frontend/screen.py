@@ -1,17 +1,21 @@
 """
-   Custom printing function using logger.
+Custom printing function using logger.
 """
-from pydatpiff.utils.logging import logging
+
+import logging
 
 logger = logging.getLogger(__name__)
 
 
 def Verbose(*args):  # noqa
-    output = " ".join(args)
-    logger.info(output)
+    # the message is only built when it is output. See: pydatpiff.utils.logging.configure
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(" ".join(args))
 
 
 def display_play_message(artist, album_name, song_name, size, demo=False):
+    if not logger.isEnabledFor(logging.INFO):
+        return
     if demo:
         Verbose("\n%s %s %s" % ("-" * 20, "DEMO", "-" * 20))
     Verbose("\nAlbum: %s" % album_name)
@@ -21,4 +25,6 @@ def display_play_message(artist, album_name, song_name, size, demo=False):
 
 
 def display_download_message(song_name, size):
+    if not logger.isEnabledFor(logging.INFO):
+        return
     Verbose("\nDownloading:", song_name, "\nSIZE:  ", size)
@@ -1,28 +1,58 @@
 import io
+import logging
 import os
+import queue
 import time
 
+from pydatpiff.utils.cache import AudioCache
 from pydatpiff.utils.filehandler import File, Tmp
-from pydatpiff.utils.utils import Object, Select, ThreadQueue, threader_wrapper
+from pydatpiff.utils.utils import Object, Select, threader_wrapper
 
+from .backend.audio.duration import DurationProvider
 from .backend.audio.player import Player
+from .backend.download import (
+    AlbumDownloader,
+    DownloadManifest,
+    DownloadScheduler,
+    album_dir_name,
+    album_tags,
+    song_file_name,
+)
 from .backend.mediasetup import Album, Mp3
+from .backend.prefetch import PrefetchScheduler
+from .backend.search import SearchEngine
+from .backend.tagging import Tagger
 from .constants import verbose_message
-from .errors import MediaError
+from .errors import DownloadError, MediaError, RequestError
 from .frontend import screen
 from .mixtapes import Mixtape
 from .urls import Urls
 from .utils.request import Session
 
 Verbose = screen.Verbose
+logger = logging.getLogger(__name__)
 
 
 class Media:
     """A media player that control the songs selected from Mixtape"""
 
     player = None
-
-    def __init__(self, mixtape=None, pre_select=None, player="mpv", **kwargs):
+    # temporary files of dead processes are removed once per process. See: Tmp.remove_temp_file_on_startup
+    _temp_files_removed = False
+    # part of a song demos play: (start, length) as fractions of the song
+    DEMO_WINDOW = (0.04, 0.2)
+
+    def __init__(
+        self,
+        mixtape=None,
+        pre_select=None,
+        player=None,
+        audio_cache=None,
+        prefetch_at=0.5,
+        prefetch_depth=1,
+        stream=False,
+        **kwargs,
+    ):
         """
         Initialize a media player and load all mixtapes.
 
@@ -30,6 +60,19 @@ class Media:
             mixtape (instance class) -- pydatpiff.Mixtape instance (default: {None})
             pre_select (Integer,String) --  pre-selected mixtape's album, artist,or mixtapes.
                     See media.setMedia for more info (default: None - Optional)
+            player (str) -- audio player: "mpv", "mpv-ipc" (mpv controlled over its IPC socket),
+                    "mpv-persistent" (a single mpv process for every song, with gapless autoplay), "vlc",
+                    "null" (no audio output) or "recording" (a null player recording its events).
+                    Also accepts a player class, or a function returning a player. See: Player.getPlayer
+                    (default: the environment variable PYDATPIFF_PLAYER, else "mpv", else "vlc")
+            audio_cache (instance class) -- pydatpiff.utils.cache.AudioCache instance
+                    (default: cache shared by every Media. See: AudioCache.shared)
+            prefetch_at (float) -- when autoplay starts fetching the next songs. Below 1, the fraction
+                    of the current song played. Otherwise, the seconds remaining in the current song.
+                    (default: 0.5 - halfway through the song)
+            prefetch_depth (int) -- number of songs autoplay fetches ahead (default: 1)
+            stream (bool) -- play songs that are not cached straight from their mp3 url,
+                    so playback starts before the whole song is downloaded (default: False)
 
         Raises:
             MediaError: Raises MediaError if mixtapes is not a subclass of pydatpiff.Mixtape.
@@ -39,17 +82,24 @@ class Media:
         self.__is_valid_mixtape(mixtape)
 
         self._album_cover = None
-        self.bio = None
         self._Mp3 = None
+        self._durations = DurationProvider()
         self.url = None
-        self.uploader = None
         self._session = Session()
         self.mixtape = mixtape
         self._artist_name = None
         self._album_name = None
         self._selected_song = None
-        self.__cache_storage = {}
+        # an empty cache is falsy. See: DiskCache.__len__
+        self.audio_cache = audio_cache if audio_cache is not None else AudioCache.shared()
+        self.prefetcher = PrefetchScheduler(
+            self._fetch_audio, at=prefetch_at, depth=prefetch_depth, on_fetched=self._on_prefetched
+        )
+        self._next_link = None  # mp3 url of the song autoplay plays next
+        self.stream = stream
         self.AUTOPLAY_INACTIVITY_TIME = 60 * 5  # 5 minutes
+        self._inactive_time = 0
+        self._autoplay_events = None  # player events of the running autoplay loop
 
         Verbose(verbose_message["MEDIA_INITIALIZED"])
 
@@ -72,13 +122,23 @@ class Media:
             return 0
 
     def __setup(self, player=None):
-        if not hasattr(self, "__temp_file"):
+        if not Media._temp_files_removed:
+            Media._temp_files_removed = True
             Tmp.remove_temp_file_on_startup()
-            self.__temp_file = Tmp.create()
 
         # Set the initial player. fallback to mpv if not specified
         self.player = Player.getPlayer(player)
 
+    def close(self):
+        """
+        Stop autoplay and prefetching, then close the player, ending its process.
+        See: pydatpiff.sessions.SessionManager.close
+        """
+        if self.autoplay:
+            self.autoplay = False
+        self.prefetcher.cancel()
+        self.player.close()
+
     def _select(self, choice):
         """
         Queue and load  a mixtape to media player.
@@ -101,7 +161,15 @@ class Media:
             options = self.mixtape.artists.copy()
             options.extend(self.mixtape.mixtapes)
 
-            selection = Select.get_index_of(choice, options=options)
+            try:
+                # options contains the artists followed by the mixtapes
+                selection = Select.get_index_of(choice, options=options) % len(self.mixtape)
+            except ValueError:
+                # no artist or mixtape contains choice, so tolerate typos
+                results = self.search(choice, kind=(SearchEngine.ARTIST, SearchEngine.MIXTAPE), limit=1)
+                if not results:
+                    raise
+                selection = results[0]["index"] - 1
         assert selection is not None, "Invalid selection"
         return selection
 
@@ -129,14 +197,16 @@ class Media:
         self.artist = self.mixtape.artists[mixtape_index]
         self.album_cover = self.mixtape.album_covers[mixtape_index]
 
-        # set Media's Album detail attributes
+        # set Media's Album detail attributes.
+        # Album's pages are requested lazily, so only the embedded player page is requested here.
+        # The album's uploader is requested on first access. See: Media.uploader
         self.album = Album(url)
         self._Mp3 = Mp3(self.album)
+        self._durations = DurationProvider(self._Mp3.durations)
 
-        # get the album's uploader and bio
-        self.uploader = getattr(self.album, "uploader", "unknown uploader")
-        self.bio = getattr(self.album, "uploader", "no bio")
         formatted_title = " - ".join((self.artist, self.album.name))
+        # the album is already loaded, so add it to the mixtape's song index
+        self.mixtape.song_index.add_album(mixtape_index, self.album.name, self._Mp3.songs)
         Verbose(verbose_message["MEDIA_SET"] % formatted_title)
 
     def __is_valid_mixtape(self, instance):
@@ -163,22 +233,38 @@ class Media:
             song_name {str} -- song to search for.
 
         Returns:
-            tuple -- returns a tuple containing mixtapes data (index,artist,album) from search.
+            list -- returns a list containing every matching song's data (index,album,song,track) from search.
         """
-
-        # NOTE: Take a look at this video by James Powell
-        # https://www.youtube.com/watch?v=R2ipPgrWypI&t=1748s at 55:00.
-
         song_name = Object.strip_and_lower(name)
         Verbose("\n" + verbose_message["SEARCH_SONG"] % song_name)
-        links = self.mixtape.links
-        links = list(enumerate(links, start=1))
-        results = ThreadQueue(Album.lookup_song, links).execute(song=song_name)
+        results = self.mixtape.song_index.search(song_name)
+        if not results:
+            # no song contains every word of song_name, so tolerate typos
+            keys = ("index", "album", "song", "track")
+            results = self.search(song_name, kind=SearchEngine.SONG)
+            results = [{key: result[key] for key in keys} for result in results]
         if not results:
             Verbose(verbose_message["SONG_NAME_NOT_FOUND"] % song_name)
-        results = Object.remove_list_null_value(results)
         return results
 
+    def search(self, query, kind=None, limit=10):
+        """
+        Fuzzy search the mixtape's artists, mixtapes and songs. Results are ranked by
+        similarity and popularity. Fast enough to search on every keystroke.
+        Songs are searched once their albums are loaded. See: Media.find_song
+
+        Args:
+            query (str): artist, mixtape or song to search for. Typos are tolerated.
+            kind (str,tuple, optional): only search titles of this kind.
+                    SearchEngine.ARTIST, SearchEngine.MIXTAPE or SearchEngine.SONG (default: all)
+            limit (int, optional): maximum number of results (default: 10)
+
+        Returns:
+            list -- dicts of each result's (kind, title, score, index) ordered by best match.
+                    Songs also include (album, song, track).
+        """
+        return self.mixtape.search_engine.search(query, kind=kind, limit=limit)
+
     def _index_of_song(self, select):
         """
         Parse all user input and return the correct song index.
@@ -191,7 +277,15 @@ class Media:
                 return Select.get_leftmost_index(select, self.songs)
             return Select.get_index_of(select, self.songs)
         except ValueError:
-            raise MediaError(5)
+            pass
+
+        try:
+            # no song contains select, so tolerate typos
+            if isinstance(select, str):
+                return SearchEngine.closest(select, self.songs)
+        except ValueError:
+            pass
+        raise MediaError(5)
 
     @property
     def artist(self):
@@ -215,6 +309,18 @@ class Media:
     def album(self, name):
         self._album_name = name
 
+    @property
+    def uploader(self):
+        """Return the name of the user who uploaded the current album."""
+        if self.album is not None:
+            return self.album.uploader
+
+    @property
+    def bio(self):
+        """Return the current album's bio."""
+        if self.album is not None:
+            return self.album.bio
+
     @property
     def album_cover(self):
         if hasattr(self, "_album_cover"):
@@ -262,41 +368,37 @@ class Media:
         except (ValueError, MediaError):
             Verbose(verbose_message["SONG_NAME_NOT_FOUND"] % name)
 
-    def _cache_song(self, song, content):
+    def _cache_song(self, link, content):
         """
-        Preserve the data from song and store it for future calls.
-         This prevents calling the requests function again for the same song.
-         Each data from a song will be stored in __cache_storage for future access.
+        Store a song's audio content in the audio cache for future plays and downloads,
+        across Media instances and sessions.
 
         Args:
-            song (str):  name of song
+            link (str): song's mp3 url
             content (byte): song's audio content
+
+        Returns:
+            str: path of the song's cached audio
         """
-        song = "-".join((self.artist, song))
-        try:
-            self.__cache_storage[song] = content
-        except MemoryError:
-            self.__cache_storage = {}
+        return self.audio_cache.put(link, content)
 
-    def _retrieve_song_from_cache(self, song):
+    def _retrieve_song_from_cache(self, link):
         """Retrieve song's audio content from cache
         Args:
-            song (str): name of song
+            link (str): song's mp3 url
 
         Returns:
-            Http response : A http response containing the song's audio contents.
+            bytes: song's audio content, or None when the song is not cached.
         """
-        requested_song = "-".join((self.artist, song))
-        if requested_song in self.__cache_storage:
-            return self.__cache_storage.get(requested_song)
+        return self.audio_cache.get(link)
 
-    def _write_audio(self, track):
-        """Write mp3 audio content to IO Bytes stream.
+    def _cache_audio(self, track):
+        """Request a song's audio content once and keep it in the audio cache.
         Args:
             track (int,string): Name or index of song.
 
         Returns:
-            BytesIO: A file-like API for reading and writing bytes objects.
+            str: path of the song's cached audio, or None when the song is unavailable.
         """
 
         try:
@@ -305,20 +407,72 @@ class Media:
                 raise MediaError("Song not found")
 
             link = self.mp3_urls[selection]
-            song_name = self.songs[selection]
             self._song_index = selection
         except:  # noqa
             return
 
         self.song = selection + 1
+        # a prefetched song is already cached, or is being requested
+        return self.prefetcher.fetch(link)
+
+    def _fetch_audio(self, link):
+        """Return the path of a song's cached audio, requesting the song when it is not cached.
+        Args:
+            link (str): song's mp3 url
+
+        Returns:
+            str: path of the song's cached audio, or None when the song is unavailable.
+        """
+        path = self.audio_cache.path(link)
+        if path is None:
+            # the audio cache replaces the session's in-memory response cache for mp3s
+            response = self._session.method("GET", link, bypass=True)
+            if not response:
+                return
+            length = response.headers.get("Content-Length")
+            if length is not None and int(length) != len(response.content):
+                # a song cut short is not cached, so it is requested again
+                logger.warning("%s of %s bytes received: %s", len(response.content), length, link)
+                return
+            path = self._cache_song(link, response.content)
+        return path
+
+    def _schedule_prefetch(self, index, duration=None):
+        """
+        Fetch the songs following index in the background while it plays.
+        See: PrefetchScheduler
 
-        # Retrieve song's content in cached
-        response = self._retrieve_song_from_cache(song_name)
-        if not response:
-            response = self._session.method("GET", link)
-            self._cache_song(song_name, response)
+        Args:
+            index (int): index of the playing song in Media.songs
+            duration (float, optional): seconds the song plays for (default: the song's length)
+        """
+        mp3_urls = self.mp3_urls
+        links = mp3_urls[index + 1 :]
+        self._next_link = links[0] if links else None
+        if duration is None:
+            # the players' duration is not in seconds on every player. e.g: VLC
+            path = self.audio_cache.path(mp3_urls[index]) if index < len(mp3_urls) else None
+            duration = self._durations.duration(index, path)
+        self.prefetcher.schedule(links, duration or 0)
+
+    def _on_prefetched(self, link, path):
+        """Queue the next song in players that play queued songs without a gap. See: MPV.enqueue"""
+        enqueue = getattr(self.player, "enqueue", None)
+        if enqueue is not None and link == self._next_link and self.autoplay:
+            enqueue(path)
 
-        return io.BytesIO(response.content)
+    def _write_audio(self, track):
+        """Write mp3 audio content to IO Bytes stream.
+        Args:
+            track (int,string): Name or index of song.
+
+        Returns:
+            BytesIO: A file-like API for reading and writing bytes objects.
+        """
+        path = self._cache_audio(track)
+        if path:
+            with open(path, "rb") as f:
+                return io.BytesIO(f.read())
 
     @property
     def autoplay(self):
@@ -336,10 +490,17 @@ class Media:
                  default: False
         """
         self._auto_play = auto  # noqa
-        self._continuous_play()
         if auto:
+            # only one autoplay loop per Media
+            if self._autoplay_events is None:
+                self._autoplay_events = queue.Queue()
+                self.player.subscribe(self._autoplay_events.put)
+                self._continuous_play(self._autoplay_events)
             Verbose(verbose_message["AUTO_PLAY_ENABLED"])
         else:
+            self.prefetcher.cancel()
+            if self._autoplay_events is not None:
+                self._autoplay_events.put(None)  # wake autoplay loop so it can exit
             Verbose(verbose_message["AUTO_PLAY_DISABLED"])
 
     @property
@@ -350,56 +511,70 @@ class Media:
         return is_paused and time.time() - self._inactive_time > self.AUTOPLAY_INACTIVITY_TIME
 
     @threader_wrapper
-    def _continuous_play(self):
+    def _continuous_play(self, events):
         """
         Automatically play each song from Album when autoplay is enable.
-        """
+        The loop sleeps until the player publishes an event. See: BasePlayer.subscribe
 
-        if self.song is None:
-            current_track = 1
-            self.play(1)
-        else:
-            current_track = self._index_of_song(self.song)
-
-        if not self.player.state["playing"]:
-            current_track + 1
-
-        while self.autoplay:
-            """
-            If the user di not select a track
-            then set and play the first song from mixtape
-            """
-            # Handle autoplay pause inactivity
-            if self._is_autoplay_inactive:
-                self._inactive_time = 0
-                Verbose(verbose_message["AUTO_PLAY_INACTIVITY"])
-                self.autoplay = False
-                self.player.stop
-                break
-
-            # handle track stoppages by system
-            if self.player._state.get("system_stopped"):  # noqa:
-                self.player.state["system_stopped"] = False
-                next_track = current_track + 1
-                if next_track > len(self):
-                    Verbose(verbose_message["AUTO_PLAY_LAST_SONG"])
-                    self.autoplay = False
-                    break
-
-                Verbose(verbose_message["AUTO_PLAY_NEXT_SONG"])
-                self.play(next_track)
-
-            # handle stoppage by user
-            elif self.player.state.get("stopped"):
-                break
-
-    def _get_audio_track(self, track):
+        Args:
+            events (queue.Queue): player events. None wakes the loop to check if autoplay is still enabled.
         """
-        Perform a lookup for song by its index or name and returns
-        full track name and audio content.
+        try:
+            if self.song is None:
+                # If the user did not select a track then play the first song from mixtape
+                self.play(1)
+            elif self.player.state["playing"]:
+                self._schedule_prefetch(self._index_of_song(self.song))
+
+            timeout = None
+            while self.autoplay:
+                try:
+                    event = events.get(timeout=timeout)
+                except queue.Empty:
+                    # Handle autoplay pause inactivity
+                    if self._is_autoplay_inactive:
+                        self._inactive_time = 0
+                        Verbose(verbose_message["AUTO_PLAY_INACTIVITY"])
+                        self.autoplay = False
+                        self.player.stop
+                        break
+                    timeout = None
+                    continue
+
+                if event == self.player.PAUSED:
+                    self._inactive_time = time.time()
+                    timeout = self.AUTOPLAY_INACTIVITY_TIME
+                elif event in (self.player.RESUMED, self.player.TRACK_STARTED):
+                    self._inactive_time = 0
+                    timeout = None
+
+                # handle track stoppages by system
+                elif event == self.player.TRACK_ENDED:
+                    self.player.state["system_stopped"] = False
+                    try:
+                        next_track = self._index_of_song(self.song) + 2
+                    except MediaError:
+                        # the album changed while the song played
+                        next_track = len(self) + 1
+                    if next_track > len(self):
+                        Verbose(verbose_message["AUTO_PLAY_LAST_SONG"])
+                        self.autoplay = False
+                        break
+
+                    Verbose(verbose_message["AUTO_PLAY_NEXT_SONG"])
+                    self.play(next_track)
+                # a song stopped by the user waits for the user's next song
+        finally:
+            self.player.unsubscribe(events.put)
+            if self._autoplay_events is events:
+                self._autoplay_events = None
+
+    def _track_number(self, track):
+        """
+        Perform a lookup for song by its index or name and returns its track number.
 
         Args:   track (int,string): Name or index of song.
-        Returns:    tuple: (track name, audio content)
+        Returns:    int: track number, starting at 1
         """
         if track is None:
             Verbose("\n\t", verbose_message["NO_SONG_SELECTED"])
@@ -416,15 +591,59 @@ class Media:
         except (MediaError, ValueError):  # ^ will throw ValueError if track  name is invalid
             Verbose(verbose_message["SONG_NAME_NOT_FOUND"] % track)
             raise MediaError(8, verbose_message["SONG_NAME_NOT_FOUND"] % track)
+        return track
+
+    def _get_audio_track(self, track):
+        """
+        Perform a lookup for song by its index or name and returns
+        full track name and audio content.
 
+        Args:   track (int,string): Name or index of song.
+        Returns:    tuple: (track name, audio content)
+        """
+        track = self._track_number(track)
         content = self._write_audio(track)
         if not content:
             Verbose(verbose_message["UNAVAILABLE_SONG"])
             raise MediaError(9, verbose_message["UNAVAILABLE_SONG"])
 
-        song_name = self.songs[self._song_index]
+        # track is an index by now. Media._song_index is shared by concurrent downloads.
+        song_name = self.songs[self._index_of_song(track)]
         return song_name, content.read()
 
+    def _get_audio_file(self, track):
+        """
+        Perform a lookup for song by its index or name and returns
+        full track name and the path of its cached audio.
+        Players read the cached file directly, so the audio is never copied.
+
+        Args:   track (int,string): Name or index of song.
+        Returns:    tuple: (track name, audio file path)
+        """
+        track = self._track_number(track)
+        path = self._cache_audio(track)
+        if not path:
+            Verbose(verbose_message["UNAVAILABLE_SONG"])
+            raise MediaError(9, verbose_message["UNAVAILABLE_SONG"])
+
+        song_name = self.songs[self._index_of_song(track)]
+        return song_name, path
+
+    def _get_audio_stream(self, track):
+        """
+        Perform a lookup for song by its index or name and returns
+        full track name and what the player reads: the song's cached audio when the song
+        is cached, otherwise its mp3 url, which the player streams as it downloads.
+
+        Args:   track (int,string): Name or index of song.
+        Returns:    tuple: (track name, audio file path or mp3 url)
+        """
+        track = self._track_number(track)
+        index = self._index_of_song(track)
+        link = self.mp3_urls[index]
+        self.song = track
+        return self.songs[index], self.audio_cache.path(link) or link
+
     def play(self, track=None, demo=False):
         """Play selected mixtape's track
 
@@ -434,32 +653,46 @@ class Media:
                 False: play full song
         """
         try:
-            song_name, content = self._get_audio_track(track)
+            if self.stream and not demo:
+                song_name, path = self._get_audio_stream(track)
+            else:
+                song_name, path = self._get_audio_file(track)
         except MediaError:
             return
 
-        buffer_size = len(content)
+        if not File.is_file(path):
+            # the player streams the song from its mp3 url
+            buffer_size = None
+        else:
+            buffer_size = os.path.getsize(path)
+
+        # the album's page lists the songs' duration, so the song is not parsed for its length
+        duration = self._durations.duration(self._index_of_song(song_name), path)
+        start = length = None
         # play demo or full song
-        if not demo:  # demo whole song
-            chunk = content
+        if buffer_size is None:
+            buffer = None
+        elif not demo:  # demo whole song
+            # the player reads the cached song directly
             buffer = int(buffer_size)
         else:  # demo partial song
-            buffer = int(buffer_size / 5)
-            start = int(buffer / 5)
-            chunk = content[start : buffer + start]
-        size = File.get_human_readable_file_size(buffer)
-
-        # write song to file
-        File.write_to_file(self.__temp_file.name, chunk, mode="wb")
+            # the player plays a window of the cached song, so no audio is copied
+            start_at, play_for = self.DEMO_WINDOW
+            buffer = int(buffer_size * play_for)
+            start, length = (duration * start_at, duration * play_for) if duration else (None, 30)
+        size = File.get_human_readable_file_size(buffer) if buffer is not None else "streaming"
 
         # display message to user
         screen.display_play_message(self.artist, self.album, song_name, size, demo)
 
         song = " - ".join((self.artist, song_name))
-        self.player.set_track(song, self.__temp_file.name)
+        self.player.set_track(song, path, duration=duration, start=start, length=length)
         self.player.play  # noqa - play song is a property of the player class
 
-    def download(self, track=None, rename=None, output=None):
+        if self.autoplay:
+            self._schedule_prefetch(self._index_of_song(song_name), length or duration)
+
+    def download(self, track=None, rename=None, output=None, tag=True):
         """
         Download song from Datpiff
 
@@ -468,11 +701,14 @@ class Media:
             output (string) - location to save the song (optional)
             rename (string) - rename the song (optional)
                 default will be song's name
+            tag (bool) - write the song's ID3 tags and cover art in the background (default: True)
+                See: pydatpiff.backend.tagging.Tagger
         """
         try:
-            song, content = self._get_audio_track(track)
+            # the song is requested into the audio cache once, like the songs played
+            song, _ = self._get_audio_file(track)
         except MediaError:
-            # Exception message will be handled from by `_get_audio_track`
+            # Exception message will be handled from by `_get_audio_file`
             return
 
         # Handles paths
@@ -480,23 +716,48 @@ class Media:
         if not File.is_dir(output):
             raise FileNotFoundError("Invalid directory: %s" % output)
 
+        index = self._index_of_song(song)
+        tags = album_tags(self.artist, self.album.name, song, index + 1, self.album_cover)
         # Handles song's renaming
         if rename:
             song, _ = os.path.splitext(rename)
         title = " - ".join((self.artist, song.strip() + ".mp3"))
+        file_name = song_file_name(self.artist, song, output)
+
+        # the song is checked, and recorded in the manifest, like the songs of an album. See: Media.download_album
+        downloader = AlbumDownloader(
+            session=self._session,
+            audio_cache=self.audio_cache,
+            manifest=DownloadManifest(os.path.join(output, DownloadScheduler.MANIFEST_NAME)),
+            tagger=Tagger.shared() if tag else None,
+        )
+        try:
+            downloader.download_track(self.mp3_urls[index], file_name, tags)
+        except (RequestError, DownloadError):
+            # a truncated or missing song is not saved as a song
+            Verbose(verbose_message["UNAVAILABLE_SONG"])
+            return
 
-        file_name = File.standardize_file_name(title)
-        file_name = File.join(output, file_name)
-
-        size = File.get_human_readable_file_size(len(content))
-        File.write_to_file(file_name, content, mode="wb")
+        size = File.get_human_readable_file_size(os.path.getsize(file_name))
         screen.display_download_message(title, size)
 
-    def download_album(self, output=None):
+    def download_album(self, output=None, workers=3, on_progress=None, tag=True):
         """Download all tracks from Mixtape.
 
+        Tracks are written to disk as they download, so memory use does not grow with the album.
+        Downloading an album again resumes interrupted tracks and skips tracks already downloaded.
+        See: pydatpiff.backend.download.AlbumDownloader
+
         Args:
             output ([type], optional): path to save mixtape.(default: current directory)
+            workers (int, optional): number of tracks downloaded at once (default: 3)
+            on_progress (function, optional): called with (event, path, progress) as tracks download.
+                    See: pydatpiff.backend.download.DownloadProgress
+            tag (bool, optional): write ID3 tags and cover art to the songs as they download.
+                    The album's cover art is requested once. (default: True)
+
+        Returns:
+            list: (mp3 url, file path, exception) of each track that failed
         """
         if not output:
             output = os.getcwd()
@@ -504,12 +765,30 @@ class Media:
             Verbose(verbose_message["INVALID_DIRECTORY"] % output)
             return
 
-        album_dirname = " - ".join((self.artist, self.album.name))
-        output = os.path.join(output, File.standardize_file_name(album_dirname))
-        os.mkdir(output)
-        # must follow `download` method's arguments order
-        ThreadQueue(
-            self.download,
-            self.songs,
-        ).execute(rename=None, output=output)
+        output = album_dir_name(self.artist, self.album.name, output)
+        # the manifest is shared by every album downloaded to the same folder
+        manifest = DownloadManifest(os.path.join(os.path.dirname(output), DownloadScheduler.MANIFEST_NAME))
+        os.makedirs(output, exist_ok=True)
+
+        tracks = [
+            (
+                link,
+                song_file_name(self.artist, song, output),
+                album_tags(self.artist, self.album.name, song, number, self.album_cover),
+            )
+            for number, (song, link) in enumerate(zip(self.songs, self.mp3_urls), 1)
+        ]
+        downloader = AlbumDownloader(
+            workers=workers,
+            session=self._session,
+            audio_cache=self.audio_cache,
+            on_progress=on_progress,
+            manifest=manifest,
+            tagger=Tagger.shared() if tag else None,
+        )
+        # a failed song does not stop the others
+        failed = downloader.download(tracks)
+        for _, path, _ in failed:
+            Verbose(verbose_message["DOWNLOAD_FAILED"] % os.path.basename(path))
         Verbose("\n" + verbose_message["SAVE_ALBUM"] % (self.artist + " " + self.album.name, output))
+        return failed
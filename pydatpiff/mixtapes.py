@@ -1,6 +1,8 @@
 from pydatpiff.utils.utils import Select
 
 from .backend.scraper import MixtapeScraper
+from .backend.search import SearchEngine
+from .backend.songindex import SongIndex
 from .errors import MixtapeError
 from .frontend.screen import Verbose
 from .urls import Urls
@@ -12,7 +14,7 @@ class Mixtape(MixtapeScraper):
     _default_category = "hot"
     _user_selected = _default_category  # user  category or search input
 
-    def __init__(self, category=None, search=None, limit=None, *args, **kwargs):
+    def __init__(self, category=None, search=None, limit=None, pipeline=None, *args, **kwargs):
         """
         Mixtape Initialization.
 
@@ -20,14 +22,19 @@ class Mixtape(MixtapeScraper):
                             see Mixtape.category
 
         :param: search - search for an artist or mixtape's name
+
+        :param: pipeline - pydatpiff.backend.pipeline.CrawlPipeline used to request
+                            and parse the mixtape's pages concurrently (optional)
         """
         self._session = Session()
-        self._session.clear_cache()
+        if pipeline is None:
+            # a pipeline loads several mixtapes at once, sharing the cache. See: CrawlPipeline.crawl
+            self._session.clear_cache()
 
         self._select_mixtape(category=category, search=search)
 
         initial_page_content = self._request_response
-        super().__init__(initial_page_content, limit=limit)
+        super().__init__(initial_page_content, limit=limit, pipeline=pipeline)
 
         if not len(self):
             Verbose("No Mixtape Found")
@@ -125,6 +132,28 @@ class Mixtape(MixtapeScraper):
         if hasattr(self, "_links"):
             return self._links
 
+    @property
+    def song_index(self):
+        """Return the index of all songs in the Mixtape's albums. See: SongIndex"""
+        if getattr(self, "_song_index", None) is None:
+            self._song_index = SongIndex(self)
+        return self._song_index
+
+    @property
+    def search_engine(self):
+        """
+        Return the fuzzy search engine for the Mixtape's artists, mixtapes and songs.
+        Songs are added from the Mixtape's song index as its albums are indexed.
+        """
+        if getattr(self, "_search_engine", None) is None:
+            engine = SearchEngine.from_mixtape(self)
+            # albums indexed from now on are added as they are indexed, the albums already indexed once
+            self.song_index.subscribe(engine.add_album)
+            for album in self.song_index.albums():
+                engine.add_album(*album)
+            self._search_engine = engine
+        return self._search_engine
+
     @property
     def ratings(self):
         if hasattr(self, "_ratings"):
@@ -0,0 +1,118 @@
+import threading
+
+from .errors import MediaError
+from .media import Media
+from .utils.cache import AudioCache
+
+
+class SessionManager:
+    """
+    Run many independent Media sessions in one process. e.g: one session per listener of a server.
+
+    Sessions share the HTTP response cache and the audio cache, so a song requested
+    by one session plays from the cache in the others. Each session has its own player,
+    album and autoplay.
+
+    Usage:
+        sessions = SessionManager(Mixtape(category="hot"), player="null")
+        media = sessions.open("listener-1")
+        media.setMedia("Jay-Z")
+        media.play(1)
+        sessions.close("listener-1")
+    """
+
+    def __init__(self, mixtape=None, player=None, audio_cache=None, max_sessions=None, **options):
+        """
+        Args:
+            mixtape (instance class): pydatpiff.Mixtape instance sessions open by default
+            player (str,function, optional): player of each session. A name, or a function returning
+                    a new player. See: Player.getPlayer (default: Media's default player)
+            audio_cache (instance class, optional): audio cache shared by the sessions
+                    (default: cache shared by every Media. See: AudioCache.shared)
+            max_sessions (int, optional): maximum number of open sessions (default: no limit)
+            options: other Media options of each session. See: Media
+        """
+        self.mixtape = mixtape
+        self.player = player
+        # an empty cache is falsy. See: DiskCache.__len__
+        self.audio_cache = audio_cache if audio_cache is not None else AudioCache.shared()
+        self.max_sessions = max_sessions
+        self.options = options
+        self._sessions = {}  # session id -> Media
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self._sessions
+
+    def __iter__(self):
+        return iter(list(self._sessions))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close_all()
+
+    def open(self, session_id, mixtape=None, player=None, **options):
+        """
+        Open a session, or return the Media of the session already open with session_id.
+
+        Args:
+            session_id (str): id of the session. e.g: a listener's id
+            mixtape (instance class, optional): pydatpiff.Mixtape instance of the session
+                    (default: SessionManager.mixtape)
+            player (str,function, optional): player of the session (default: SessionManager.player)
+            options: Media options of the session, overriding SessionManager.options
+
+        Returns:
+            Media: the session's media player
+
+        Raises:
+            MediaError: the maximum number of sessions is open
+        """
+        with self._lock:
+            if session_id in self._sessions:
+                return self._sessions[session_id]
+        media = Media(
+            mixtape=mixtape or self.mixtape,
+            player=self.player if player is None else player,
+            audio_cache=self.audio_cache,
+            **dict(self.options, **options),
+        )
+
+        with self._lock:
+            if session_id in self._sessions:
+                # opened by another thread meanwhile
+                media.close()
+                return self._sessions[session_id]
+            if self.max_sessions is not None and len(self._sessions) >= self.max_sessions:
+                media.close()
+                raise MediaError(10, "%s sessions are open" % len(self._sessions))
+            self._sessions[session_id] = media
+        return media
+
+    def get(self, session_id):
+        """Return the Media of an open session, None when no session has session_id."""
+        return self._sessions.get(session_id)
+
+    def close(self, session_id):
+        """
+        Stop a session, and end its player's process. See: Media.close
+
+        Returns:
+            bool: False when no session has session_id
+        """
+        with self._lock:
+            media = self._sessions.pop(session_id, None)
+        if media is None:
+            return False
+        media.close()
+        return True
+
+    def close_all(self):
+        """Close every open session."""
+        for session_id in self:
+            self.close(session_id)
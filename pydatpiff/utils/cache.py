@@ -0,0 +1,290 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+from .filehandler import File
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Content addressed file cache with a size cap and least recently used eviction.
+
+    Each entry is stored under the sha256 hash of its content, so identical content
+    cached under different keys (e.g: the same track on several mixtapes) is stored once.
+    The index mapping keys to hashes is saved with the files, so the cache is shared
+    across sessions. Processes sharing the cache merge their changes into the index
+    under a lock file, and the keys used are saved every flush_interval and at exit.
+
+    Directory layout:
+        <directory>/index.json - key -> {"hash", "size", "accessed"}
+        <directory>/index.lock - held while the index is saved
+        <directory>/objects/<hash[:2]>/<hash> - cached content
+    """
+
+    # name of the cache's directory. See: DiskCache.default_directory
+    name = "files"
+    max_size = 1024**3  # 1 GB
+    flush_interval = 30  # seconds between saves of the keys used. See: DiskCache.flush
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+    _instances = weakref.WeakSet()  # caches flushed at exit
+
+    def __init__(self, directory=None, max_size=None):
+        """
+        Args:
+            directory (str, optional): cache's directory (default: DiskCache.default_directory)
+            max_size (int, optional): maximum size of all cached content in bytes
+        """
+        self.directory = directory or self.default_directory()
+        self.max_size = max_size or self.max_size
+        self._index_file = os.path.join(self.directory, "index.json")
+        self._lock_file = os.path.join(self.directory, "index.lock")
+        self._lock = threading.RLock()
+        os.makedirs(os.path.join(self.directory, "objects"), exist_ok=True)
+        self._index = self._load_index()
+        self._touched = {}  # key -> time it was last used, not saved yet
+        self._removed = set()  # keys removed, not saved yet
+        self._flushed = time.monotonic()
+        DiskCache._instances.add(self)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        entry = self._index.get(key)
+        return entry is not None and os.path.isfile(self._object_path(entry["hash"]))
+
+    @classmethod
+    def default_directory(cls):
+        """
+        Return the cache's default directory.
+        Set the environment variable PYDATPIFF_CACHE_DIR to change the parent directory.
+        """
+        root = os.environ.get("PYDATPIFF_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "pydatpiff")
+        return os.path.join(root, cls.name)
+
+    @classmethod
+    def shared(cls):
+        """Return the cache shared by every Media in the process."""
+        with cls._shared_lock:
+            if cls.name not in cls._shared:
+                cls._shared[cls.name] = cls()
+            return cls._shared[cls.name]
+
+    def _load_index(self):
+        try:
+            with open(self._index_file, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError):
+            logger.warning("Cache index is unreadable, starting an empty cache: %s", self._index_file)
+            return {}
+
+    @contextmanager
+    def _locked_index_file(self):
+        """Hold the cache's lock file, so one process at a time saves the index."""
+        with open(self._lock_file, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @contextmanager
+    def _editing_index(self):
+        """
+        Re-read the index and merge the keys used and removed, change it, then save it.
+        The entries other processes saved meanwhile are kept.
+        """
+        with self._locked_index_file():
+            index = self._load_index()
+            for key in self._removed:
+                index.pop(key, None)
+            for key, accessed in self._touched.items():
+                if key in index:
+                    index[key]["accessed"] = max(index[key]["accessed"], accessed)
+            self._index, self._touched, self._removed = index, {}, set()
+            yield self._index
+
+            fd, tmp_file = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._index, f)
+            os.replace(tmp_file, self._index_file)
+            self._flushed = time.monotonic()
+
+    def flush(self):
+        """Save the keys used and removed since the index was last saved."""
+        with self._lock:
+            if self._touched or self._removed:
+                with self._editing_index():
+                    pass
+
+    @classmethod
+    def flush_all(cls):
+        """Save the index of every cache. Called at exit."""
+        for cache in list(cls._instances):
+            try:
+                cache.flush()
+            except OSError:
+                logger.warning("Cache index could not be saved: %s", cache._index_file)
+
+    def _object_path(self, content_hash):
+        return os.path.join(self.directory, "objects", content_hash[:2], content_hash)
+
+    @property
+    def size(self):
+        """Total size in bytes of all cached content. Content shared by several keys is counted once."""
+        with self._lock:
+            return sum({entry["hash"]: entry["size"] for entry in self._index.values()}.values())
+
+    def hash_of(self, key):
+        """Return the content hash of a cached key."""
+        entry = self._index.get(key)
+        if entry:
+            return entry["hash"]
+
+    def path(self, key):
+        """
+        Return the path of a key's cached file, or None if the key is not cached.
+        Marks the key as recently used. See: DiskCache.flush
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+
+            path = self._object_path(entry["hash"])
+            if not os.path.isfile(path):
+                # file was removed outside the cache
+                del self._index[key]
+                self._touched.pop(key, None)
+                self._removed.add(key)
+                path = None
+            else:
+                entry["accessed"] = self._touched[key] = time.time()
+            if time.monotonic() - self._flushed >= self.flush_interval:
+                self.flush()
+            return path
+
+    def get(self, key):
+        """Return a key's cached content, or None if the key is not cached."""
+        path = self.path(key)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def mmap(self, key):
+        """Return a read-only memory map of a key's cached file, or None if the key is not cached."""
+        path = self.path(key)
+        if path is not None:
+            return File.mmap(path)
+
+    def put(self, key, content):
+        """
+        Cache content under key, then evict the least recently used content over the size cap.
+
+        Args:
+            key (str): cache key. e.g: mp3 url
+            content (bytes): content to cache
+
+        Returns:
+            str: path of the cached file
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+        path = self._object_path(content_hash)
+        with self._lock, self._editing_index():
+            if not os.path.isfile(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_file, path)
+
+            self._index[key] = {"hash": content_hash, "size": len(content), "accessed": time.time()}
+            self._evict(keep=content_hash)
+        return path
+
+    def _evict(self, keep=None):
+        """Remove the least recently used content until the cache is under its size cap."""
+        last_used = {}
+        sizes = {}
+        for entry in self._index.values():
+            content_hash = entry["hash"]
+            last_used[content_hash] = max(last_used.get(content_hash, 0), entry["accessed"])
+            sizes[content_hash] = entry["size"]
+
+        total = sum(sizes.values())
+        for content_hash in sorted(last_used, key=last_used.get):
+            if total <= self.max_size:
+                break
+            if content_hash == keep:
+                continue
+            self._remove_content(content_hash)
+            total -= sizes[content_hash]
+
+    def _remove_content(self, content_hash):
+        for key in [key for key, entry in self._index.items() if entry["hash"] == content_hash]:
+            del self._index[key]
+        try:
+            os.remove(self._object_path(content_hash))
+        except FileNotFoundError:
+            pass
+
+    def remove(self, key):
+        """Remove a key from the cache. Its content is removed when no other key shares it."""
+        with self._lock, self._editing_index():
+            entry = self._index.pop(key, None)
+            if entry is None:
+                return
+            if not any(other["hash"] == entry["hash"] for other in self._index.values()):
+                self._remove_content(entry["hash"])
+
+    def clear(self):
+        """Remove all cached content."""
+        with self._lock, self._editing_index():
+            for content_hash in {entry["hash"] for entry in self._index.values()}:
+                self._remove_content(content_hash)
+            self._index.clear()
+
+
+class AudioCache(DiskCache):
+    """Disk cache of mp3 audio, keyed by mp3 url. See: DiskCache"""
+
+    name = "audio"
+    max_size = 1024**3  # 1 GB
+
+
+class CoverCache(DiskCache):
+    """Disk cache of album cover images and their thumbnails, keyed by image url. See: DiskCache"""
+
+    name = "covers"
+    max_size = 256 * 1024**2  # 256 MB
+
+
+atexit.register(DiskCache.flush_all)
@@ -1,5 +1,6 @@
 import logging
 import math
+import mmap
 import os
 import re
 import tempfile
@@ -18,26 +19,77 @@ class Tmp(object):  # pragma: no cover
     on certain platforms like Windows IDLE.
     We create our own, in case user close window or program dies before
     being able to remove these files.
+
+    Temporary files are named after the process that created them, so only the files
+    of processes that are no longer running are removed. See: Tmp.remove_temp_file_on_startup
     """
 
+    # every tmp file using media player will have this suffix
+    SUFFIX = "_datpiff"
+    # name of the temporary files created before they were named after their process. e.g: "tmpk2_x9ab1_datpiff"
+    _LEGACY_NAME = re.compile(r"tmp[a-z0-9_]{8}_datpiff$")
+
     @staticmethod
-    def create():
-        """Create a temporary file with the suffix  `__datpiff`"""
-        return tempfile.NamedTemporaryFile(suffix="_datpiff", delete=False)
+    def _prefix():
+        return "pydatpiff-%s-" % os.getpid()
+
+    @classmethod
+    def create(cls):
+        """Create a temporary file with the suffix  `_datpiff`"""
+        return tempfile.NamedTemporaryFile(prefix=cls._prefix(), suffix=cls.SUFFIX, delete=False)
 
     @staticmethod
-    def remove_temp_file_on_startup():
-        """remove all temporary file created by Datpiff on start up"""
-        # every tmp file using media player will have this suffix
-        suffix = "_datpiff"
+    def owner(filename):
+        """Return the id of the process that created a temporary file, None when it is unknown."""
+        match = re.match(r"pydatpiff-(\d+)-", os.path.basename(filename))
+        if match:
+            return int(match.group(1))
+
+    @staticmethod
+    def is_running(pid):
+        """Return whether the process pid is running."""
+        if os.name == "nt":
+            # os.kill terminates processes on Windows
+            import ctypes
+
+            handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+            if not handle:
+                return False
+            ctypes.windll.kernel32.CloseHandle(handle)
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True  # another user's process
+        return True
+
+    @staticmethod
+    def remove(path):
+        """Remove a temporary file."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            logger.warning("File not found: %s", path)
+
+    @classmethod
+    def remove_temp_file_on_startup(cls):
+        """remove the temporary files left by Datpiff processes that are no longer running"""
         tmp_dir = tempfile.gettempdir()
         for filename in os.listdir(tmp_dir):
-            if suffix in filename:
-                try:
-                    filename = os.path.join(tmp_dir, filename)
-                    os.remove(filename)
-                except FileNotFoundError:
-                    logger.warning("File not found: %s", filename)
+            if cls.SUFFIX not in filename:
+                continue
+            pid = cls.owner(filename)
+            if pid is None:
+                # files named by earlier versions do not name their process
+                if cls._LEGACY_NAME.match(filename):
+                    cls.remove(os.path.join(tmp_dir, filename))
+                continue
+            # files of running processes are in use
+            if pid == os.getpid() or cls.is_running(pid):
+                continue
+            cls.remove(os.path.join(tmp_dir, filename))
 
 
 class File:
@@ -66,6 +118,12 @@ class File:
         with open(filename, mode) as f:
             f.write(content)
 
+    @staticmethod
+    def mmap(path):
+        """Return a read-only memory map of a file. Slicing it only reads the sliced part of the file."""
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
     @staticmethod
     def get_human_readable_file_size(buf_size):
         """Convert file size and returns user readable size"""
@@ -1,12 +1,75 @@
+"""
+Opt-in logging for pydatpiff.
+
+pydatpiff does not output anything until the application configures logging,
+either on its own or with pydatpiff.utils.logging.configure.
+
+Usage:
+    from pydatpiff.utils.logging import configure
+    configure()  # print pydatpiff's messages
+    configure(queued=True)  # print them from a background thread, so logging never blocks
+"""
+
+import atexit
 import logging  # noqa
 import logging.config
+import logging.handlers
 import os
-
-import yaml
+import queue
+import threading
 
 DIR = os.path.dirname(os.path.abspath(__file__))
 log_config_file = os.path.join(DIR, ".logging_config.yaml")
 
-with open(log_config_file, "r") as f:
-    config = yaml.load(f.read(), Loader=yaml.FullLoader)
-    logging.config.dictConfig(config)
+_listener = None  # QueueListener writing the queued records. See: configure
+_lock = threading.Lock()
+
+
+def configure(config=None, queued=False):
+    """
+    Output pydatpiff's messages. By default, messages are printed and warnings are written to .pydatpiff.log.
+
+    Args:
+        config (str,dict, optional): logging.config.dictConfig dictionary, or the path of a YAML file of one
+                (default: pydatpiff/utils/.logging_config.yaml)
+        queued (bool, optional): hand the records to a QueueHandler, and write them from a QueueListener's
+                thread, so the threads logging never wait on the console or the file (default: False)
+
+    Returns:
+        logging.handlers.QueueListener: the listener writing the records when queued, else None
+    """
+    global _listener
+
+    config = config or log_config_file
+    if isinstance(config, str):
+        import yaml
+
+        with open(config, "r") as f:
+            config = yaml.load(f.read(), Loader=yaml.FullLoader)
+
+    shutdown()
+    with _lock:
+        logging.config.dictConfig(config)
+        if not queued:
+            return None
+
+        logger = logging.getLogger("pydatpiff")
+        handlers = [handler for handler in logger.handlers if not isinstance(handler, logging.NullHandler)]
+        records = queue.Queue()
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(logging.handlers.QueueHandler(records))
+        _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+
+@atexit.register
+def shutdown():
+    """Write the queued records, then stop the listener started by configure(queued=True)."""
+    global _listener
+
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
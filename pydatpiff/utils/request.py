@@ -1,8 +1,8 @@
 import logging
+import threading
+import time
 import warnings
-
-import requests
-from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
 
 from pydatpiff.errors import RequestError
 
@@ -11,6 +11,63 @@ logging.getLogger("requests").setLevel(logging.CRITICAL)
 logging.getLogger("urllib3").setLevel(logging.CRITICAL)
 
 
+class _SharedSession:
+    """
+    The requests.Session shared by every Session. See: Session.session
+    requests is imported when the session is first used, so importing pydatpiff does not import it.
+    """
+
+    def __init__(self):
+        self._session = None
+        self._lock = threading.Lock()
+
+    def __get__(self, instance, owner):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    transport_adapter = HTTPAdapter(
+                        pool_connections=50, pool_maxsize=50, max_retries=owner._MAX_RETRIES
+                    )
+                    session.mount("https://", transport_adapter)
+                    self._session = session
+        return self._session
+
+
+class RateLimiter:
+    """
+    Space out requests to each host. Shared by every thread requesting through it. See: Session(rate_limiter=)
+
+    Usage:
+        limiter = RateLimiter(rate=2)  # at most 2 requests per second to each host
+        limiter.wait(url)
+    """
+
+    def __init__(self, rate):
+        """
+        Args:
+            rate (float): requests per second allowed to each host
+        """
+        self.rate = rate
+        self._next = {}  # host -> time the next request is allowed
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Block until a request to url's host is allowed."""
+        if not self.rate:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            allowed = max(self._next.get(host, now), now)
+            self._next[host] = allowed + 1 / self.rate
+        if allowed > now:
+            time.sleep(allowed - now)
+
+
 class Session:  # pragma: no cover
     """Dynamic way to keep requests.Session throughout whole programs."""
 
@@ -21,11 +78,19 @@ class Session:  # pragma: no cover
 
     # public
     TIMEOUT = 3
-    session = requests.Session()
+    session = _SharedSession()
 
-    def __init__(self, *arg, **kwargs):
-        transport_adapter = HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=self._MAX_RETRIES)
-        self.session.mount("https://", transport_adapter)
+    def __init__(self, *arg, rate_limiter=None, **kwargs):
+        """
+        Args:
+            rate_limiter (RateLimiter, optional): spaces out the requests to each host.
+                    Cached responses are not requested, so they are not delayed.
+        """
+        self.rate_limiter = rate_limiter
+
+    def _wait(self, url):
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(url)
 
     @classmethod
     def put_in_cache(cls, url, response):
@@ -51,17 +116,27 @@ class Session:  # pragma: no cover
             return self._CACHE[url]
 
     def method(self, method, url, bypass=None, **kwargs):
-        """urllib requests method"""
+        """urllib requests method
+
+        Args:
+            method (str): http method - "get" or "post"
+            url (str): url to request
+            bypass (bool, optional): skip the response cache, neither reading nor storing the response.
+                    Used for large responses like mp3s (default: None)
+        """
         valid_method = ["get", "post"]
         method = str(method).lower()
 
         if method not in valid_method:
             return
 
-        cached_response = self.get_from_cache(url)
+        cached_response = None if bypass else self.get_from_cache(url)
         if cached_response and method != "post":
             return cached_response
 
+        import requests
+
+        self._wait(url)
         try:
             # GET
             if method == "get":
@@ -94,7 +169,44 @@ class Session:  # pragma: no cover
             raise RequestError(4)
         else:
             # cache the request response for later use cases
-            self.put_in_cache(url, web)
+            if not bypass:
+                self.put_in_cache(url, web)
             self._TOTAL_TIMEOUT = 0
         finally:
             return web
+
+    def stream(self, url, start=0, **kwargs):
+        """Request a large response without reading its body. Never cached.
+
+        Args:
+            url (str): url to request
+            start (int, optional): byte offset to start from. Servers supporting Range
+                    requests reply with 206 Partial Content (default: 0)
+
+        Returns:
+            requests.Response: response whose body is read with Response.iter_content
+
+        Raises:
+            RequestError: the request failed
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        if start:
+            headers["Range"] = "bytes=%d-" % start
+        import requests
+
+        self._wait(url)
+        try:
+            web = self.session.get(url, timeout=self.TIMEOUT, stream=True, headers=headers, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            raise RequestError(2)
+        except requests.exceptions.InvalidURL:
+            raise RequestError(3)
+
+        # 416: the range starts at the end of the body, the partial file is already complete
+        if web.status_code != 416:
+            try:
+                web.raise_for_status()
+            except requests.exceptions.HTTPError:
+                web.close()
+                raise RequestError(4)
+        return web
@@ -3,12 +3,16 @@
     These methods will be used throughout the whole program.
 
 """
+import logging
 import sys  # noqa: F401
 import threading
-from concurrent.futures import ThreadPoolExecutor
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from functools import wraps
 from typing import List, Tuple, Union
 
+logger = logging.getLogger(__name__)
+
 
 def threader_wrapper(f):
     @wraps(f)
@@ -21,34 +25,228 @@ def threader_wrapper(f):
     return inner
 
 
+class TaskResult:
+    """Outcome of a single task run by the Executor."""
+
+    def __init__(self, work, result=None, error=None):
+        self.work = work
+        self.result = result
+        self.error = error
+
+    def __repr__(self):
+        return "<TaskResult work=%r ok=%s>" % (self.work, self.ok)
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class TaskStream:
+    """
+    Iterate over the results of concurrent tasks as they complete.
+
+    Each task's exception is captured in its TaskResult instead of being raised,
+    and a task running longer than its timeout is reported with a TimeoutError.
+    """
+
+    def __init__(self, futures, started, timeout=None):
+        self._futures = futures  # future -> (position, work)
+        self._started = started  # position -> task start time
+        self.timeout = timeout
+
+    def __iter__(self):
+        for _, task in self._iter_positions():
+            yield task
+
+    def __len__(self):
+        return len(self._futures)
+
+    def _iter_positions(self):
+        pending = set(self._futures)
+        while pending:
+            done, _ = wait(pending, timeout=self._wait_time(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                yield self._futures[future][0], self._result(future)
+
+            for future in self._expired(pending):
+                pending.discard(future)
+                future.cancel()
+                position, work = self._futures[future]
+                yield position, TaskResult(work, error=TimeoutError("Task timed out: %r" % (work,)))
+
+    def _result(self, future):
+        work = self._futures[future][1]
+        if future.cancelled():
+            return TaskResult(work, error=CancelledTaskError(work))
+
+        error = future.exception()
+        if error is not None:
+            logger.warning("Task failed: %r - %r", work, error)
+            return TaskResult(work, error=error)
+        return TaskResult(work, result=future.result())
+
+    def _running_time(self, future, now):
+        position = self._futures[future][0]
+        if position in self._started:
+            return now - self._started[position]
+
+    def _wait_time(self, pending):
+        """Time left until the first running task times out."""
+        if self.timeout is None:
+            return None
+
+        now = time.monotonic()
+        running = [self._running_time(future, now) for future in pending]
+        remaining = [self.timeout - elapsed for elapsed in running if elapsed is not None]
+        # tasks that have not started yet are checked again after one timeout
+        return max(0, min(remaining, default=self.timeout))
+
+    def _expired(self, pending):
+        if self.timeout is None:
+            return []
+
+        now = time.monotonic()
+        expired = []
+        for future in pending:
+            elapsed = self._running_time(future, now)
+            if elapsed is not None and elapsed >= self.timeout:
+                expired.append(future)
+        return expired
+
+    def cancel(self):
+        """Cancel all tasks that have not started yet."""
+        for future in self._futures:
+            future.cancel()
+
+    def results(self):
+        """Return every task's result in the order that the work was submitted."""
+        return [task for _, task in sorted(self._iter_positions(), key=lambda item: item[0])]
+
+
+class CancelledTaskError(Exception):
+    """Raised for a task that was cancelled before it started."""
+
+
+class Executor:
+    """
+    Worker pool shared by all concurrent jobs. See: ThreadQueue
+
+    The pool is created on first use. Call Executor.configure to change
+    the number of workers or the default per-task timeout.
+    """
+
+    max_workers = 8
+    timeout = None  # default per-task timeout, in seconds
+
+    _pool = None
+    _lock = threading.Lock()
+    _worker = threading.local()
+
+    @classmethod
+    def configure(cls, max_workers=None, timeout=None):
+        """
+        Configure the shared worker pool. Tasks already submitted will still complete.
+        Settings that are not passed are kept.
+
+        Args:
+            max_workers (int, optional): number of worker threads
+            timeout (float, optional): default time in seconds a task may run
+        """
+        with cls._lock:
+            if timeout is not None:
+                cls.timeout = timeout
+            if max_workers and max_workers != cls.max_workers:
+                cls.max_workers = max_workers
+                if cls._pool is not None:
+                    cls._pool.shutdown(wait=False)
+                    cls._pool = None
+
+    @classmethod
+    def pool(cls):
+        with cls._lock:
+            if cls._pool is None:
+                cls._pool = ThreadPoolExecutor(max_workers=cls.max_workers, thread_name_prefix="pydatpiff")
+            return cls._pool
+
+    @classmethod
+    def in_worker(cls):
+        """Return True when called from one of the Executor's worker threads."""
+        return getattr(cls._worker, "active", False)
+
+    @classmethod
+    def _run(cls, started, position, job, work, *args, **kwargs):
+        started[position] = time.monotonic()
+        cls._worker.active = True
+        try:
+            return job(work, *args, **kwargs)
+        finally:
+            cls._worker.active = False
+
+    @classmethod
+    def stream(cls, job, input_work, *args, timeout=None, **kwargs):
+        """
+        Run job on each work concurrently.
+
+        Args:
+            job (function): function called as job(work, *args, **kwargs)
+            input_work (list): work to perform the job with
+            timeout (float, optional): time in seconds each task may run (default: Executor.timeout)
+
+        Returns:
+            TaskStream - the tasks' results, in order of completion
+        """
+        if cls.in_worker():
+            # A job submitting more jobs could wait forever on its own busy pool,
+            # so nested jobs run on a private worker instead.
+            pool = ThreadPoolExecutor(max_workers=1)
+        else:
+            pool = cls.pool()
+
+        started = {}
+        futures = {}
+        for position, work in enumerate(input_work):
+            future = pool.submit(cls._run, started, position, job, work, *args, **kwargs)
+            futures[future] = (position, work)
+
+        if pool is not cls._pool:
+            # submitted tasks still run
+            pool.shutdown(wait=False)
+        return TaskStream(futures, started, timeout if timeout is not None else cls.timeout)
+
+
 class ThreadQueue:  # pragma: no cover
-    def __init__(self, main_job, input_work: Union[Tuple, List], *args, **kwargs):
+    def __init__(self, main_job, input_work: Union[Tuple, List], *args, timeout=None, **kwargs):
         """
         This class will be used to execute concurrent jobs.
         The main job will be executed with the input work.
         The input work will be a list of work to be executed.
         :param input_work: input work to perform the main job with.
+        :param timeout: time in seconds each job may run (default: Executor.timeout)
         """
         self.main_job = main_job  # job to perform with work
         self.input_work = input_work
+        self.timeout = timeout
+
+    def stream(self, *args, **kwargs):
+        """
+        Execute the main job with the input work on the shared Executor,
+        and return each job's TaskResult as soon as it completes.
+        :param args: args to pass to the main job.
+        :param kwargs: kwargs to pass to the main job.
+        """
+        return Executor.stream(self.main_job, self.input_work, *args, timeout=self.timeout, **kwargs)
 
     def execute(self, *args, **kwargs):
         """
         This method will execute the main job with the input work.
         args and kwargs are additional arguments kwargs
+        Jobs that fail or time out return None.
         :param args: args to pass to the main job.
         :param kwargs: kwargs to pass to the main job.
 
         """
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            if args or kwargs:
-                data = executor.map(
-                    lambda work: self.main_job(work, *args, **kwargs), [work for work in self.input_work], timeout=10
-                )
-            else:
-                data = executor.map(self.main_job, self.input_work)
-            executor.shutdown(wait=True)
-        return [x for x in data]
+        return [task.result for task in self.stream(*args, **kwargs).results()]
 
 
 class Object:
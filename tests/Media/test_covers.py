@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from pydatpiff.backend.covers import CoverService
+from pydatpiff.utils.cache import CoverCache
+from tests.utils import BaseTest
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class TestCoverService(BaseTest):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache = CoverCache(self.tmp_dir.name)
+        self.image = b"\xff\xd8\xff\xe0" + b"\0" * 64
+        self.session = Mock()
+        self.session.method.side_effect = lambda *args, **kwargs: Mock(content=self.image)
+        self.covers = CoverService(cache=self.cache, session=self.session)
+
+    def test_cover_service_requests_each_cover_once(self):
+        threads = [threading.Thread(target=self.covers.fetch, args=("cover.jpg",)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        path = self.covers.fetch("cover.jpg")
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.image)
+        self.session.method.assert_called_once()
+
+        # covers are kept across sessions
+        CoverService(cache=CoverCache(self.tmp_dir.name), session=self.session).fetch("cover.jpg")
+        self.session.method.assert_called_once()
+
+    def test_cover_service_raises_a_failed_request_in_every_waiting_thread(self):
+        release = threading.Event()
+        self.session.method.side_effect = lambda *args, **kwargs: release.wait(5) and Mock(content=self.image)
+        self.cache.put = Mock(side_effect=OSError("disk full"))
+        errors = []
+
+        def fetch():
+            try:
+                self.covers.fetch("cover.jpg")
+            except OSError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=fetch) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.1)  # the second thread waits for the first thread's request
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(len(errors), 2)
+        self.session.method.assert_called_once()
+
+    def test_cover_service_serves_covers_by_mixtape_link(self):
+        mixtape = Mock(links=["/album-1", "/album-2"], album_covers=["1.jpg", "2.jpg"])
+        paths = self.covers.add(mixtape)
+
+        self.assertEqual(set(paths), {"/album-1", "/album-2"})
+        self.assertEqual(self.covers.get("/album-2"), paths["/album-2"])
+        self.assertIsNone(self.covers.get("/unknown"))
+        self.assertEqual(self.session.method.call_count, 2)
+
+    @unittest.skipIf(Image is None, "Pillow is not installed")
+    def test_cover_service_creates_thumbnails_once(self):
+        source = os.path.join(self.tmp_dir.name, "cover.png")
+        Image.new("RGB", (600, 400)).save(source)
+        with open(source, "rb") as f:
+            self.image = f.read()
+
+        path = self.covers.thumbnail("cover.png", (120, 120))
+        with Image.open(path) as thumbnail:
+            self.assertEqual(thumbnail.size, (120, 80))
+        self.assertEqual(self.covers.thumbnail("cover.png", (120, 120)), path)
@@ -0,0 +1,245 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from pydatpiff import mixtapes
+from pydatpiff.backend import download, mediasetup
+from pydatpiff.backend.download import (
+    AlbumDownloader,
+    DownloadManifest,
+    DownloadProgress,
+    DownloadScheduler,
+    RateLimiter,
+)
+from pydatpiff.errors import DownloadError
+from pydatpiff.utils.cache import AudioCache
+from tests.utils import BaseTest
+
+
+class TestAlbumDownloader(BaseTest):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "Artist - Song.mp3")
+        self.content = self.get_song_content()
+        self.session = Mock()
+
+    def response(self, body, status=200, length=None):
+        length = len(body) if length is None else length
+        chunks = [body[i : i + 1000] for i in range(0, len(body), 1000)]
+        return Mock(status_code=status, headers={"Content-Length": str(length)}, iter_content=Mock(return_value=chunks))
+
+    def test_album_downloader_writes_tracks_in_chunks_then_renames_them(self):
+        self.session.stream.return_value = self.response(self.content)
+        events = []
+        downloader = AlbumDownloader(session=self.session, on_progress=lambda event, *_: events.append(event))
+
+        self.assertEqual(downloader.download([("song.mp3", self.path)]), [])
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertFalse(os.path.exists(self.path + ".part"))
+        self.assertEqual(downloader.progress.bytes_downloaded, len(self.content))
+        self.assertEqual(events[0], DownloadProgress.STARTED)
+        self.assertEqual(events[-1], DownloadProgress.COMPLETED)
+
+        # tracks already downloaded are skipped
+        downloader.download([("song.mp3", self.path)])
+        self.assertEqual(downloader.progress.skipped, 1)
+        self.session.stream.assert_called_once()
+
+    def test_album_downloader_resumes_partial_tracks(self):
+        half = len(self.content) // 2
+        # the connection closed halfway through the track
+        self.session.stream.return_value = self.response(self.content[:half], length=len(self.content))
+        downloader = AlbumDownloader(session=self.session)
+        failed = downloader.download([("song.mp3", self.path)])
+        self.assertIsInstance(failed[0][2], DownloadError)
+        self.assertEqual(os.path.getsize(self.path + ".part"), half)
+
+        self.session.stream.return_value = self.response(self.content[half:], status=206)
+        self.assertEqual(downloader.download([("song.mp3", self.path)]), [])
+        self.session.stream.assert_called_with("song.mp3", start=half)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_album_downloader_rejects_files_that_are_not_mp3(self):
+        self.session.stream.return_value = self.response(b"<html>Not Found</html>")
+        failed = AlbumDownloader(session=self.session).download([("song.mp3", self.path)])
+        self.assertIsInstance(failed[0][2], DownloadError)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + ".part"))
+
+    def test_album_downloader_links_urls_already_downloaded(self):
+        self.session.stream.return_value = self.response(self.content)
+        manifest = DownloadManifest(os.path.join(self.tmp_dir.name, "manifest.json"))
+        downloader = AlbumDownloader(session=self.session, manifest=manifest)
+        copy = os.path.join(self.tmp_dir.name, "Other Artist - Song.mp3")
+        downloader.download([("song.mp3", self.path)])
+        downloader.download([("song.mp3", copy)])
+
+        self.session.stream.assert_called_once()
+        self.assertEqual(downloader.progress.deduplicated, 1)
+        self.assertTrue(os.path.samefile(self.path, copy))
+        # the manifest is saved for the next session
+        self.assertEqual(DownloadManifest(manifest.path).find_url("song.mp3"), os.path.abspath(self.path))
+
+    def test_album_downloader_copies_duplicates_tagged_differently_then_tags_them(self):
+        self.session.stream.return_value = self.response(self.content)
+        manifest = DownloadManifest(os.path.join(self.tmp_dir.name, "manifest.json"))
+        tagger = Mock()
+        tagger.tag.return_value = Future()
+        tagger.tag.return_value.set_result(None)
+        downloader = AlbumDownloader(session=self.session, manifest=manifest, tagger=tagger)
+        album_a = {"title": "Song", "album": "Album A", "track": 1}
+        album_b = {"title": "Song", "album": "Album B", "track": 3}
+        copy_b = os.path.join(self.tmp_dir.name, "Album B - Song.mp3")
+        copy_a = os.path.join(self.tmp_dir.name, "Album A (copy) - Song.mp3")
+        downloader.download([("song.mp3", self.path, album_a)])
+        downloader.download([("song.mp3", copy_b, album_b)])
+        downloader.download([("song.mp3", copy_a, album_a)])
+
+        self.session.stream.assert_called_once()
+        self.assertEqual(downloader.progress.deduplicated, 1)
+        # the track of another album is copied, so its tags do not change the first file
+        self.assertFalse(os.path.samefile(self.path, copy_b))
+        tagger.tag.assert_any_call(copy_b, album_b, guard=manifest.updating)
+        self.assertEqual(manifest.tags_of(copy_b), album_b)
+        # tracks tagged alike share one file
+        self.assertTrue(os.path.samefile(self.path, copy_a))
+        self.assertEqual(tagger.tag.call_count, 2)
+
+    def test_download_manifest_only_locks_the_file_being_updated(self):
+        manifest = DownloadManifest()
+        other = os.path.join(self.tmp_dir.name, "Other Artist - Song.mp3")
+        for path, content_hash in ((self.path, "hash"), (other, "other hash")):
+            with open(path, "wb") as f:
+                f.write(self.content)
+            manifest.add(content_hash, path)
+        found = []
+        with manifest.updating(self.path):
+            lookup = threading.Thread(target=lambda: found.append(manifest.find("other hash")))
+            lookup.start()
+            lookup.join(5)
+            self.assertFalse(lookup.is_alive())
+        self.assertEqual(found, [os.path.abspath(other)])
+
+    def test_download_manifest_appends_each_change_to_its_file(self):
+        path = os.path.join(self.tmp_dir.name, "manifest.json")
+        with open(path, "w") as f:
+            # manifest saved as a single json object
+            json.dump({"hashes": {"old hash": {"/music/old.mp3": 1}}, "urls": {"old.mp3": "old hash"}}, f)
+        with open(self.path, "wb") as f:
+            f.write(self.content)
+
+        manifest = DownloadManifest(path)
+        manifest.add("hash", self.path, "song.mp3", {"title": "Song"})
+        manifest.refresh(self.path)
+        with open(path) as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+        manifest = DownloadManifest(path)
+        self.assertEqual(manifest.hash_of("old.mp3"), "old hash")
+        self.assertEqual(manifest.find_url("song.mp3"), os.path.abspath(self.path))
+        self.assertEqual(manifest.tags_of(self.path), {"title": "Song"})
+
+        # the file is rewritten as a snapshot once it grows
+        manifest.compact_after = 2
+        manifest._load()
+        with open(path) as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertEqual(DownloadManifest(path).find_url("song.mp3"), os.path.abspath(self.path))
+
+    def test_album_downloader_copies_cached_tracks(self):
+        audio_cache = AudioCache(os.path.join(self.tmp_dir.name, "cache"))
+        audio_cache.put("song.mp3", self.content)
+        downloader = AlbumDownloader(session=self.session, audio_cache=audio_cache)
+        self.assertTrue(downloader.download_track("song.mp3", self.path))
+        self.assertEqual(os.path.getsize(self.path), len(self.content))
+        self.session.stream.assert_not_called()
+
+    def test_album_downloader_requests_tracks_whose_cached_file_is_damaged(self):
+        audio_cache = AudioCache(os.path.join(self.tmp_dir.name, "cache"))
+        with open(audio_cache.put("song.mp3", self.content), "r+b") as f:
+            f.truncate(len(self.content) // 2)
+        self.session.stream.return_value = self.response(self.content)
+
+        downloader = AlbumDownloader(session=self.session, audio_cache=audio_cache)
+        self.assertTrue(downloader.download_track("song.mp3", self.path))
+        self.assertEqual(os.path.getsize(self.path), len(self.content))
+        self.assertIsNone(audio_cache.path("song.mp3"))
+
+
+class TestDownloadScheduler(BaseTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        mix_content = cls.get_request_content("mixtape")
+        mixtapes.Session.method = Mock(autospec=True, return_value=cls.mocked_response(content=mix_content))
+        cls.mix = mixtapes.Mixtape()
+        embed_player = cls.get_request_content("embed_player")
+        mediasetup.Session.method = Mock(autospec=True, return_value=cls.mocked_response(content=embed_player))
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        content = self.get_song_content()
+        self.session = Mock()
+        self.session.stream.side_effect = lambda *args, **kwargs: Mock(
+            status_code=200, headers={"Content-Length": str(len(content))}, iter_content=Mock(return_value=[content])
+        )
+
+    def test_download_scheduler_downloads_albums_and_records_them_in_journal(self):
+        journal = os.path.join(self.tmp_dir.name, "journal.json")
+        scheduler = DownloadScheduler(self.tmp_dir.name, albums=2, tracks=3, journal=journal, session=self.session)
+        report = scheduler.download(self.mix, selection=[0, 1])
+
+        self.assertEqual(report.albums, 2)
+        # every track has the same content, so it is stored once
+        self.assertEqual(report.tracks, 1)
+        self.assertEqual(report.tracks + report.tracks_deduplicated, 2 * len(self.song_list))
+        # both albums list the same mp3 urls. Urls already downloaded are linked instead of requested
+        self.assertLess(self.session.stream.call_count, 2 * len(self.song_list))
+        files = [os.path.join(root, name) for root, _, names in os.walk(self.tmp_dir.name) for name in names]
+        tracks = [path for path in files if path.endswith(".mp3")]
+        # each track is tagged with its own album and title, so each is a copy of the track requested
+        self.assertEqual(len({os.stat(path).st_ino for path in tracks}), len(tracks))
+        self.assertGreater(report.bytes_downloaded, 0)
+        self.assertIn("Albums: 2 downloaded", str(report))
+
+        # a new run skips the albums the journal records as done
+        report = DownloadScheduler(self.tmp_dir.name, journal=journal, session=self.session).download(
+            self.mix, selection=[0, 1]
+        )
+        self.assertEqual(report.albums_skipped, 2)
+        self.assertEqual(report.tracks, 0)
+        # each status change of an album is a line of the journal
+        with open(journal) as f:
+            self.assertEqual(len(f.readlines()), 4)
+
+    def test_download_scheduler_rate_limits_the_requests_of_album_pages(self):
+        scheduler = DownloadScheduler(self.tmp_dir.name, rate=1000, session=self.session, tag=False)
+        albums = []
+        with patch.object(
+            download, "Album", side_effect=lambda link: albums.append(mediasetup.Album(link)) or albums[-1]
+        ):
+            scheduler.download_album(self.mix.artists[0], self.mix.links[0])
+        self.assertIs(albums[0]._session.rate_limiter, scheduler.rate_limiter)
+
+    def test_session_rate_limits_its_requests(self):
+        limiter = Mock()
+        with patch.object(download.Session, "session"):
+            download.Session(rate_limiter=limiter).stream("https://hw-mp3.datpiff.com/song.mp3")
+        limiter.wait.assert_called_once_with("https://hw-mp3.datpiff.com/song.mp3")
+
+    def test_rate_limiter_spaces_out_requests_to_each_host(self):
+        limiter = RateLimiter(rate=20)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.wait("https://hw-mp3.datpiff.com/song.mp3")
+        limiter.wait("https://www.datpiff.com/")
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        self.assertLess(time.monotonic() - start, 1)
@@ -0,0 +1,36 @@
+import struct
+
+from pydatpiff.backend.audio.baseplayer import MetaData
+from pydatpiff.backend.audio.duration import DurationProvider, Mp3Header, parse_duration
+from tests.utils import BaseTest
+
+
+class TestDuration(BaseTest):
+    def test_parse_duration_converts_clock_format_to_seconds(self):
+        self.assertEqual(parse_duration("02:14"), 134)
+        self.assertEqual(parse_duration("1:02:03"), 3723)
+        self.assertIsNone(parse_duration("n/a"))
+
+    def test_mp3_header_estimates_length_from_first_frames(self):
+        expected = MetaData(self.get_song_path()).track_duration
+        self.assertAlmostEqual(Mp3Header.probe_file(self.get_song_path()), expected, delta=1)
+
+        # the start of the body and its Content-Length are enough
+        content = self.get_song_content()
+        self.assertAlmostEqual(Mp3Header.probe(content[:20000], content_length=len(content)), expected, delta=1)
+
+    def test_mp3_header_reads_frame_count_of_xing_header(self):
+        # mpeg 1 layer III, 128 kbps, 44.1 kHz, stereo. Xing header follows the 32 bytes side info.
+        frame = b"\xff\xfb\x90\x00" + bytes(32) + b"Xing" + struct.pack(">II", 1, 1000)
+        frame += bytes(417 - len(frame))
+        self.assertAlmostEqual(Mp3Header.probe(frame * 2), 1000 * 1152 / 44100)
+
+    def test_mp3_header_ignores_a_xing_header_cut_short(self):
+        frame = b"\xff\xfb\x90\x00" + bytes(32) + b"Xing" + struct.pack(">II", 1, 1000)
+        self.assertIsNone(Mp3Header.probe(frame[:42]))
+
+    def test_duration_provider_prefers_durations_listed_on_album_page(self):
+        provider = DurationProvider(["02:14", ""])
+        self.assertEqual(provider.duration(0, self.get_song_path()), 134)
+        self.assertAlmostEqual(provider.duration(1, self.get_song_path()), 27.2, delta=1)
+        self.assertIsNone(provider.duration(1))
@@ -1,13 +1,15 @@
 import os
 import re
+import time
 from tempfile import TemporaryDirectory as TempDir
 from unittest.mock import Mock, PropertyMock, call, patch
 
 from pydatpiff import media, mixtapes
-from pydatpiff.backend import mediasetup
+from pydatpiff.backend import mediasetup, songindex
 from pydatpiff.backend.audio import mpvplayer
 from pydatpiff.constants import verbose_message
 from pydatpiff.errors import MediaError, PlayerError
+from pydatpiff.utils.cache import AudioCache
 from pydatpiff.utils.filehandler import File
 from tests.utils import BaseTest
 
@@ -49,6 +51,9 @@ class BaseMediaTest(BaseTest):
         cls.mock_get_audio = cls.media._get_audio_track = Mock(
             return_value=(cls.song_list[0], cls.get_song_content()), autospec=True
         )
+        cls.mock_get_audio_file = cls.media._get_audio_file = Mock(
+            return_value=(cls.song_list[0], cls.get_song_path()), autospec=True
+        )
         # Mocked file descriptor for writing song content (io buffer)
         cls.mocked_write_audio = cls.media._write_audio = Mock(return_value=cls.get_song_content())
         cls.media._song_index = 0
@@ -92,6 +97,12 @@ class TestMedia(BaseMediaTest):
             media.Media(self.mix, player="invalid")
             self.assertEqual(context.exception.code, 5)
 
+    def test_media_player_can_be_a_player_class_or_the_null_player(self):
+        from pydatpiff.backend.audio.nullplayer import NullPlayer
+
+        self.assertIsInstance(media.Media(self.mix, player="null").player, NullPlayer)
+        self.assertIsInstance(media.Media(self.mix, player=NullPlayer).player, NullPlayer)
+
     def test_media_default_media_player_is_set_to_MPV_player(self):
         from pydatpiff.backend.audio.player import MPV as MPVPlayer
 
@@ -129,21 +140,57 @@ class TestMedia(BaseMediaTest):
             media.Media(object)
             self.assertEqual(context.exception.code, 1)
 
-    @patch.object(media.ThreadQueue, "execute", autospec=True)
-    def test_media_find_song_method_returns_correct_albums(self, queue):
+    def mocked_song_index(self):
+        # Mixtape's song index where every other album contains the same songs
+        song_index = songindex.SongIndex(self.mix)
+
+        def fetch_album(mixtape_index):
+            return mixtape_index, self.mixtape_list[mixtape_index], self.song_list if mixtape_index % 2 == 0 else []
+
+        song_index._fetch_album = Mock(side_effect=fetch_album)
+        return song_index
+
+    @patch.object(mixtapes.Mixtape, "song_index", new_callable=PropertyMock)
+    def test_media_find_song_method_returns_correct_albums(self, mocked_song_index):
+        mocked_song_index.return_value = self.mocked_song_index()
         query_result = {
             "index": 1,
             "album": self.mixtape_list[0],
             "song": self.song_list[0],
+            "track": 1,
         }
-        queue.return_value = [query_result]
         response = self.media.find_song("Switches")
         self.assertIn(query_result, response)
+        self.assertEqual([result["index"] for result in response], [1, 3, 5, 7, 9, 11])
+
+    @patch.object(mixtapes.Mixtape, "song_index", new_callable=PropertyMock)
+    def test_media_find_song_method_returns_every_matching_track(self, mocked_song_index):
+        mocked_song_index.return_value = self.mocked_song_index()
+        response = self.media.find_song("wockesha")
+        songs = [result["song"] for result in response if result["index"] == 1]
+        self.assertEqual(songs, [self.song_list[6], self.song_list[10]])
+
+    @patch.object(mixtapes.Mixtape, "song_index", new_callable=PropertyMock)
+    def test_media_find_song_method_tolerates_typos(self, mocked_song_index):
+        mocked_song_index.return_value = self.mocked_song_index()
+        self.mix._search_engine = None
+        response = self.media.find_song("scorpoi")
+        self.assertEqual(response[0]["song"], "Scorpio")
+        self.assertEqual(response[0]["track"], 5)
+        self.mix._search_engine = None
+
+    def test_media_album_and_song_can_be_selected_with_typos(self):
+        media_player = media.Media(self.mix)
+        media_player.setMedia("Monybagg")
+        self.assertEqual(media_player.artist, self.artist_list[0])
 
-    @patch.object(media.ThreadQueue, "execute", autospec=True)
+        media_player.song = "scorpoi"
+        self.assertEqual(media_player.song, "Scorpio")
+
+    @patch.object(mixtapes.Mixtape, "song_index", new_callable=PropertyMock)
     @patch.object(media, "Verbose", autospec=True)
-    def test_verbose_message_is_displayed_when_song_is_not_found(self, mocked_verbose, mocked_queue):
-        mocked_queue.return_value = []
+    def test_verbose_message_is_displayed_when_song_is_not_found(self, mocked_verbose, mocked_song_index):
+        mocked_song_index.return_value = self.mocked_song_index()
         song_name = "unknown song"
         self.media.find_song(song_name)
         mocked_verbose.assert_called_with(verbose_message["SONG_NAME_NOT_FOUND"] % song_name)
@@ -256,8 +303,42 @@ class TestMedia(BaseMediaTest):
         self.assertEqual(self.media.song, self.song_list[0])
         mocked_verbose.assert_not_called()
 
+    @patch.object(media.File, "write_to_file", autospec=True)
+    def test_media_plays_cached_song_file_without_copying_it(self, mocked_write_file):
+        with patch.object(self.media.player, "set_track") as mocked_set_track:
+            self.media.play(1)
+            mocked_write_file.assert_not_called()
+            mocked_set_track.assert_called_with(
+                " - ".join((self.artist_list[0], self.song_list[0])),
+                self.get_song_path(),
+                duration=134,
+                start=None,
+                length=None,
+            )
+
+            # demo plays a window of the cached song
+            self.media.play(1, demo=True)
+            mocked_write_file.assert_not_called()
+            self.assertEqual(mocked_set_track.call_args[0][1], self.get_song_path())
+            self.assertEqual(mocked_set_track.call_args[1]["start"], 134 * 0.04)
+            self.assertEqual(mocked_set_track.call_args[1]["length"], 134 * 0.2)
+
+    def test_media_streams_songs_that_are_not_cached_from_their_mp3_url(self):
+        player = self.unmocked_media.player
+        self.unmocked_media.stream = True
+        self.addCleanup(setattr, self.unmocked_media, "stream", False)
+        with patch.object(self.unmocked_media.audio_cache, "path", return_value=None), patch.object(
+            player, "set_track"
+        ) as mocked_set_track, patch.object(type(player), "play", new_callable=PropertyMock), patch.object(
+            self.unmocked_media, "_fetch_audio"
+        ) as mocked_fetch:
+            self.unmocked_media.play(1)
+            self.assertEqual(mocked_set_track.call_args[0][1], self.unmocked_media.mp3_urls[0])
+            # the song is not downloaded before playing
+            mocked_fetch.assert_not_called()
+
     @patch.object(media.Media, "song", new_callable=PropertyMock)
-    @patch.object(media.Media, "_get_audio_track", side_effect=MediaError)
+    @patch.object(media.Media, "_get_audio_file", side_effect=MediaError)
     @patch.object(media, "Verbose", autospec=True)
     def test_media_song_method_catches_MediaError_when_audio_track_is_invalid(
         self, mocked_verbose, mocked_audio, mocked_song
@@ -269,83 +350,91 @@ class TestMedia(BaseMediaTest):
         self.assertIsNone(is_playing)
         mocked_verbose.assert_not_called()
 
+    def download_song(self, track, **kwargs):
+        """Download a song of the mocked media to a temporary directory. Returns the files downloaded."""
+        self.media._cache_song(self.media.mp3_urls[0], self.get_song_content())
+        with TempDir() as output:
+            self.media.download(track, output=output, tag=False, **kwargs)
+            return [name for name in os.listdir(output) if name.endswith(".mp3")]
+
     @patch.object(media.Media, "song", new_callable=PropertyMock)
-    @patch.object(media.File, "write_to_file", autospec=True)
-    def test_download_song_by_index_downloads_correct_song(self, mocked_write_file, mocked_song):
+    def test_download_song_by_index_downloads_correct_song(self, mocked_song):
         # test download song by referencing song index
-        mocked_write_file.return_value = ""
         mocked_song.return_value = self.song_list[0]
-        self.media.download(1)
+        self.assertEqual(len(self.download_song(1)), 1)
         self.assertEqual(self.media.song, self.song_list[0])
 
     @patch.object(media.Media, "song", new_callable=PropertyMock)
-    @patch.object(media.File, "write_to_file", autospec=True)
-    def test_downloading_song_that_is_out_of_range_downloads_last_song(self, mocked_write_file, mocked_song):
+    def test_downloading_song_that_is_out_of_range_downloads_last_song(self, mocked_song):
         # test download song by referencing song index
-        mocked_write_file.return_value = ""
         mocked_song.return_value = self.song_list[-1]
-        self.media.download(100000)
+        self.download_song(100000)
         self.assertEqual(self.media.song, self.song_list[-1])
 
     @patch.object(media.Media, "song", new_callable=PropertyMock)
-    @patch.object(media.File, "write_to_file", autospec=True)
     @patch.object(media, "Verbose", autospec=True)
-    def test_download_song_by_song_name_downloads_correct_song(self, mocked_verbose, mocked_write_file, mocked_song):
+    def test_download_song_by_song_name_downloads_correct_song(self, mocked_verbose, mocked_song):
         # test download song by referencing partial song mame
-        mocked_write_file.return_value = ""
         mocked_song.return_value = self.song_list[0]
-        self.media.download(self.song_list[0])
+        self.download_song(self.song_list[0])
         self.assertEqual(self.media.song, self.song_list[0])
 
     @patch.object(media.Media, "song", new_callable=PropertyMock)
-    @patch.object(media.File, "write_to_file", autospec=True)
     @patch.object(media, "Verbose", autospec=True)
-    def test_download_song_by_partial_song_name_downloads_correct_song(
-        self, mocked_verbose, mocked_write_file, mocked_song
-    ):
+    def test_download_song_by_partial_song_name_downloads_correct_song(self, mocked_verbose, mocked_song):
         # test download song by referencing partial song mame
-        mocked_write_file.return_value = ""
         mocked_song.return_value = self.song_list[0]
-        self.media.download(self.song_list[0][:3])
+        self.download_song(self.song_list[0][:3])
         self.assertEqual(self.media.song, self.song_list[0])
         mocked_verbose.assert_not_called()
 
     @patch.object(media.Media, "song", new_callable=PropertyMock)
-    @patch.object(media.File, "write_to_file", autospec=True)
     @patch.object(media, "Verbose", autospec=True)
-    def test_download_song_by_case_insensitive_name_downloads_correct_song(
-        self, mocked_verbose, mocked_write_file, mocked_song
-    ):
+    def test_download_song_by_case_insensitive_name_downloads_correct_song(self, mocked_verbose, mocked_song):
         # test download song is case-insensitive
-        mocked_write_file.return_value = ""
         mocked_song.return_value = self.song_list[0]
-        self.media.download(self.song_list[0][:3].upper())
+        self.download_song(self.song_list[0][:3].upper())
         self.assertEqual(self.media.song, self.song_list[0])
         mocked_verbose.assert_not_called()
 
     @patch.object(media.Media, "song", new_callable=PropertyMock)
-    @patch.object(media.File, "write_to_file", autospec=True)
-    def test_download_song_raises_FileNotFoundError_when_directory_not_found(self, mocked_write_file, mocked_song):
+    def test_download_song_raises_FileNotFoundError_when_directory_not_found(self, mocked_song):
         # test download song is case-insensitive
-        mocked_write_file.return_value = ""
         mocked_song.return_value = self.song_list[0]
         with self.assertRaises(FileNotFoundError) as context:
             self.media.download(self.song_list[0][:3].upper(), output="some-random-dir")
             self.assertEqual(context.message, "Invalid directory: some-random-dir")
 
     @patch.object(media.Media, "song", new_callable=PropertyMock)
-    @patch.object(media.Media, "_get_audio_track", side_effect=MediaError)
-    @patch.object(media.File, "write_to_file", autospec=True)
-    def test_download_song_catches_MediaError_when_audio_track_is_invalid(
-        self, mocked_write_file, mocked_audio, mocked_song
-    ):
+    def test_download_song_catches_MediaError_when_audio_track_is_invalid(self, mocked_song):
         # test download song is case-insensitive
-        mocked_write_file.return_value = ""
-        mocked_audio.side_effect = MediaError
         mocked_song.return_value = self.song_list[0]
-        has_download = self.media.download(self.song_list[0])
+        with TempDir() as output, patch.object(self.media, "_get_audio_file", side_effect=MediaError(9)):
+            has_download = self.media.download(self.song_list[0], output=output)
+            self.assertEqual(os.listdir(output), [])
         self.assertIsNone(has_download)
 
+    @patch.object(media, "Verbose", autospec=True)
+    def test_download_song_is_not_saved_when_its_cached_audio_is_damaged(self, mocked_verbose):
+        cache_dir = TempDir()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = patch.object(self.media, "audio_cache", AudioCache(cache_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.media._cache_song(self.media.mp3_urls[0], self.get_song_content())
+        with open(self.media.audio_cache.path(self.media.mp3_urls[0]), "r+b") as f:
+            f.truncate(1024)  # cut short outside the cache
+
+        response = self.mocked_response(
+            headers={"Content-Length": "10"}, iter_content=Mock(return_value=[b"not an mp3"])
+        )
+        with TempDir() as output, patch.object(media.Session, "stream", return_value=response) as mocked_stream:
+            self.media.download(1, output=output, tag=False)
+            self.assertFalse([name for name in os.listdir(output) if name.endswith(".mp3")])
+        # the song is requested again, instead of copied from the cache
+        mocked_stream.assert_called_once()
+        mocked_verbose.assert_called_with(verbose_message["UNAVAILABLE_SONG"])
+
     @patch.object(media, "Verbose", autospec=True)
     def test_auto_play_is_select_first_song_when_not_track_is_selected_by_user(self, mocked_verbose):
         self.media.autoplay = True
@@ -387,7 +476,8 @@ class TestMedia(BaseMediaTest):
         media.autoplay = True
         self.assertTrue(media.autoplay)
 
-        mocked_current_time.return_value = 60 * 5
+        # mpv exits at the end of the track
+        media.player._popen.terminate()
         sleep(1.5)  # need time for autoplay to switch
         self.assertFalse(media.autoplay)
         calls = [
@@ -409,6 +499,9 @@ class TestMedia(BaseMediaTest):
         mocked_song.return_value = min(self.song_list)
         mocked_is_inactive.return_value = True
         media = self.media
+        patcher = patch.object(media, "AUTOPLAY_INACTIVITY_TIME", 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
         media.play(1)
         media.autoplay = True
 
@@ -422,6 +515,48 @@ class TestMedia(BaseMediaTest):
         ]
         mocked_verbose.assert_has_calls(calls, any_order=True)
 
+    def test_auto_play_plays_every_song_of_the_album_on_a_null_player(self):
+        from pydatpiff.backend.audio.nullplayer import NullPlayer
+
+        player = NullPlayer(speed=None, record=True)
+        headless = media.Media(self.mix, player=player)
+        headless.setMedia(1)
+        songs = headless.songs[:3]
+        headless._Mp3 = Mock(songs=songs, mp3_urls=["https://example.com/%s.mp3" % i for i in range(3)])
+        headless.prefetcher = Mock()
+
+        def get_audio_file(track):
+            headless.song = track
+            return songs[track - 1], self.get_song_path()
+
+        headless._get_audio_file = Mock(side_effect=get_audio_file)
+
+        headless.play(1)
+        headless.autoplay = True
+        for _ in songs:
+            player.advance(60 * 60)
+            for _ in range(100):
+                # wait for autoplay to start the next song
+                if player.state["playing"] or not headless.autoplay:
+                    break
+                time.sleep(0.01)
+
+        self.assertFalse(headless.autoplay)
+        started = [track for _, event, track in player.timeline if event == player.TRACK_STARTED]
+        self.assertEqual(started, [" - ".join((headless.artist, song)) for song in songs])
+
+    def test_prefetch_is_scheduled_with_the_song_length_in_seconds(self):
+        from pydatpiff.backend.audio.duration import DurationProvider
+
+        headless = media.Media(self.mix, player="null")
+        headless.setMedia(1)
+        headless._Mp3 = Mock(mp3_urls=["https://example.com/%s.mp3" % i for i in range(3)])
+        headless._durations = DurationProvider(["03:00", "02:00", "01:00"])
+        headless.prefetcher = Mock()
+
+        headless._schedule_prefetch(1)
+        headless.prefetcher.schedule.assert_called_once_with(["https://example.com/2.mp3"], 120)
+
     @patch.object(media.Media, "song", new_callable=PropertyMock)
     def test_auto_play_is_still_enabled_when_user_stop_song(self, mocked_song):
         mocked_song.return_value = self.song_list[0]
@@ -434,19 +569,18 @@ class TestMedia(BaseMediaTest):
         self.assertTrue(self.media.player.state.get("stopped", False))
 
     @patch.object(media.Media, "song", new_callable=PropertyMock)
-    @patch.object(media.File, "write_to_file", autospec=True)
     @patch.object(media, "Verbose", autospec=True)
     @patch.object(media.screen, "display_download_message", autospec=True)
     @patch.object(media.File, "get_human_readable_file_size", autospec=True)
     def test_download_song_method_work_correctly_with_parameters(
-        self, mocked_size, mocked_screen, mocked_verbose, mocked_write_file, mocked_song
+        self, mocked_size, mocked_screen, mocked_verbose, mocked_song
     ):
-        mocked_write_file.return_value = ""
         mocked_song.return_value = self.song_list[0]
         mocked_size.return_value = "3MB"
-        self.media.download(self.song_list[0], rename="new_name.mp3")
+        downloaded = self.download_song(self.song_list[0], rename="new_name.mp3")
 
         self.assertEqual(self.media.song, self.song_list[0])
+        self.assertEqual(downloaded, [f"{self.artist_list[0]} - new_name.mp3"])
         mocked_verbose.assert_not_called()
         mocked_screen.assert_called_with(f"{self.artist_list[0]} - new_name.mp3", "3MB")
 
@@ -454,7 +588,18 @@ class TestMedia(BaseMediaTest):
         mp = media.Media(self.mix)
         mp.setMedia(1)
         tmp_dir = TempDir()
-        mp.download_album(output=tmp_dir.name)
+        content = self.get_song_content()
+        response = self.mocked_response(
+            headers={"Content-Length": str(len(content))}, iter_content=Mock(return_value=[content])
+        )
+        with patch.object(mp.audio_cache, "path", return_value=None), patch.object(
+            media.Session, "stream", return_value=response
+        ):
+            self.assertEqual(mp.download_album(output=tmp_dir.name), [])
+            # downloading the album again skips the songs already downloaded
+            progress = Mock()
+            mp.download_album(output=tmp_dir.name, on_progress=progress)
+            self.assertEqual(progress.call_args[0][2].skipped, len(self.song_list))
         self.assertEqual(mp.songs, self.song_list)
 
         album_dirname = " - ".join([self.artist_list[0], self.mixtape_list[0]])
@@ -486,12 +631,36 @@ class TestMedia(BaseMediaTest):
         self.assertIsNone(audio)
 
     def test_media_cache_songs_that_have_already_been_played_or_download(self):
-        cached_key = "-".join((self.artist_list[0], self.song_list[0]))
-        self.media._cache_song(cached_key, self.get_song_content())
+        link = "https://example.com/%s.mp3" % self.song_list[0]
+        self.media._cache_song(link, self.get_song_content())
 
-        cached_song = self.media._retrieve_song_from_cache(cached_key)
+        cached_song = self.media._retrieve_song_from_cache(link)
         self.assertEqual(cached_song, self.get_song_content())
 
+        # players are handed the cached file itself
+        path = self.media.audio_cache.path(link)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.get_song_content())
+
+        # cached songs are shared by every Media
+        self.assertEqual(self.unmocked_media._retrieve_song_from_cache(link), self.get_song_content())
+
+    def test_media_does_not_cache_songs_cut_short(self):
+        link = "https://example.com/cut-short.mp3"
+        content = self.get_song_content()
+        response = self.mocked_response(headers={"Content-Length": str(len(content) * 2)})
+        response.content = content
+        with patch.object(self.unmocked_media._session, "method", return_value=response):
+            self.assertIsNone(self.unmocked_media._fetch_audio(link))
+        self.assertIsNone(self.unmocked_media.audio_cache.path(link))
+
+    def test_media_uses_the_audio_cache_passed_even_when_empty(self):
+        with TempDir() as tmp_dir:
+            cache = AudioCache(tmp_dir)
+            mp = media.Media(self.mix, player="null", audio_cache=cache)
+            self.addCleanup(mp.close)
+            self.assertIs(mp.audio_cache, cache)
+
 
 class TestMediaPrivateMethod(BaseMediaTest):
     def test_media_index_of_song_method_with_integer_type(self):
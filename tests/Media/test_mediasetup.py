@@ -35,12 +35,15 @@ class TestAlbum(BaseTest):
 
     @patch.object(DatpiffPlayer, "_verify_version", autospec=True)
     def test_datpiff_get_version_set_version_correctly(self, mocked_get_version):
+        # album's version is checked when the album's name is first accessed
         mocked_get_version.return_value = None
         album = Album(link=self.mixtape_links[0])
+        album.name
         self.assertEqual(album._USE_MOBILE_VERSION, True)
 
         mocked_get_version.return_value = "some-version"
         album = Album(link=self.mixtape_links[0])
+        album.name
         self.assertEqual(album._USE_MOBILE_VERSION, False)
 
     @patch.object(DatpiffPlayer, "embedded_player_content", new_callable=PropertyMock)
@@ -59,6 +62,37 @@ class TestAlbum(BaseTest):
             album = Album(link=self.mixtape_links[0])
             album._verify_version()
 
+    @patch.object(Album, "_session")
+    def test_album_does_not_request_any_page_on_initialization(self, mocked_session):
+        Album(link=self.mixtape_links[0])
+        mocked_session.method.assert_not_called()
+
+    @patch.object(Album, "_session")
+    def test_album_requests_each_page_once_on_first_access(self, mocked_session):
+        mocked_session.method.return_value = self.mocked_response(content=self.get_request_content("embed_player"))
+        album = Album(link=self.mixtape_links[0])
+
+        # name and bio are both parsed from the embedded player page
+        album.name
+        album.bio
+        self.assertEqual(mocked_session.method.call_count, 1)
+
+        # uploader is parsed from the album's page
+        album.uploader
+        album.uploader
+        self.assertEqual(mocked_session.method.call_count, 2)
+        mocked_session.method.assert_called_with("GET", album.link)
+
+    @patch.object(Album, "_session")
+    def test_eager_album_requests_all_pages_on_initialization(self, mocked_session):
+        mocked_session.method.return_value = self.mocked_response(content=self.media_request_content)
+        album = Album(link=self.mixtape_links[0], eager=True)
+        self.assertEqual(mocked_session.method.call_count, 2)
+
+        album.uploader
+        album.bio
+        self.assertEqual(mocked_session.method.call_count, 2)
+
     def test_build_web_player_url_method_creates_embed_player_url_correctly(self):
         album_id = "1015177"
         embed_player_url = self.album.build_web_player_url(album_id)
@@ -0,0 +1,305 @@
+import json
+import os
+import queue
+import socket
+import subprocess
+import sys
+import threading
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from pydatpiff.backend.audio import mpvplayer
+from pydatpiff.backend.audio.audio_engine import ProcessSupervisor
+from pydatpiff.backend.audio.mpvipc import IPCController
+from pydatpiff.backend.audio.mpvplayer import MPV
+from pydatpiff.backend.audio.nullplayer import NullPlayer
+from pydatpiff.backend.audio.player import Player
+from tests.utils import BaseTest
+
+
+@patch.object(mpvplayer, "Popen")
+class TestPlayerStateMachine(BaseTest):
+    def setUp(self):
+        self.player = MPV()
+        self.events = []
+        self.player.subscribe(self.events.append)
+        self.player.set_track("song", self.get_song_path())
+
+    def test_player_publishes_each_state_transition(self, mocked_popen):
+        self.assertTrue(self.player.state["loaded"])
+        self.player.play
+        self.assertTrue(self.player.state["playing"])
+
+        self.player.pause
+        self.assertTrue(self.player.state["paused"])
+        self.assertFalse(self.player.state["playing"])
+
+        self.player.play  # unpause
+        self.assertTrue(self.player.state["playing"])
+        self.assertEqual(self.events, [MPV.TRACK_LOADED, MPV.TRACK_STARTED, MPV.PAUSED, MPV.RESUMED])
+
+    def test_player_reports_end_of_track_when_its_process_exits(self, mocked_popen):
+        self.player.play
+        self.player._on_exit(self.player._popen)
+        self.assertEqual(self.events[-1], MPV.TRACK_ENDED)
+        self.assertTrue(self.player.state["system_stopped"])
+        self.assertFalse(self.player.state["playing"])
+
+    def test_player_stopped_by_user_does_not_report_end_of_track(self, mocked_popen):
+        self.player.play
+        popen = self.player._popen
+        self.player.stop
+        self.player._on_exit(popen)
+        self.assertEqual(self.events[-1], MPV.STOPPED)
+        self.assertTrue(self.player.state["stopped"])
+
+    def test_player_plays_a_window_of_the_track(self, mocked_popen):
+        self.player.set_track("demo", self.get_song_path(), start=4.5, length=10)
+        self.player.play
+        args = mocked_popen.call_args[0][0]
+        self.assertIn("--start=4.5", args)
+        self.assertIn("--length=10", args)
+        self.assertEqual(self.player.duration, 10)
+
+    def test_player_loads_tracks_cut_short(self, mocked_popen):
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "truncated.mp3")
+            with open(path, "wb") as f:
+                f.write(b"\xff\xfb\x90\x00" + bytes(32) + b"Xing\x00\x00")
+            self.player.set_track("truncated", path)
+        self.assertTrue(self.player.state["loaded"])
+        self.assertLess(self.player.duration, 1)
+
+    def test_players_only_kill_their_own_process(self, mocked_popen):
+        mocked_popen.side_effect = lambda *args, **kwargs: Mock(is_alive=True)
+        other = MPV()
+        other.set_track("other song", self.get_song_path())
+        other.play
+        self.player.play
+        popen, other_popen = self.player._popen, other._popen
+
+        self.player.set_track("next song", self.get_song_path())
+        popen.kill.assert_called_once()
+        self.player.play
+        next_popen = self.player._popen
+        self.player.stop
+        next_popen.kill.assert_called_once()
+
+        other_popen.kill.assert_not_called()
+        self.assertIs(other._popen, other_popen)
+        self.assertTrue(other.state["playing"])
+
+    def test_unsubscribed_callback_stops_receiving_events(self, mocked_popen):
+        self.player.unsubscribe(self.events.append)
+        self.player.play
+        self.assertEqual(self.events, [MPV.TRACK_LOADED])
+
+
+class TestNullPlayer(BaseTest):
+    def setUp(self):
+        self.now = 0
+        self.player = NullPlayer(clock=lambda: self.now, record=True)
+        self.player.set_track("song", self.get_song_path(), duration=100)
+
+    def test_null_player_simulates_playback_time(self):
+        self.player.play
+        self.now = 30
+        self.assertEqual(self.player.current_time, 30)
+
+        self.player.pause
+        self.now = 50
+        self.assertEqual(self.player.current_time, 30)
+        self.player.play  # unpause
+        self.player.ffwd(10)
+        self.now = 60
+        self.assertEqual(self.player.current_time, 50)
+        self.assertEqual(self.player._format_time(self.player.current_time), (0, 50))
+
+    def test_null_player_ends_the_track_once_it_has_played(self):
+        ended = threading.Event()
+        self.player.subscribe(lambda event: event == NullPlayer.TRACK_ENDED and ended.set())
+        self.player.speed = 1000  # 100 seconds in 0.1 second
+        self.player.play
+        self.assertTrue(ended.wait(5))
+        self.assertTrue(self.player.state["system_stopped"])
+
+    def test_advancing_simulated_time_ends_the_track(self):
+        self.player.speed = None
+        self.player.play
+        self.player.advance(60)
+        self.assertEqual(self.player.current_time, 60)
+        self.assertTrue(self.player.state["playing"])
+        self.player.advance(60)
+        self.assertEqual(self.player.current_time, 100)
+        self.assertFalse(self.player.state["playing"])
+
+        events = [event for _, event, _ in self.player.timeline]
+        self.assertEqual(events, [NullPlayer.TRACK_LOADED, NullPlayer.TRACK_STARTED, NullPlayer.TRACK_ENDED])
+        self.assertEqual(self.player.timeline[-1][2], "song")
+
+    def test_get_player_returns_null_player_from_environment(self):
+        with patch.dict(os.environ, {"PYDATPIFF_PLAYER": "recording"}):
+            player = Player.getPlayer()
+        self.assertIsInstance(player, NullPlayer)
+        player.set_track("song", self.get_song_path())
+        self.assertEqual(player.timeline[0][1], NullPlayer.TRACK_LOADED)
+
+
+class TestProcessSupervisor(TestCase):
+    def setUp(self):
+        self.supervisor = ProcessSupervisor()
+
+    def test_supervisor_calls_callback_once_process_exits(self):
+        exited = threading.Event()
+        popen = subprocess.Popen([sys.executable, "-c", "pass"])
+        self.supervisor.watch(popen, exited.set)
+
+        self.assertTrue(exited.wait(10))
+        self.assertEqual(popen.returncode, 0)
+        self.assertNotIn(popen, self.supervisor.processes)
+
+    def test_supervisor_handles_many_processes(self):
+        exited = []
+        done = threading.Event()
+        processes = [subprocess.Popen([sys.executable, "-c", "pass"]) for _ in range(5)]
+        for popen in processes:
+            self.supervisor.watch(popen, lambda popen=popen: exited.append(popen) or len(exited) == 5 and done.set())
+
+        self.assertTrue(done.wait(10))
+        self.assertCountEqual(exited, processes)
+
+    def test_supervisor_kills_running_processes(self):
+        exited = threading.Event()
+        popen = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        self.supervisor.watch(popen, exited.set)
+        self.assertIn(popen, self.supervisor.processes)
+
+        self.supervisor.kill_all()
+        self.assertTrue(exited.wait(10))
+
+
+class TestMpvIPC(BaseTest):
+    def setUp(self):
+        path = IPCController.socket_path()
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(1)
+        self.addCleanup(os.remove, path)
+        self.addCleanup(self.server.close)
+
+        self.events = queue.Queue()
+        self.connection = IPCController.shared().connect(path, self.events.put)
+        self.mpv, _ = self.server.accept()
+        self.addCleanup(self.mpv.close)
+
+    def test_ipc_connection_sends_commands_and_receives_replies_and_events(self):
+        reply = self.connection.command("get_property", "pause")
+        request = json.loads(self.mpv.makefile().readline())
+        self.assertEqual(request["command"], ["get_property", "pause"])
+
+        self.mpv.sendall(b'{"event": "property-change", "name": "pause", "data": true}\n')
+        self.mpv.sendall(json.dumps({"request_id": request["request_id"], "error": "success", "data": False}).encode())
+        self.mpv.sendall(b"\n")
+        self.assertIs(reply.result(5), False)
+        self.assertEqual(self.events.get(timeout=5)["name"], "pause")
+
+        # mpv exited
+        self.mpv.close()
+        self.assertEqual(self.events.get(timeout=5)["event"], "connection-closed")
+        self.assertTrue(self.connection.closed)
+
+    def test_mpv_state_follows_properties_pushed_by_mpv(self):
+        player = MPV(ipc=True)
+        player.set_track("song", self.get_song_path())
+        player._popen = popen = Mock()
+        player._ipc_connection = self.connection
+        player._transition(MPV.TRACK_STARTED)
+        events = []
+        player.subscribe(events.append)
+
+        player._on_ipc_event(popen, {"event": "property-change", "name": "time-pos", "data": 12.5})
+        self.assertEqual(player.current_time, 12.5)
+
+        player._on_ipc_event(popen, {"event": "property-change", "name": "pause", "data": True})
+        player._on_ipc_event(popen, {"event": "property-change", "name": "pause", "data": True})
+        self.assertTrue(player.state["paused"])
+
+        player._on_ipc_event(popen, {"event": "property-change", "name": "eof-reached", "data": True})
+        self.assertEqual(events, [MPV.PAUSED, MPV.TRACK_ENDED])
+        self.assertTrue(self.connection.closed)
+
+    def test_mpv_seeks_over_ipc(self):
+        player = MPV(ipc=True)
+        player.set_track("song", self.get_song_path())
+        player._popen = Mock(is_alive=True)
+        player._ipc_connection = self.connection
+        player._transition(MPV.TRACK_STARTED)
+
+        player.ffwd(10)
+        player.rewind(5)
+        reader = self.mpv.makefile()
+        self.assertEqual(json.loads(reader.readline())["command"], ["seek", 10, "relative"])
+        self.assertEqual(json.loads(reader.readline())["command"], ["seek", -5, "relative"])
+        # the position is pushed by mpv, not estimated
+        self.assertIsNone(player.time_captured)
+
+    def test_persistent_mpv_loads_tracks_into_the_running_process(self):
+        player = MPV(persistent=True)
+        player.set_track("song", self.get_song_path())
+        player._popen = popen = Mock(is_alive=True)
+        player._ipc_connection = self.connection
+        player._playing_path = "previous song"
+        events = []
+        player.subscribe(events.append)
+
+        player.play
+        reader = self.mpv.makefile()
+        self.assertEqual(json.loads(reader.readline())["command"], ["loadfile", self.get_song_path(), "replace"])
+        self.assertEqual(json.loads(reader.readline())["command"], ["set_property", "pause", False])
+
+        self.assertTrue(player.enqueue("next song"))
+        self.assertEqual(json.loads(reader.readline())["command"], ["playlist-clear"])
+        self.assertEqual(json.loads(reader.readline())["command"], ["loadfile", "next song", "append"])
+
+        # mpv moved on to the queued track without exiting
+        player._on_ipc_event(popen, {"event": "end-file", "reason": "eof"})
+        self.assertEqual(events, [MPV.TRACK_STARTED, MPV.TRACK_ENDED])
+        self.assertEqual(player._playing_path, "next song")
+        self.assertIs(player._popen, popen)
+        self.assertFalse(self.connection.closed)
+
+    def test_closing_a_persistent_mpv_ends_its_process(self):
+        player = MPV(persistent=True)
+        player.set_track("song", self.get_song_path())
+        player._popen = popen = Mock(is_alive=True)
+        player._ipc_connection = self.connection
+        player.play
+
+        player.close()
+        self.assertTrue(player.state["stopped"])
+        popen.kill.assert_called_once()
+        self.assertIsNone(player._popen)
+        self.assertTrue(self.connection.closed)
+
+    @patch.object(mpvplayer, "Popen")
+    def test_persistent_mpv_plays_a_window_of_the_track_with_per_file_options(self, mocked_popen):
+        player = MPV(persistent=True)
+        player.set_track("demo", self.get_song_path(), start=4.5, length=10)
+
+        with patch.object(player, "_connect_ipc", return_value=self.connection):
+            player.play
+        # mpv starts idle, its command line options would apply to every track loaded after
+        spawn_args = mocked_popen.call_args[0][0]
+        self.assertIn("--idle=yes", spawn_args)
+        self.assertFalse([arg for arg in spawn_args if arg.startswith(("--start", "--length"))])
+        self.assertNotIn(self.get_song_path(), spawn_args)
+
+        reader = self.mpv.makefile()
+        # the window only applies to this track, not to the track queued after it
+        command = json.loads(reader.readline())["command"]
+        options = {"start": "4.5", "end": "14.5"}
+        self.assertEqual(
+            command, {"name": "loadfile", "url": self.get_song_path(), "flags": "replace", "options": options}
+        )
+        self.assertTrue(player.state["playing"])
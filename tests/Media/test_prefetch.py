@@ -0,0 +1,69 @@
+import threading
+from concurrent.futures import Future
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from pydatpiff.backend import prefetch
+from pydatpiff.backend.prefetch import PrefetchScheduler
+
+
+class TestPrefetchScheduler(TestCase):
+    def test_prefetch_scheduler_delay_by_fraction_or_seconds_remaining(self):
+        self.assertEqual(PrefetchScheduler(Mock(), at=0.5).delay(200), 100)
+        self.assertEqual(PrefetchScheduler(Mock(), at=30).delay(200), 170)
+        self.assertEqual(PrefetchScheduler(Mock(), at=30).delay(20), 0)
+        # unknown track length prefetches right away
+        self.assertEqual(PrefetchScheduler(Mock(), at=0.5).delay(0), 0)
+
+    def test_prefetch_scheduler_fetches_next_tracks_up_to_depth(self):
+        fetched = threading.Event()
+        fetch = Mock(side_effect=lambda link: fetched.set() or "/cache/%s" % link)
+        prefetcher = PrefetchScheduler(fetch, depth=1)
+        prefetcher.schedule(["2.mp3", "3.mp3"], duration=0)
+
+        self.assertTrue(fetched.wait(5))
+        self.assertEqual(prefetcher.fetch("2.mp3"), "/cache/2.mp3")
+        self.assertNotIn("3.mp3", [c.args[0] for c in fetch.call_args_list])
+
+    def test_prefetch_scheduler_fetch_waits_for_running_prefetch(self):
+        release = threading.Event()
+        fetch = Mock(side_effect=lambda link: release.wait(5) and "/cache/%s" % link)
+        prefetcher = PrefetchScheduler(fetch)
+        prefetcher.prefetch(["2.mp3"])
+
+        release.set()
+        self.assertEqual(prefetcher.fetch("2.mp3"), "/cache/2.mp3")
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_prefetch_scheduler_cancel_stops_scheduled_prefetch(self):
+        fetch = Mock()
+        prefetcher = PrefetchScheduler(fetch)
+        prefetcher.schedule(["2.mp3"], duration=60)
+        prefetcher.cancel()
+        fetch.assert_not_called()
+
+    def test_prefetch_scheduler_reports_fetched_tracks(self):
+        fetched = []
+        done = threading.Event()
+        prefetcher = PrefetchScheduler(
+            lambda link: "/cache/%s" % link, on_fetched=lambda *args: fetched.append(args) or done.set()
+        )
+        prefetcher.prefetch(["2.mp3"])
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(fetched, [("2.mp3", "/cache/2.mp3")])
+
+    def test_prefetch_scheduler_handles_fetches_that_finish_before_they_are_tracked(self):
+        fetched = []
+        finished = Future()
+        finished.set_result("/cache/2.mp3")
+        prefetcher = PrefetchScheduler(Mock(), on_fetched=lambda *args: fetched.append(args))
+
+        with patch.object(prefetch.Executor, "pool") as mocked_pool:
+            mocked_pool.return_value.submit.return_value = finished
+            worker = threading.Thread(target=prefetcher.prefetch, args=(["2.mp3"],), daemon=True)
+            worker.start()
+            worker.join(5)
+
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(fetched, [("2.mp3", "/cache/2.mp3")])
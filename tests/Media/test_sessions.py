@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+from pydatpiff.backend.audio.nullplayer import NullPlayer
+from pydatpiff.errors import MediaError
+from pydatpiff.sessions import SessionManager
+from tests.Media.test_media import BaseMediaTest
+
+
+class TestSessionManager(BaseMediaTest):
+    def setUp(self):
+        self.sessions = SessionManager(self.mix, player="null")
+
+    def tearDown(self):
+        self.sessions.close_all()
+
+    def test_sessions_have_their_own_player(self):
+        first = self.sessions.open("first")
+        second = self.sessions.open("second")
+        self.assertIsNot(first, second)
+        self.assertIsInstance(first.player, NullPlayer)
+        self.assertIsNot(first.player, second.player)
+        # the caches are shared
+        self.assertIs(first.audio_cache, second.audio_cache)
+        self.assertIs(first._session.session, second._session.session)
+
+    def test_opening_an_open_session_returns_its_media(self):
+        media = self.sessions.open("listener")
+        self.assertIs(self.sessions.open("listener"), media)
+        self.assertIs(self.sessions.get("listener"), media)
+        self.assertEqual(len(self.sessions), 1)
+
+    def test_closing_a_session_stops_and_closes_its_player(self):
+        media = self.sessions.open("listener")
+        media.player.set_track("song", self.get_song_path(), duration=134)
+        media.player.play
+        self.assertTrue(media.player.state["playing"])
+
+        with patch.object(media.player, "close", wraps=media.player.close) as close:
+            self.assertTrue(self.sessions.close("listener"))
+        close.assert_called_once()
+        self.assertTrue(media.player.state["stopped"])
+        self.assertNotIn("listener", self.sessions)
+        self.assertFalse(self.sessions.close("listener"))
+
+    def test_sessions_are_limited_to_max_sessions(self):
+        self.sessions.max_sessions = 1
+        self.sessions.open("first")
+        with self.assertRaises(MediaError):
+            self.sessions.open("second")
+        self.assertEqual(list(self.sessions), ["first"])
+
+    @patch("pydatpiff.media.Tmp.remove_temp_file_on_startup")
+    def test_opening_sessions_does_not_remove_other_sessions_temp_files(self, mocked_remove):
+        self.sessions.open("first")
+        self.sessions.open("second")
+        mocked_remove.assert_not_called()
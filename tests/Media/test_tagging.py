@@ -0,0 +1,59 @@
+import os
+import shutil
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from mutagen.id3 import ID3
+
+from pydatpiff.backend.covers import CoverService
+from pydatpiff.backend.tagging import Tagger
+from pydatpiff.utils.cache import CoverCache
+from tests.utils import BaseTest
+
+
+class TestTagger(BaseTest):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.paths = []
+        for number in (1, 2):
+            path = os.path.join(self.tmp_dir.name, "Artist - Song %s.mp3" % number)
+            shutil.copyfile(self.get_song_path(), path)
+            self.paths.append(path)
+
+        self.cover = b"\x89PNG\r\n\x1a\n" + b"\0" * 64
+        self.session = Mock()
+        self.session.method.return_value = Mock(content=self.cover)
+        covers = CoverService(cache=CoverCache(os.path.join(self.tmp_dir.name, "covers")), session=self.session)
+        self.tagger = Tagger(covers=covers)
+        self.addCleanup(self.tagger.close)
+
+    def test_tagger_writes_id3_frames_and_embeds_cover_art(self):
+        tags = {"title": "Song 1", "artist": "Artist", "album": "Album", "track": 1, "cover": "cover.png"}
+        self.tagger.tag(self.paths[0], tags).result(5)
+
+        id3 = ID3(self.paths[0])
+        self.assertEqual(str(id3["TIT2"]), "Song 1")
+        self.assertEqual(str(id3["TPE1"]), "Artist")
+        self.assertEqual(str(id3["TALB"]), "Album")
+        self.assertEqual(str(id3["TRCK"]), "1")
+        cover = id3.getall("APIC")[0]
+        self.assertEqual((cover.mime, cover.data), ("image/png", self.cover))
+
+    def test_tagger_requests_each_album_cover_once(self):
+        futures = [
+            self.tagger.tag(path, {"title": "Song", "track": number, "cover": "cover.png"})
+            for number, path in enumerate(self.paths, 1)
+        ]
+        for future in futures:
+            future.result(5)
+        self.session.method.assert_called_once()
+
+    def test_tagger_removes_tags_set_to_none(self):
+        self.tagger.tag(self.paths[0], {"title": "Song", "album": "Album", "cover": "album.png"}).result(5)
+        self.tagger.tag(self.paths[0], {"title": "Song", "album": None, "cover": None}).result(5)
+
+        id3 = ID3(self.paths[0])
+        self.assertEqual(str(id3["TIT2"]), "Song")
+        self.assertNotIn("TALB", id3)
+        self.assertEqual(id3.getall("APIC"), [])
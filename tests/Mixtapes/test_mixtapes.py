@@ -143,3 +143,14 @@ class TestMixtapeSearch(BaseTest):
         self.assertIsNotNone(self.mix.mixtapes)
 
         self.assertFalse(any(artist for artist in mix.artists if "Random Artist" in artist))
+
+    def test_search_engine_is_built_once_and_adds_albums_as_they_are_indexed(self):
+        mix = mixtapes.Mixtape()
+        engine = mix.search_engine
+        self.assertIs(mix.search_engine, engine)
+
+        mix.song_index.add_album(0, self.mixtape_list[0], self.song_list)
+        self.assertEqual(mix.search_engine.search("scorpio", kind=engine.SONG)[0]["track"], 5)
+        # an album indexed again is not added twice
+        mix.song_index.add_album(0, self.mixtape_list[0], self.song_list)
+        self.assertEqual(len(engine), len(mix) * 2 + len(self.song_list))
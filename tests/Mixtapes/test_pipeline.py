@@ -0,0 +1,86 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from pydatpiff import mixtapes
+from pydatpiff.backend import mediasetup, pipeline
+from pydatpiff.backend.pipeline import CrawlPipeline
+from pydatpiff.backend.scraper import parse_album_page, parse_mixtape_page
+from tests.utils import BaseTest
+
+
+class TestCrawlPipeline(BaseTest, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pipeline = CrawlPipeline(processes=2, io_workers=4)
+        cls.mixtape_content = cls.get_request_content("mixtape")
+        cls.embed_content = cls.get_request_content("embed_player")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pipeline.close()
+        super().tearDownClass()
+
+    def test_parse_mixtape_page_returns_picklable_record(self):
+        record = parse_mixtape_page(self.mixtape_content)
+        self.assertEqual(record["artists"][:2], self.artist_list[:2])
+        self.assertEqual(record["links"][0], self.mixtape_links[0])
+        self.assertEqual(record["total"], len(record["links"]))
+        self.assertIsNone(parse_mixtape_page("<html></html>"))
+
+    def test_pipeline_parses_pages_in_url_order(self):
+        responses = {
+            "mixtape-url": self.mocked_response(content=self.mixtape_content),
+            "album-url": self.mocked_response(content=self.embed_content),
+        }
+        with patch.object(pipeline.Session, "method", side_effect=lambda method, url: responses[url]):
+            records = self.pipeline.parse(parse_mixtape_page, ["mixtape-url", "album-url"])
+
+        self.assertEqual(records[0], parse_mixtape_page(self.mixtape_content))
+        self.assertIsNone(records[1])
+
+    def test_pipeline_skips_pages_that_fail(self):
+        with patch.object(pipeline.Session, "method", side_effect=Exception("server down")):
+            self.assertEqual(self.pipeline.parse(parse_album_page, ["album-url"]), [None])
+
+    def test_pipeline_mixtape_contains_the_same_mixtapes(self):
+        mixtapes.Session.method = Mock(autospec=True, return_value=self.mocked_response(content=self.mixtape_content))
+        mix = mixtapes.Mixtape(pipeline=self.pipeline)
+        self.assertEqual(mix.artists, mixtapes.Mixtape().artists)
+
+    def test_pipeline_crawl_keeps_the_shared_response_cache(self):
+        mixtapes.Session.method = Mock(autospec=True, return_value=self.mocked_response(content=self.mixtape_content))
+        with patch.object(mixtapes.Session, "clear_cache") as clear_cache:
+            crawled = self.pipeline.crawl(["hot", "new"])
+        self.assertEqual(crawled["new"].artists, crawled["hot"].artists)
+        clear_cache.assert_not_called()
+
+    def test_pipeline_index_albums_adds_every_album_to_song_index(self):
+        mix = Mock(links=self.mixtape_links[:3], song_index=Mock(__contains__=Mock(return_value=False)))
+        mix.__len__ = Mock(return_value=3)
+        response = self.mocked_response(content=self.embed_content)
+        with patch.object(pipeline.Session, "method", return_value=response):
+            self.pipeline.index_albums(mix)
+
+        record = parse_album_page(self.embed_content)
+        self.assertEqual(mix.song_index.add_album.call_count, 3)
+        mix.song_index.add_album.assert_called_with(2, record["name"], record["songs"])
+        self.assertEqual(record["songs"], self.song_list)
+
+    def test_pipeline_albums_keep_the_fields_parsed_on_the_process_pool(self):
+        response = self.mocked_response(content=self.embed_content)
+        with patch.object(pipeline.Session, "method", return_value=response):
+            album = self.pipeline.albums(self.mixtape_links[:1])[0]
+        expected_album = mediasetup.Album(self.mixtape_links[0])
+        expected_album._pages["embed"] = self.embed_content
+        expected = mediasetup.Mp3(expected_album)
+        mp3_urls, durations, bio = list(expected.mp3_urls), expected.durations, expected_album.bio
+
+        with patch.object(mediasetup, "MediaScraper") as scraper:
+            mp3 = mediasetup.Mp3(album)
+            self.assertEqual(mp3.songs, self.song_list)
+            self.assertEqual(list(mp3.mp3_urls), mp3_urls)
+            self.assertEqual(mp3.durations, durations)
+            self.assertEqual(album.bio, bio)
+        # the album's page is not parsed again
+        self.assertFalse(scraper.mock_calls)
@@ -0,0 +1,51 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from pydatpiff.backend.search import SearchEngine
+from tests.utils import BaseTest
+
+
+class TestSearchEngine(BaseTest, TestCase):
+    def setUp(self):
+        mix = Mock(
+            artists=self.artist_list,
+            mixtapes=self.mixtape_list,
+            ratings=[3] * len(self.artist_list),
+            views=[100] * len(self.artist_list),
+        )
+        mix.__len__ = Mock(return_value=len(self.artist_list))
+        self.engine = SearchEngine.from_mixtape(mix)
+        self.engine.add_album(0, self.mixtape_list[0], self.song_list)
+
+    def test_search_engine_edit_distance_matches_any_part_of_text(self):
+        self.assertEqual(SearchEngine.edit_distance("wockesha", "wockesha remix"), 0)
+        self.assertEqual(SearchEngine.edit_distance("wokesha", "wockesha remix"), 1)
+        self.assertEqual(SearchEngine.edit_distance("abc", "xyz"), 3)
+
+    def test_search_engine_tolerates_typos(self):
+        results = self.engine.search("wokesha", kind=SearchEngine.SONG)
+        self.assertEqual(results[0]["song"], "Wockesha")
+        self.assertEqual(results[1]["song"], "Wockesha (Remix) (feat. Lil Wayne  Ashanti)")
+
+        results = self.engine.search("monybag yo", kind=SearchEngine.ARTIST)
+        self.assertEqual(results[0]["title"], "Moneybagg Yo")
+        self.assertEqual(results[0]["index"], 1)
+
+    def test_search_engine_matches_words_in_any_order(self):
+        results = self.engine.search("lil wayne wockesha")
+        self.assertEqual(results[0]["track"], 7)
+
+    def test_search_engine_ranks_popular_mixtapes_first(self):
+        self.engine.add(SearchEngine.MIXTAPE, "Folarin", {"index": 100}, popularity=0)
+        self.engine.add(SearchEngine.MIXTAPE, "Folarin", {"index": 200}, popularity=1)
+        results = self.engine.search("folarin", kind=SearchEngine.MIXTAPE)
+        self.assertEqual([result["index"] for result in results[:2]], [200, 2])
+
+    def test_search_engine_returns_no_results_for_unrelated_query(self):
+        self.assertEqual(self.engine.search("zzzzqqqq"), [])
+        self.assertEqual(self.engine.search(""), [])
+
+    def test_search_engine_closest_method_returns_best_option_index(self):
+        self.assertEqual(SearchEngine.closest("scorpoi", self.song_list), 4)
+        with self.assertRaises(ValueError):
+            SearchEngine.closest("zzzzqqqq", self.song_list)
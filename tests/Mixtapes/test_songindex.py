@@ -0,0 +1,45 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from pydatpiff.backend.songindex import SongIndex
+from tests.utils import BaseTest
+
+
+class TestSongIndex(BaseTest, TestCase):
+    def setUp(self):
+        mix = Mock(links=self.mixtape_links)
+        mix.__len__ = Mock(return_value=len(self.mixtape_links))
+        self.song_index = SongIndex(mix)
+        self.song_index._fetch_album = Mock(side_effect=lambda index: (index, self.mixtape_list[index], []))
+        self.song_index.add_album(0, self.mixtape_list[0], self.song_list)
+
+    def test_song_index_tokenize_method_splits_lowercase_words(self):
+        self.assertEqual(SongIndex.tokenize(" Wockesha (Remix) "), ["wockesha", "remix"])
+
+    def test_song_index_search_matches_words_by_prefix(self):
+        results = self.song_index.search("hard for the ne")
+        self.assertEqual(
+            results,
+            [{"index": 1, "album": self.mixtape_list[0], "song": self.song_list[12], "track": 13}],
+        )
+
+    def test_song_index_search_requires_every_word_to_match(self):
+        self.assertEqual(len(self.song_index.search("lil durk")), 2)
+        self.assertEqual(len(self.song_index.search("lil durk est")), 1)
+        self.assertEqual(self.song_index.search("lil durk unknown"), [])
+
+    def test_song_index_is_built_once_and_updated_incrementally(self):
+        self.song_index.search("scorpio")
+        self.assertEqual(self.song_index._fetch_album.call_count, len(self.mixtape_links) - 1)
+
+        self.song_index.search("scorpio")
+        self.assertEqual(self.song_index._fetch_album.call_count, len(self.mixtape_links) - 1)
+
+        self.song_index.add_album(1, self.mixtape_list[1], ["Scorpio Season"])
+        self.assertEqual([result["index"] for result in self.song_index.search("scorpio")], [1, 2])
+
+    def test_song_index_replaces_album_postings_when_album_is_added_again(self):
+        self.song_index.add_album(0, self.mixtape_list[0], ["Interlude"])
+        self.assertEqual(len(self.song_index), 1)
+        self.assertEqual(self.song_index.search("scorpio"), [])
+        self.assertEqual(len(self.song_index.search("interlude")), 1)
@@ -0,0 +1,82 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from pydatpiff.utils.cache import AudioCache, DiskCache
+
+
+class TestDiskCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache = DiskCache(self.tmp_dir.name, max_size=100)
+
+    def test_disk_cache_returns_cached_content(self):
+        self.assertIsNone(self.cache.get("song.mp3"))
+        self.cache.put("song.mp3", b"audio")
+        self.assertEqual(self.cache.get("song.mp3"), b"audio")
+        self.assertIn("song.mp3", self.cache)
+
+    def test_disk_cache_stores_identical_content_once(self):
+        path = self.cache.put("mixtape1/song.mp3", b"audio")
+        self.assertEqual(self.cache.put("mixtape2/song.mp3", b"audio"), path)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.size, 5)
+
+        # shared content is kept until no key refers to it
+        self.cache.remove("mixtape1/song.mp3")
+        self.assertEqual(self.cache.get("mixtape2/song.mp3"), b"audio")
+
+    def test_disk_cache_evicts_least_recently_used_content(self):
+        self.cache.put("first.mp3", b"1" * 40)
+        self.cache.put("second.mp3", b"2" * 40)
+        self.cache.get("first.mp3")
+        self.cache.put("third.mp3", b"3" * 40)
+
+        self.assertNotIn("second.mp3", self.cache)
+        self.assertIn("first.mp3", self.cache)
+        self.assertIn("third.mp3", self.cache)
+        self.assertLessEqual(self.cache.size, 100)
+
+    def test_disk_cache_is_shared_across_instances(self):
+        self.cache.put("song.mp3", b"audio")
+        self.assertEqual(DiskCache(self.tmp_dir.name).get("song.mp3"), b"audio")
+
+        self.cache.clear()
+        self.assertEqual(len(DiskCache(self.tmp_dir.name)), 0)
+
+    def test_disk_cache_saves_keys_used_when_flushed(self):
+        self.cache.put("song.mp3", b"audio")
+        index_file = os.path.join(self.tmp_dir.name, "index.json")
+        with open(index_file) as f:
+            saved = json.load(f)["song.mp3"]["accessed"]
+
+        # hits do not rewrite the index
+        self.assertEqual(self.cache.get("song.mp3"), b"audio")
+        self.assertIn("song.mp3", self.cache)
+        with open(index_file) as f:
+            self.assertEqual(json.load(f)["song.mp3"]["accessed"], saved)
+
+        self.cache.flush()
+        with open(index_file) as f:
+            self.assertGreater(json.load(f)["song.mp3"]["accessed"], saved)
+
+    def test_disk_cache_keeps_entries_saved_by_other_instances(self):
+        other = DiskCache(self.tmp_dir.name)
+        self.cache.put("first.mp3", b"1")
+        other.put("second.mp3", b"2")
+        self.cache.put("third.mp3", b"3")
+
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(DiskCache(self.tmp_dir.name).get("second.mp3"), b"2")
+
+    def test_audio_cache_shared_instance_uses_cache_directory_environment_variable(self):
+        self.assertIs(AudioCache.shared(), AudioCache.shared())
+        self.assertTrue(AudioCache.shared().directory.endswith("audio"))
+
+    def test_disk_cache_maps_cached_file_into_memory(self):
+        self.assertIsNone(self.cache.mmap("song.mp3"))
+        self.cache.put("song.mp3", b"audio")
+        with self.cache.mmap("song.mp3") as audio:
+            self.assertEqual(audio[1:3], b"ud")
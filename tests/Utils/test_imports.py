@@ -0,0 +1,49 @@
+import os
+import re
+import subprocess
+import sys
+from unittest import TestCase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# dependencies imported on first use
+HEAVY_MODULES = ("bs4", "requests", "mutagen", "vlc", "PIL", "yaml")
+
+
+def run(code):
+    """Run code in a new interpreter, so no module is already imported."""
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def import_time(module):
+    """Return the seconds a new interpreter takes to import module, and the modules it imported."""
+    result = run("import %s" % module)
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|(\s+)(\S+)", line)
+        if match:
+            times[match.group(3)] = int(match.group(1)) / 1e6
+    return times.get(module), set(times)
+
+
+class TestImportTime(TestCase):
+    def test_importing_media_does_not_import_heavy_dependencies(self):
+        seconds, imported = import_time("pydatpiff.media")
+        self.assertIsNotNone(seconds)
+        self.assertEqual(imported.intersection(HEAVY_MODULES), set())
+        self.assertNotIn("pydatpiff.backend.audio.vlcplayer", imported)
+        self.assertNotIn("pydatpiff.backend.audio.mpvplayer", imported)
+
+    def test_players_are_imported_when_requested(self):
+        code = (
+            "import sys\n"
+            "from pydatpiff.backend.audio.player import MPV, Player\n"
+            "Player.getPlayer('null')\n"
+            "print(' '.join(sorted(m for m in sys.modules if m.startswith('pydatpiff.backend.audio.'))))"
+        )
+        modules = run(code).stdout.split()
+        self.assertIn("pydatpiff.backend.audio.mpvplayer", modules)
+        self.assertIn("pydatpiff.backend.audio.nullplayer", modules)
+        self.assertNotIn("pydatpiff.backend.audio.vlcplayer", modules)
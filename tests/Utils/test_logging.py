@@ -0,0 +1,53 @@
+import logging
+import os
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from pydatpiff.frontend import screen
+from pydatpiff.utils.logging import configure, shutdown
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestLogging(TestCase):
+    def setUp(self):
+        logger = logging.getLogger("pydatpiff")
+        self.addCleanup(setattr, logger, "handlers", list(logger.handlers))
+        self.addCleanup(setattr, logger, "propagate", logger.propagate)
+        self.addCleanup(logger.setLevel, logger.level)
+
+    def test_importing_pydatpiff_does_not_configure_logging(self):
+        code = (
+            "import logging, os, pydatpiff.media\n"
+            "pydatpiff.media.Verbose('message')\n"
+            "print(len(logging.getLogger().handlers), os.path.exists('.pydatpiff.log'))"
+        )
+        with TemporaryDirectory() as cwd:
+            env = dict(os.environ, PYTHONPATH=ROOT)
+            result = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True)
+        self.assertEqual(result.stdout.split(), ["0", "False"])
+
+    def test_verbose_does_not_build_messages_that_are_not_output(self):
+        with patch.object(screen.logger, "info") as mocked_info:
+            screen.Verbose(object())  # joining would raise TypeError
+            screen.display_play_message("artist", "album", "song", "3MB")
+        mocked_info.assert_not_called()
+
+    def test_configure_queued_writes_records_from_a_listener_thread(self):
+        config = {
+            "version": 1,
+            "disable_existing_loggers": False,
+            "handlers": {"memory": {"class": "logging.handlers.BufferingHandler", "capacity": 100}},
+            "loggers": {"pydatpiff": {"level": "INFO", "handlers": ["memory"], "propagate": False}},
+        }
+        listener = configure(config, queued=True)
+        self.addCleanup(shutdown)
+        handler = listener.handlers[0]
+        self.assertIsInstance(logging.getLogger("pydatpiff").handlers[0], logging.handlers.QueueHandler)
+
+        screen.Verbose("Found", "12 mixtapes")
+        shutdown()
+        self.assertEqual([record.getMessage() for record in handler.buffer], ["Found 12 mixtapes"])
@@ -1,9 +1,13 @@
 import os
+import subprocess
+import sys
+import tempfile
+import threading
 from unittest import TestCase
 from unittest.mock import mock_open, patch
 
-from pydatpiff.utils.filehandler import File
-from pydatpiff.utils.utils import Object, Select
+from pydatpiff.utils.filehandler import File, Tmp
+from pydatpiff.utils.utils import Executor, Object, Select, ThreadQueue
 from tests.utils import tmp_wrapper
 
 
@@ -75,6 +79,62 @@ class TestSelect(TestCase):
             Select.get_index_of("c", ["a", "b"])
 
 
+class TestThreadQueue(TestCase):
+    # pydatpiff.utils.utils.ThreadQueue and Executor
+    def setUp(self):
+        self.addCleanup(Executor.configure, max_workers=Executor.max_workers, timeout=Executor.timeout)
+
+    @staticmethod
+    def job(work, add=0, release=None):
+        if work == "error":
+            raise ValueError("invalid work")
+        if work == "slow":
+            release.wait(5)
+            return work
+        return work + add
+
+    def test_execute_method_returns_results_in_work_order(self):
+        self.assertEqual(ThreadQueue(self.job, [3, 1, 2]).execute(add=1), [4, 2, 3])
+
+    def test_execute_method_captures_errors_per_task(self):
+        self.assertEqual(ThreadQueue(self.job, [1, "error", 2]).execute(), [1, None, 2])
+
+    def test_stream_method_reports_slow_task_as_timed_out(self):
+        release = threading.Event()
+        tasks = list(ThreadQueue(self.job, [1, "slow", 2], timeout=0.2).stream(release=release))
+        release.set()
+
+        self.assertCountEqual([task.result for task in tasks[:2]], [1, 2])
+        self.assertEqual(tasks[2].work, "slow")
+        self.assertIsInstance(tasks[2].error, TimeoutError)
+
+    def test_stream_method_can_cancel_pending_tasks(self):
+        release = threading.Event()
+        Executor.configure(max_workers=1)
+        stream = ThreadQueue(self.job, ["slow", 1, 2]).stream(release=release)
+        stream.cancel()
+        release.set()
+        results = stream.results()
+
+        self.assertTrue(results[0].ok)
+        self.assertFalse(results[1].ok)
+        self.assertFalse(results[2].ok)
+
+    def test_configure_keeps_the_settings_not_passed(self):
+        self.addCleanup(setattr, Executor, "timeout", Executor.timeout)
+        Executor.configure(timeout=5)
+        pool = Executor.pool()
+        Executor.configure(max_workers=Executor.max_workers)
+        self.assertEqual(Executor.timeout, 5)
+        # the pool is only restarted when its number of workers changes
+        self.assertIs(Executor.pool(), pool)
+
+    def test_nested_jobs_do_not_wait_on_a_busy_pool(self):
+        Executor.configure(max_workers=1)
+        results = ThreadQueue(lambda work: ThreadQueue(self.job, [work]).execute(), [1, 2]).execute()
+        self.assertEqual(results, [[1], [2]])
+
+
 class TestFileClass(TestCase):
     @tmp_wrapper
     def test_file_is_dir_method_return_whether_path_is_dir(self, temp_file=None):
@@ -116,3 +176,32 @@ class TestFileClass(TestCase):
         self.assertEqual(File.get_human_readable_file_size(1), "1B")
         self.assertEqual(File.get_human_readable_file_size(255), "255B")
         self.assertEqual(File.get_human_readable_file_size(2555), "2.5KB")
+
+
+class TestTmpClass(TestCase):
+    def test_startup_only_removes_temp_files_of_processes_that_are_not_running(self):
+        ended = subprocess.Popen([sys.executable, "-c", "pass"])
+        ended.wait()
+        stale = os.path.join(tempfile.gettempdir(), "pydatpiff-%s-test_datpiff" % ended.pid)
+        open(stale, "w").close()
+        in_use = Tmp.create()
+        in_use.close()
+        try:
+            Tmp.remove_temp_file_on_startup()
+            self.assertFalse(os.path.exists(stale))
+            self.assertTrue(os.path.isfile(in_use.name))
+            self.assertEqual(Tmp.owner(in_use.name), os.getpid())
+        finally:
+            Tmp.remove(in_use.name)
+        self.assertFalse(os.path.exists(in_use.name))
+
+    def test_startup_removes_temp_files_named_by_earlier_versions(self):
+        legacy = tempfile.NamedTemporaryFile(suffix="_datpiff", delete=False)
+        legacy.close()
+        unknown = os.path.join(tempfile.gettempdir(), "not-pydatpiff_datpiff")
+        open(unknown, "w").close()
+        self.addCleanup(os.remove, unknown)
+
+        Tmp.remove_temp_file_on_startup()
+        self.assertFalse(os.path.exists(legacy.name))
+        self.assertTrue(os.path.isfile(unknown))
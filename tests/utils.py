@@ -8,6 +8,10 @@ import requests
 
 PATH = os.path.dirname(os.path.abspath(__file__))
 
+# keep the tests' cached audio out of the user's cache directory
+CACHE_DIR = TemporaryDirectory(prefix="pydatpiff-tests-")
+os.environ["PYDATPIFF_CACHE_DIR"] = CACHE_DIR.name
+
 
 def tmp_wrapper(func):
     """wrapper function used to create a temporary directory and file for testing"""
@@ -131,15 +135,21 @@ class BaseTest(TestCase):
         session.text = content
         session.content = str(content).strip().encode("utf-8")
         session.json = json or {}
+        session.headers = {}
         for k, v in kwargs.items():
             setattr(session, k, v)
         return session
 
     @classmethod
-    def get_song_content(cls):
+    def get_song_path(cls):
         """Return mp3 sample file path"""
         mp3_file = os.path.join(PATH, "fixtures", "test_song.mp3")
         if not os.path.isfile(mp3_file):
             raise FileExistsError("test mp3 file `{}` was not found".format(mp3_file))
-        with open(mp3_file, "rb") as mp3:
+        return mp3_file
+
+    @classmethod
+    def get_song_content(cls):
+        """Return mp3 sample file content"""
+        with open(cls.get_song_path(), "rb") as mp3:
             return mp3.read()